@@ -1,23 +1,47 @@
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from code_wcag_a11y.utils.logger import logger
 
 
 # Create server parameters for stdio connection
 server_params = StdioServerParameters(
-    command="mcp",  # Executable
-    args=["run", "server.py"],  # Optional command line arguments
+    command=sys.executable,  # Executable
+    args=["-m", "code_wcag_a11y.mcp_server"],  # Optional command line arguments
     env=None,  # Optional environment variables
 )
 
 
-async def run():
-    async with stdio_client(server_params) as (read, write):
+@asynccontextmanager
+async def open_session(url: str | None = None) -> AsyncIterator[ClientSession]:
+    """Initialized session with the server over streamable HTTP, or stdio if no url.
+
+    Over stdio a new server process is started for the session.
+    """
+    if url:
+        transport = streamablehttp_client(url)
+    else:
+        transport = stdio_client(server_params)
+
+    async with transport as (read, write, *_):
         async with ClientSession(read, write) as session:
             # Initialize the connection
             await session.initialize()
+            yield session
+
+
+async def run(url: str | None = None):
+    async with open_session(url) as session:
+        tools: types.ListToolsResult = await session.list_tools()
+        logger.info(f"🧰 Tools: {', '.join(tool.name for tool in tools.tools)}")
 
 
 if __name__ == "__main__":
     import asyncio
 
-    asyncio.run(run())
+    asyncio.run(run(sys.argv[1] if len(sys.argv) > 1 else None))
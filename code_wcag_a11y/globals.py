@@ -4,6 +4,20 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent
 DATA_DIR = PROJECT_ROOT / "data"
 RAW_DIR = DATA_DIR / "raw"
+BENEFITS_CACHE_FILE = RAW_DIR / "benefits_cache.json"
 PROCESSED_DIR = DATA_DIR / "processed"
 CHROMADB_WCAG_PATH = DATA_DIR / "wcag_local_index"
 COLLECTION_NAME = "wcag_rules"
+CACHE_DIR = DATA_DIR / "cache"
+PROJECT_CACHE_DIR = CACHE_DIR / "project"
+FAST_PROJECT_CACHE_DIR = PROJECT_CACHE_DIR / "fast"
+INDEX_BUILD_ID_FILE = CHROMADB_WCAG_PATH / "build_id"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+RERANKER_MODEL = "BAAI/bge-reranker-v2-m3"
+MODELS_DIR = DATA_DIR / "models"
+BENCHMARK_DIR = DATA_DIR / "benchmark"
+LATE_INTERACTION_DIR = DATA_DIR / "late_interaction"
+LATE_INTERACTION_MODEL = "colbert-ir/colbertv2.0"
+SHARED_INDEX_DIR = DATA_DIR / "shared_index"
+SLOW_REQUEST_DIR = CACHE_DIR / "slow_requests"
+CORPUS_SNAPSHOT_DIR = CACHE_DIR / "corpus"
@@ -0,0 +1,71 @@
+"""ASGI app serving the MCP server over streamable HTTP.
+
+Imported by every uvicorn worker. Requests are handled statelessly, so any
+worker can answer any request; retrieval runs against the memory-mapped
+shared index, whose pages all workers share.
+"""
+
+import os
+from typing import get_args
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from code_wcag_a11y.mcp_server import admission, get_models, loaded_model_names, mcp
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.metrics import metrics
+from code_wcag_a11y.utils.shared_index import get_shared_index
+
+
+def load_shared_indices() -> list[str]:
+    """Map the shared index of every WCAG version, returning the missing ones."""
+    if settings.retrieval_backend != "shared":
+        return []
+
+    missing = []
+    for version in get_args(WcagVersion):
+        try:
+            get_shared_index(version)
+        except FileNotFoundError:
+            missing.append(version)
+    if missing:
+        logger.error(
+            f"❌ Shared index missing for WCAG {', '.join(missing)}. "
+            "Run `python -m code_wcag_a11y.scripts.build_index` first."
+        )
+    return missing
+
+
+missing_indices = load_shared_indices()
+# Load the models before taking traffic unless preloading is disabled (fast
+# mode only). No reference is kept here, so idle unloading can free them.
+if settings.preload_models:
+    get_models()
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def readiness(request: Request) -> JSONResponse:
+    body = {
+        "status": "unavailable" if missing_indices else "ready",
+        "pid": os.getpid(),
+        "retrieval_backend": settings.retrieval_backend,
+        "models": loaded_model_names(),
+        "active_analyses": admission.active,
+        "queued_analyses": admission.waiting,
+    }
+    if missing_indices:
+        body["missing_indices"] = missing_indices
+    return JSONResponse(body, status_code=503 if missing_indices else 200)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+mcp.settings.stateless_http = True
+app = mcp.streamable_http_app()
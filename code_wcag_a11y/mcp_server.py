@@ -1,18 +1,87 @@
 #!/usr/bin/env python3
 
+import asyncio
 import json
+import os
 import signal
 import sys
+import threading
 
-from typing import Literal
-from warnings import filters
-from code_wcag_a11y.scripts.utils import index
+from functools import partial
+from pathlib import Path
+from typing import Any, Literal
 from code_wcag_a11y.utils.clean_code import (
     clean_code_snippet,
     extract_applicability_signals,
 )
+from code_wcag_a11y.utils.admission import (
+    CACHED_ACCESSIBILITY_DATA,
+    PREVIOUS_RANKING,
+    SKIPPED_REGIONS,
+    VECTOR_ORDER,
+    AdmissionController,
+    StageTimeoutError,
+    run_blocking_with_budget,
+    run_with_budget,
+)
+from code_wcag_a11y.utils.browser import BrowserPool
+from code_wcag_a11y.utils.chunk_aggregation import aggregate_to_parents, parent_chunk_id
+from code_wcag_a11y.utils.ax_tree import (
+    AXSnapshot,
+    diff_snapshots,
+    normalize_ax_tree,
+)
 from code_wcag_a11y.utils.logger import logger
-from playwright.async_api import async_playwright
+from code_wcag_a11y.utils.metrics import (
+    SIZE_BUCKETS,
+    TOKEN_BUCKETS,
+    configure_tracing,
+    estimate_tokens,
+    metrics,
+    process_rss_bytes,
+    timed,
+)
+from code_wcag_a11y.utils.daemon_client import load_models
+from code_wcag_a11y.utils.embeddings import get_query_encoder
+from code_wcag_a11y.utils.rerankers import Reranker
+from code_wcag_a11y.utils.resources import ResourceManager
+from code_wcag_a11y.utils.delta import (
+    AnalysisState,
+    changed_lines,
+    describe_nodes,
+    merge_ranked,
+    nodes_json,
+    result_handle,
+)
+from code_wcag_a11y.utils.pipeline import StageExecutor
+from code_wcag_a11y.utils.progress import report_stage, summarize_snapshot
+from code_wcag_a11y.utils.prerender import prerender_cache
+from code_wcag_a11y.utils.project import (
+    ProjectResultCache,
+    analyze_project,
+    content_hash,
+    project_cache,
+)
+from code_wcag_a11y.utils.regions import (
+    Region,
+    fetch_region_sources,
+    is_large_input,
+    merge_region_rankings,
+    region_code,
+    segment_snapshot,
+)
+from code_wcag_a11y.utils.rules import rank_by_rules, snapshot_signals
+from code_wcag_a11y.utils.shared_index import get_shared_index
+from code_wcag_a11y.utils.slow_requests import capture_slow_request
+from code_wcag_a11y.utils.visual import capture_visual_data
+from code_wcag_a11y.utils.wcag_corpus import load_json_file, load_rule_table
+from code_wcag_a11y.utils.prompts import build_rerank_query
+from code_wcag_a11y.utils.result_cache import (
+    LRUCache,
+    RankedResultCache,
+    structural_signature,
+)
+from code_wcag_a11y.settings import settings
 
 # from llama_index.core.vector_stores import (
 #     MetadataFilters,
@@ -20,42 +89,137 @@ from playwright.async_api import async_playwright
 # )
 # from langchain import OpenAI
 # from langchain.embeddings import OpenAIEmbeddings
-import os
 
+from mcp.server.fastmcp import Context, FastMCP
 
-import random
-import os
 
-os.environ["COHERE_API_KEY"] = "8jYsb9xoOxQpLjxiMum44fVajK3E18yuDzv2QDJO"
+from code_wcag_a11y.globals import DATA_DIR
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+
+
+ranked_result_cache = RankedResultCache(model_versions=())
+snapshot_cache: LRUCache[str, AXSnapshot] = LRUCache(settings.snapshot_cache_size)
+analysis_states: LRUCache[str, AnalysisState] = LRUCache(
+    settings.analysis_state_cache_size
+)
+admission = AdmissionController(
+    settings.max_concurrent_analyses, settings.max_queued_analyses
+)
+retrieve_stage = StageExecutor(
+    "retrieve", settings.retrieve_workers, settings.stage_queue_size
+)
+rerank_stage = StageExecutor("rerank", settings.rerank_workers, settings.stage_queue_size)
+browser_pool = BrowserPool()
+resources = ResourceManager(
+    settings.rss_budget_mb * 2**20 if settings.rss_budget_mb else None,
+    settings.resource_check_interval,
+)
+configure_tracing(settings.trace_file)
 
-from mcp.server.fastmcp import FastMCP
 
+_models_lock = threading.Lock()
+_models: tuple[Any, Reranker] | None = None
 
-from code_wcag_a11y.globals import DATA_DIR
-from code_wcag_a11y.scripts.build_index import get_index
-from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
 
+def get_models() -> tuple[Any, Reranker]:
+    """Return the query encoder and reranker, loading them on first use.
 
-from FlagEmbedding import FlagReranker
+    Fast mode analyses never call this, so they run without loading torch,
+    the index or a reranker.
+    """
+    global _models
+    with _models_lock:
+        resources.touch("models")
+        if _models is None:
+            _models = load_models()
+            ranked_result_cache.model_versions = tuple(m.name for m in _models)
+        return _models
 
-# Use FP16 for faster inference (optional)
-reranker = FlagReranker("BAAI/bge-reranker-v2-m3", use_fp16=True)
+
+def loaded_model_names() -> list[str]:
+    """Names of the loaded query encoder and reranker, empty when unloaded."""
+    models = _models
+    return [] if models is None else [m.name for m in models]
+
+
+def unload_models() -> bool:
+    """Drop the models; the next full analysis loads them again."""
+    global _models
+    with _models_lock:
+        if _models is None:
+            return False
+        _models = None
+        get_query_encoder.cache_clear()
+        return True
+
+
+resources.add_resource(
+    "models", lambda: _models is not None, unload_models, settings.model_idle_timeout
+)
+resources.add_resource(
+    "browser",
+    lambda: browser_pool.is_running,
+    browser_pool.close_threadsafe,
+    settings.browser_idle_timeout,
+)
+# Cleared in this order when over the RSS budget, cheapest to rebuild first;
+# dropping analysis states makes analyzeWCAGDelta fall back to full analyses
+resources.add_cache("prerender", prerender_cache)
+resources.add_cache("snapshots", snapshot_cache)
+resources.add_cache("ranked_results", ranked_result_cache)
+resources.add_cache("analysis_states", analysis_states)
+resources.start()
+
+
+def collect_server_gauges() -> dict[str, float]:
+    gauges = {
+        "wcag_process_rss_bytes": process_rss_bytes(),
+        "wcag_ranked_cache_hits": ranked_result_cache.hits,
+        "wcag_ranked_cache_misses": ranked_result_cache.misses,
+        "wcag_ranked_cache_entries": len(ranked_result_cache),
+        "wcag_snapshot_cache_entries": len(snapshot_cache),
+        "wcag_analysis_state_entries": len(analysis_states),
+        "wcag_admission_active": admission.active,
+        "wcag_admission_waiting": admission.waiting,
+        "wcag_admission_rejected": admission.rejected,
+        "wcag_admission_utilization": admission.active / admission.max_concurrent,
+    }
+    gauges.update(retrieve_stage.stats())
+    gauges.update(rerank_stage.stats())
+    gauges.update(resources.stats())
+    gauges["wcag_browser_launches"] = browser_pool.launches
+    if _models is None:
+        return gauges
+    query_encoder, reranker = _models
+    if hasattr(query_encoder, "hits"):
+        gauges["wcag_query_embedding_cache_hits"] = query_encoder.hits
+        gauges["wcag_query_embedding_cache_misses"] = query_encoder.misses
+    if hasattr(reranker, "stats"):
+        for key, value in reranker.stats.as_dict().items():
+            gauges[f"wcag_cascade_{key}"] = value
+    return gauges
+
+
+metrics.register_collector(collect_server_gauges)
 
 # Create an MCP server
 mcp = FastMCP("Code WCAG A11y")
 
 # Or modify PYTHONPATH
-import sys
-import os
-
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-@mcp.tool("getAccessibilityData")
-async def get_accessibility_data(code: str) -> dict:
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
+async def render_accessibility_snapshot(code: str) -> AXSnapshot:
+    with timed("render") as span:
+        snapshot = await _render_accessibility_snapshot(code)
+        span["ax_nodes"] = len(snapshot)
+    metrics.observe("wcag_ax_nodes", len(snapshot), buckets=SIZE_BUCKETS)
+    return snapshot
+
+
+async def _render_accessibility_snapshot(code: str) -> AXSnapshot:
+    resources.touch("browser")
+    async with browser_pool.context() as context:
         page = await context.new_page()
         cdp = await context.new_cdp_session(page)
 
@@ -67,138 +231,583 @@ async def get_accessibility_data(code: str) -> dict:
 
         ax_tree = await cdp.send("Accessibility.getFullAXTree")
 
-        accessible_nodes = normalize_ax_tree(ax_tree)
+        with timed("normalize_ax_tree"):
+            snapshot = normalize_ax_tree(ax_tree)
 
-        await browser.close()
-        return accessible_nodes
+        # Large pages are analyzed by region; keep each region's markup
+        if regions := segment_regions(code, snapshot):
+            snapshot.sources = await fetch_region_sources(
+                cdp, ax_tree, snapshot, regions
+            )
 
+        # After the region markup: focus outline marks are added to the DOM
+        if settings.capture_visual:
+            with timed("capture_visual") as span:
+                span["annotated"] = await capture_visual_data(cdp, ax_tree, snapshot)
 
-# return snapshot
-def normalize_ax_tree(ax_tree):
-    nodes = {}
-    for node in ax_tree["nodes"]:
-        if node.get("ignored", False):
-            continue
-        props = {
-            p["name"]: p["value"]["value"]
-            for p in node.get("properties", [])
-            if "value" in p
-        }
-        labelledby = props.get("labelledby", {})
-        labels = []
-        if labelledby.get("type") == "nodeList":
-            labels = [n["text"] for n in labelledby.get("relatedNodes", [])]
-
-        nodes[node["nodeId"]] = {
-            "role": node.get("role", {}).get("value"),
-            "name": node.get("name", {}).get("value"),
-            "focusable": props.get("focusable", False),
-            "editable": props.get("editable", False),
-            "readonly": props.get("readonly", False),
-            "required": props.get("required", False),
-            "labels": labels,
-            "ignored": node.get("ignored", False),
-        }
-    return nodes
+        return snapshot
 
 
-@mcp.tool("analyzeWCAG")
-async def analyze_file_against_WCAG(
-    code: str, wcag_version: WcagVersion = "2.2"
+@mcp.tool("getAccessibilityData")
+async def get_accessibility_data(code: str) -> dict:
+    with capture_slow_request("getAccessibilityData", code), timed(
+        "getAccessibilityData"
+    ):
+        snapshot = await render_accessibility_snapshot(code)
+        return snapshot.to_dict()
+
+
+def format_ranked_chunks(chunks, scores) -> list[dict]:
+    """Format retrieved chunks with their scores, best first."""
+    ranked = sorted(zip(scores, chunks), key=lambda x: x[0], reverse=True)
+    formatted = []
+    for s, c in ranked:
+        entry = {
+            # Chroma hits carry the chunk id as node id only
+            "id": parent_chunk_id(c),
+            "title": c.metadata.get("title") or c.metadata.get("handle"),
+            "score": s,
+        }
+        # Which sections of an SC matched, when SCs are indexed as sections
+        if c.metadata.get("sections"):
+            entry["sections"] = c.metadata["sections"]
+        formatted.append(entry)
+    return formatted
+
+
+def retrieve_chunks(code: str, wcag_version: WcagVersion):
+    """Vector search for the chunks closest to the code snippet."""
+    query_encoder, _ = get_models()
+    with timed("retrieve", backend=settings.retrieval_backend):
+        with timed("embed_query"):
+            query_embedding = query_encoder.encode(code)
+
+        # Sections of one SC compete for slots, so fetch more before collapsing
+        top_k = (
+            settings.child_top_k if settings.sc_sub_chunks else settings.similarity_top_k
+        )
+        if settings.retrieval_backend == "shared":
+            nodes = get_shared_index(wcag_version).search(query_embedding, top_k)
+        else:
+            from llama_index.core import QueryBundle
+            from llama_index.core.vector_stores import (
+                ExactMatchFilter,
+                MetadataFilters,
+            )
+
+            from code_wcag_a11y.scripts.build_index import get_index
+
+            # One collection holds every WCAG version
+            retriever = get_index(wcag_version).as_retriever(
+                similarity_top_k=top_k,
+                filters=MetadataFilters(
+                    filters=[ExactMatchFilter(key="version", value=wcag_version)]
+                ),
+            )
+            nodes = retriever.retrieve(
+                QueryBundle(query_str=code, embedding=query_embedding)
+            )
+        return aggregate_to_parents(nodes, settings.similarity_top_k)
+
+
+def rerank(pairs: list[list[str]]) -> list[float]:
+    """Score query/passage pairs with the configured reranker."""
+    _, reranker = get_models()
+    tokens = sum(estimate_tokens(q) + estimate_tokens(p) for q, p in pairs)
+    metrics.observe("wcag_rerank_pairs", len(pairs), buckets=SIZE_BUCKETS)
+    metrics.observe("wcag_rerank_input_tokens", tokens, buckets=TOKEN_BUCKETS)
+    with timed("rerank", reranker=reranker.name, pairs=len(pairs), tokens=tokens):
+        return reranker.compute_score(pairs, normalize=True)
+
+
+def segment_regions(code: str, snapshot: AXSnapshot) -> list[Region]:
+    """Regions to analyze separately, or an empty list to analyze the input whole."""
+    if not settings.segment_regions or not is_large_input(
+        code, snapshot, settings.segment_min_nodes, settings.segment_min_tokens
+    ):
+        return []
+    regions = segment_snapshot(
+        snapshot, settings.region_min_nodes, settings.max_regions
+    )
+    return regions if len(regions) > 1 else []
+
+
+async def retrieve_region(
+    region: Region, snapshot: AXSnapshot, wcag_version: WcagVersion
+) -> tuple[str, list] | None:
+    """Retrieve for one region.
+
+    Returns:
+        The region's code and retrieved nodes, or None if retrieval was out
+        of budget.
+    """
+    code = region_code(snapshot, region)
+    try:
+        top_nodes = await run_blocking_with_budget(
+            retrieve_chunks,
+            code,
+            wcag_version,
+            budget=settings.retrieve_budget,
+            stage="retrieve",
+            executor=retrieve_stage,
+        )
+    except StageTimeoutError:
+        return None
+    return code, top_nodes
+
+
+async def rerank_region(
+    region: Region,
+    code: str,
+    top_nodes: list,
+    wcag_version: WcagVersion,
+    deadline: float,
+) -> list[dict] | None:
+    """Rerank one region's retrieved nodes before the request's rerank deadline.
+
+    Returns:
+        The reranked list, or None if the deadline passed first.
+    """
+    query_text = build_rerank_query(code, nodes_json(region.nodes), wcag_version)
+    pairs = [[query_text, chunk.text] for chunk in top_nodes]
+    try:
+        scores = await run_blocking_with_budget(
+            rerank,
+            pairs,
+            budget=max(deadline - asyncio.get_running_loop().time(), 0.0),
+            stage="rerank",
+            executor=rerank_stage,
+        )
+    except StageTimeoutError:
+        return None
+    return format_ranked_chunks(top_nodes, scores)
+
+
+async def analyze_regions(
+    regions: list[Region],
+    snapshot: AXSnapshot,
+    wcag_version: WcagVersion,
+    degraded: list[str],
+    ctx: Context | None,
 ) -> dict:
-    accessible_nodes = await get_accessibility_data(code)
-
-    # 1️⃣ Retrieve top chunks from your LlamaIndex
-    index = get_index(wcag_version)
-
-    query_engine = index.as_query_engine(similarity_top_k=20)
-    top_nodes = query_engine.retrieve(code)  # adjust for your engine API
-
-    # 2️⃣ Prepare reranker
-
-    reranker = FlagReranker("BAAI/bge-reranker-v2-m3", use_fp16=True)
-
-    query_text = f"""
-You are an accessibility expert specializing in WCAG {wcag_version}.
-
-Your task is to IDENTIFY which WCAG Success Criteria are RELEVANT to the given code snippet,
-based on the types of elements present and their computed accessibility properties.
-
-IMPORTANT:
-- Do NOT determine whether the code PASSES or FAILS any Success Criteria.
-- Do NOT suggest fixes.
-- ONLY identify which WCAG Success Criteria apply and SHOULD be considered during development or testing.
-
----
+    """Rank every region in parallel and merge the rankings with attribution.
+
+    A region whose retrieval is out of budget is skipped and marked so in
+    `regions`. Reranking shares one `rerank_budget` deadline across regions;
+    a region not reranked by then keeps its vector order.
+
+    Raises:
+        StageTimeoutError: If retrieval was out of budget for every region.
+    """
+    with timed("analyze_regions", regions=len(regions)):
+        retrieved = await asyncio.gather(
+            *(retrieve_region(region, snapshot, wcag_version) for region in regions)
+        )
+        ranked_regions = [
+            (region, *hit) for region, hit in zip(regions, retrieved) if hit is not None
+        ]
+        if not ranked_regions:
+            raise StageTimeoutError(
+                f"Stage 'retrieve' exceeded its {settings.retrieve_budget:g}s "
+                "budget for every region"
+            )
+        if len(ranked_regions) < len(regions):
+            degraded.append(SKIPPED_REGIONS)
+
+        vector_rankings = [
+            (
+                region,
+                format_ranked_chunks(top_nodes, [c.score or 0.0 for c in top_nodes]),
+            )
+            for region, _, top_nodes in ranked_regions
+        ]
+        await report_stage(
+            ctx,
+            "vector_ranked",
+            {
+                "wcag_version": wcag_version,
+                "ranked_chunks": merge_region_rankings(
+                    vector_rankings, settings.similarity_top_k
+                ),
+            },
+        )
+
+        deadline = asyncio.get_running_loop().time() + settings.rerank_budget
+        reranked = await asyncio.gather(
+            *(
+                rerank_region(region, code, top_nodes, wcag_version, deadline)
+                for region, code, top_nodes in ranked_regions
+            )
+        )
+    if any(ranked is None for ranked in reranked):
+        degraded.append(VECTOR_ORDER)
+
+    skipped = {
+        region.region_id for region, hit in zip(regions, retrieved) if hit is None
+    }
+    return {
+        "wcag_version": wcag_version,
+        "ranked_chunks": merge_region_rankings(
+            [
+                (region, vector if ranked is None else ranked)
+                for (region, vector), ranked in zip(vector_rankings, reranked)
+            ],
+            settings.similarity_top_k,
+        ),
+        "regions": [
+            (
+                {**region.summary(), "skipped": True}
+                if region.region_id in skipped
+                else region.summary()
+            )
+            for region in regions
+        ],
+        "degraded": degraded,
+    }
 
-INPUT 1: HTML CODE SNIPPET
-{code}
 
----
+async def render_with_fallback(code: str) -> tuple[AXSnapshot, list[str]]:
+    """Render under the render budget, falling back to the last snapshot of this code.
 
-INPUT 2: COMPUTED ACCESSIBILITY SNAPSHOT
+    Returns:
+        The snapshot and the degradations applied to obtain it.
+    """
+    key = content_hash(code.encode("utf-8"))
+    try:
+        snapshot = await run_with_budget(
+            render_accessibility_snapshot(code), settings.render_budget, "render"
+        )
+    except StageTimeoutError:
+        snapshot = snapshot_cache.get(key)
+        if snapshot is None:
+            raise StageTimeoutError(
+                f"Rendering exceeded its {settings.render_budget:.1f}s budget "
+                "and no cached accessibility data is available for this code"
+            )
+        return snapshot, [CACHED_ACCESSIBILITY_DATA]
+
+    snapshot_cache.set(key, snapshot)
+    return snapshot, []
+
+
+def remember_analysis(
+    code: str, wcag_version: WcagVersion, snapshot: AXSnapshot, result: dict
+) -> dict:
+    """Keep what analyzeWCAGDelta needs and return the result with its handle."""
+    handle = result_handle(code, wcag_version)
+    result = {**result, "handle": handle}
+    analysis_states.set(handle, AnalysisState(code, wcag_version, snapshot, result))
+    return result
 
-Each item represents one accessible element with its computed properties
-(as exposed by the browser accessibility tree).
 
-Schema:
-- role: semantic role (e.g. textbox, button, link)
-- name: accessible name (string or empty)
-- focusable: whether the element can receive focus
-- editable: whether user input is allowed
-- readonly: whether the element is read-only
-- required: whether input is required
-- labels: associated label text(s), if any
+@mcp.tool("analyzeWCAG")
+async def analyze_file_against_WCAG(
+    code: str,
+    wcag_version: WcagVersion = "2.2",
+    mode: Literal["full", "fast"] = "full",
+    ctx: Context | None = None,
+) -> dict:
+    """Find the WCAG Success Criteria relevant to a code snippet.
+
+    Clients that send a progress token receive partial results as progress
+    notifications: the accessibility snapshot summary, the vector-ranked
+    candidates, then the reranked list (also the final result).
+
+    Every stage runs under a time budget. When rendering is too slow the last
+    snapshot of the same code is reused; when reranking is too slow the vector
+    order is returned. The `degraded` field lists what was applied.
+
+    Large inputs (see `segment_min_nodes` and `segment_min_tokens`) are split
+    into landmark, form, dialog and table regions of the accessibility tree,
+    which are ranked in parallel. The `regions` field then lists them (marking
+    those skipped because retrieval was too slow), and each ranked chunk lists
+    the regions it was ranked for, best first.
+
+    The `handle` field identifies this result for `analyzeWCAGDelta`.
+
+    `mode="fast"` skips retrieval and reranking: SCs are ranked by a table
+    mapping the roles and categories in the snapshot to the SCs whose ARIA,
+    HTML and failure techniques mention them (built by preprocess_data). It
+    loads no model or index and is deterministic, but coarser than the full
+    ranking. Fast results list the `signals` found and have no handle.
+    """
+    with capture_slow_request(
+        "analyzeWCAG", code, wcag_version=wcag_version, mode=mode
+    ), timed("analyzeWCAG", wcag_version=wcag_version, mode=mode):
+        if mode == "fast":
+            return await _analyze_fast(code, wcag_version, ctx)
+        return await _analyze_file_against_WCAG(code, wcag_version, ctx)
+
+
+async def _analyze_fast(
+    code: str, wcag_version: WcagVersion, ctx: Context | None
+) -> dict:
+    async with admission.admit():
+        snapshot, degraded = await render_with_fallback(code)
+        await report_stage(
+            ctx, "accessibility_snapshot", summarize_snapshot(snapshot)
+        )
+
+        signals = snapshot_signals(snapshot)
+        with timed("rank_rules", signals=len(signals)):
+            ranked = rank_by_rules(
+                load_rule_table(wcag_version), signals, settings.similarity_top_k
+            )
+        result = {
+            "wcag_version": wcag_version,
+            "mode": "fast",
+            "signals": signals,
+            "ranked_chunks": ranked,
+            "degraded": degraded,
+        }
+        await report_stage(ctx, "reranked", result)
+        return result
 
-Data:
-{accessible_nodes}
 
----
+async def _analyze_file_against_WCAG(
+    code: str, wcag_version: WcagVersion, ctx: Context | None
+) -> dict:
+    async with admission.admit():
+        snapshot, degraded = await render_with_fallback(code)
+        await report_stage(
+            ctx, "accessibility_snapshot", summarize_snapshot(snapshot)
+        )
+
+        # 0️⃣ Structurally equivalent components share their ranked results
+        signature = structural_signature(snapshot, wcag_version)
+        cached = ranked_result_cache.get(signature)
+        if cached is not None:
+            logger.debug(f"Ranked result cache hit for signature {signature[:12]}")
+            result = remember_analysis(
+                code, wcag_version, snapshot, {**cached, "degraded": degraded}
+            )
+            await report_stage(ctx, "reranked", result)
+            return result
+
+        # Large pages: one query per region instead of one oversized query
+        if regions := segment_regions(code, snapshot):
+            result = await analyze_regions(
+                regions, snapshot, wcag_version, degraded, ctx
+            )
+            # Region names differ between structurally equal pages, so
+            # segmented results are not shared through the ranked result cache
+            result = remember_analysis(code, wcag_version, snapshot, result)
+            await report_stage(ctx, "reranked", result)
+            return result
+
+        # 1️⃣ Retrieve top chunks from your LlamaIndex
+        top_nodes = await run_blocking_with_budget(
+            retrieve_chunks,
+            code,
+            wcag_version,
+            budget=settings.retrieve_budget,
+            stage="retrieve",
+            executor=retrieve_stage,
+        )
+        vector_scores = [chunk.score or 0.0 for chunk in top_nodes]
+        await report_stage(
+            ctx,
+            "vector_ranked",
+            {
+                "wcag_version": wcag_version,
+                "ranked_chunks": format_ranked_chunks(top_nodes, vector_scores),
+            },
+        )
+
+        # 2️⃣ Prepare reranker query
+        query_text = build_rerank_query(code, snapshot.to_json(), wcag_version)
+
+        # 3️⃣ Make query-passage pairs
+        pairs = [[query_text, chunk.text] for chunk in top_nodes]
+
+        # 4️⃣ Compute relevance scores, keeping the vector order if out of budget
+        try:
+            scores = await run_blocking_with_budget(
+                rerank,
+                pairs,
+                budget=settings.rerank_budget,
+                stage="rerank",
+                executor=rerank_stage,
+            )
+        except StageTimeoutError:
+            scores = vector_scores
+            degraded.append(VECTOR_ORDER)
+
+        # 5️⃣ Sort and format output
+        result = {
+            "wcag_version": wcag_version,
+            "ranked_chunks": format_ranked_chunks(top_nodes, scores),
+            "degraded": degraded,
+        }
+        if not degraded:
+            ranked_result_cache.set(signature, result)
+        result = remember_analysis(code, wcag_version, snapshot, result)
+        await report_stage(ctx, "reranked", result)
+        return result
+
+
+@mcp.tool("analyzeWCAGDelta")
+async def analyze_delta_against_WCAG(
+    handle: str,
+    code: str,
+    wcag_version: WcagVersion = "2.2",
+    ctx: Context | None = None,
+) -> dict:
+    """Re-analyze an edited component incrementally against a previous result.
+
+    `handle` is the `handle` of a previous analyzeWCAG or analyzeWCAGDelta
+    result. The new accessibility tree is diffed against the previous one, and
+    only added or changed nodes (with the edited lines) are used to retrieve
+    and rerank. The new scores are merged into the previous ranking; a chunk in
+    both keeps the higher score. Removed nodes do not demote earlier results.
+
+    The `delta` field reports the node changes and how many chunks were
+    rescored. If the handle is unknown (evicted, or analyzed by another
+    worker) a full analysis runs instead, using `wcag_version`.
+    """
+    with capture_slow_request(
+        "analyzeWCAGDelta", code, handle=handle, wcag_version=wcag_version
+    ), timed("analyzeWCAGDelta"):
+        state = analysis_states.get(handle)
+        if state is None:
+            result = await _analyze_file_against_WCAG(code, wcag_version, ctx)
+            return {**result, "delta": {"base": handle, "full": True}}
+        return await _analyze_delta(state, handle, code, ctx)
+
+
+async def _analyze_delta(
+    state: AnalysisState, base: str, code: str, ctx: Context | None
+) -> dict:
+    async with admission.admit():
+        snapshot, degraded = await render_with_fallback(code)
+        await report_stage(
+            ctx, "accessibility_snapshot", summarize_snapshot(snapshot)
+        )
+
+        diff = diff_snapshots(state.snapshot, snapshot)
+        ranked = state.result["ranked_chunks"]
+        delta = {
+            "base": base,
+            "full": False,
+            "added_nodes": len(diff.added),
+            "removed_nodes": len(diff.removed),
+            "rescored": 0,
+        }
 
-INSTRUCTIONS FOR ANALYSIS:
+        if diff.added:
+            edited = "\n".join(changed_lines(state.code, code))
+            top_nodes = await run_blocking_with_budget(
+                retrieve_chunks,
+                f"{edited}\n{describe_nodes(diff.added)}",
+                state.wcag_version,
+                budget=settings.retrieve_budget,
+                stage="retrieve",
+                executor=retrieve_stage,
+            )
+            top_nodes = top_nodes[: settings.delta_top_k]
+
+            query_text = build_rerank_query(
+                edited, nodes_json(diff.added), state.wcag_version
+            )
+            pairs = [[query_text, chunk.text] for chunk in top_nodes]
+            try:
+                scores = await run_blocking_with_budget(
+                    rerank,
+                    pairs,
+                    budget=settings.rerank_budget,
+                    stage="rerank",
+                    executor=rerank_stage,
+                )
+                ranked = merge_ranked(
+                    ranked,
+                    format_ranked_chunks(top_nodes, scores),
+                    max(len(ranked), settings.similarity_top_k),
+                )
+                delta["rescored"] = len(pairs)
+            except StageTimeoutError:
+                degraded.append(PREVIOUS_RANKING)
+
+        result = {
+            "wcag_version": state.wcag_version,
+            "ranked_chunks": ranked,
+            "degraded": list(dict.fromkeys([*state.result["degraded"], *degraded])),
+            "delta": delta,
+        }
+        result = remember_analysis(code, state.wcag_version, snapshot, result)
+        await report_stage(ctx, "reranked", result)
+        return result
 
-1. List the WCAG Success Criteria that are relevant to this code.
-2. Find also techniques that may apply.
 
----
+async def project_result_cache(mode: str) -> ProjectResultCache:
+    """Project cache for a mode, keyed by the generation of full-mode rankings.
 
-OUTPUT FORMAT:
+    The generation names the loaded models, so full mode loads them first.
+    """
+    if mode == "fast":
+        return project_cache(mode)
+    await asyncio.to_thread(get_models)
+    return project_cache(mode, ranked_result_cache.generation)
 
-Return a list of WCAG Success Criteria and techniques relevant to the provided code snippet,
- why this SC is relevant to this code.
 
-Do NOT include:
-- pass/fail judgments
-- remediation advice
-- speculative criteria not supported by the inputs
-"""
+def project_workers(requested: int) -> int:
+    """Files analyzed concurrently for a project, within the admission capacity.
 
-    # 3️⃣ Make query-passage pairs
-    pairs = [[query_text, chunk.text] for chunk in top_nodes]
+    Each worker holds an admission slot while it analyzes a file, so workers
+    beyond the running and queued slots would only fail with ServerBusyError.
+    """
+    capacity = settings.max_concurrent_analyses + settings.max_queued_analyses
+    return max(1, min(requested, capacity))
 
-    # 4️⃣ Compute relevance scores
-    scores = reranker.compute_score(pairs, normalize=True)
 
-    # 5️⃣ Sort chunks by score
-    ranked_chunks = [
-        chunk
-        for _, chunk in sorted(zip(scores, top_nodes), key=lambda x: x[0], reverse=True)
-    ]
+@mcp.tool("analyzeProject")
+async def analyze_project_files(
+    path: str,
+    wcag_version: WcagVersion = "2.2",
+    workers: int = 4,
+    mode: Literal["full", "fast"] = "full",
+) -> dict:
+    """Analyze every component file in a project directory.
+
+    Unchanged files are answered from the content-hash cache, so re-runs only
+    re-analyze what changed. `mode` is passed on to `analyzeWCAG`; fast results
+    are cached separately. `workers` is capped at the server's admission
+    capacity (`max_concurrent_analyses` + `max_queued_analyses`).
+    """
+    root = Path(path)
+    if not root.is_dir():
+        raise ValueError(f"Project directory not found: {path}")
+
+    files = []
+    async for record in analyze_project(
+        root,
+        partial(analyze_file_against_WCAG, mode=mode),
+        wcag_version,
+        project_workers(workers),
+        await project_result_cache(mode),
+    ):
+        files.append(record)
 
-    # 6️⃣ Format output
     return {
         "wcag_version": wcag_version,
-        "ranked_chunks": [
-            {
-                "id": c.metadata.get("chunk_id"),
-                "title": c.metadata.get("title"),
-                "score": s,
-            }
-            for c, s in zip(ranked_chunks, sorted(scores, reverse=True))
-        ],
+        "root": str(root.resolve()),
+        "analyzed": sum(1 for f in files if f.get("cached") is False),
+        "cached": sum(1 for f in files if f.get("cached")),
+        "errors": sum(1 for f in files if "error" in f),
+        "files": files,
     }
 
 
+@mcp.tool("getServerStats")
+def get_server_stats(format: Literal["json", "prometheus"] = "json") -> dict | str:
+    """Latency histograms, cache hit rates and pool utilization of this server.
+
+    `prometheus` returns the same data in the Prometheus text exposition format.
+    """
+    if format == "prometheus":
+        return metrics.render_prometheus()
+    return metrics.snapshot()
+
+
 # @mcp.tool("analyzeWCAG")
 # async def analyze_file_against_WCAG(
 #     code: str,
@@ -252,8 +861,8 @@ def get_WCAG_by_version(
     logger.debug(f"Looking for file at: {file_path}")
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with timed("load_wcag", wcag_version=wcag_version, data_type=data_type):
+            data = load_json_file(file_path)
 
         logger.info(f"Successfully loaded WCAG {wcag_version}")
 
@@ -263,7 +872,7 @@ def get_WCAG_by_version(
         logger.error(f"WCAG file not found: {file_path}")
         return {"error": f"WCAG version {wcag_version} not available"}
 
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         logger.error(f"Invalid JSON in {file_path}: {e}")
         return {"error": "Invalid JSON format"}
 
@@ -283,4 +892,6 @@ signal.signal(signal.SIGTERM, shutdown)  # Inspector / UV / OS
 
 if __name__ == "__main__":
     logger.info("Starting Code WCAG A11y MCP server...")
+    if settings.preload_models:
+        get_models()
     mcp.run()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Local inference daemon shared by every MCP server process of a user.
+
+Hosts the query encoder and the reranker once and serves them over a Unix
+domain socket. Requests arriving from different clients within a short
+window are batched into a single model call.
+
+Protocol: one JSON object per line in each direction.
+    {"id": 1, "op": "embed", "texts": [...]}
+    {"id": 2, "op": "rerank", "pairs": [[q, p], ...], "normalize": true}
+    {"id": 3, "op": "info"}
+Responses carry the same id and either "result" or "error".
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import signal
+import sys
+from typing import Any, Callable
+
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.embeddings import get_query_encoder
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.rerankers import CascadeReranker, load_reranker
+
+
+class MicroBatcher:
+    """Collects concurrent requests and runs them through the model together.
+
+    While one batch runs, new requests queue up and form the next batch, so
+    the batch size grows with load instead of requests waiting one by one.
+
+    With `merge=False` the requests of a batch share the window and the worker
+    thread but each gets its own model call, for models whose scores depend on
+    the whole candidate set of a request (a cascade keeps its top `keep`).
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[Any]], list[Any]],
+        window: float,
+        max_items: int,
+        merge: bool = True,
+    ):
+        self.run_batch = run_batch
+        self.window = window
+        self.max_items = max_items
+        self.merge = merge
+        self.batches = 0
+        self.items = 0
+        self._queue: asyncio.Queue[tuple[list[Any], asyncio.Future]] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    async def submit(self, items: list[Any]) -> list[Any]:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((items, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.window)
+            size = len(batch[0][0])
+            while not self._queue.empty() and size < self.max_items:
+                batch.append(self._queue.get_nowait())
+                size += len(batch[-1][0])
+
+            flat = [item for items, _ in batch for item in items]
+            try:
+                if self.merge:
+                    results = await asyncio.to_thread(self.run_batch, flat)
+                else:
+                    results = await asyncio.to_thread(
+                        self._run_each, [items for items, _ in batch]
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(flat)
+            start = 0
+            for items, future in batch:
+                if not future.done():
+                    future.set_result(results[start : start + len(items)])
+                start += len(items)
+
+    def _run_each(self, requests: list[list[Any]]) -> list[Any]:
+        return [result for items in requests for result in self.run_batch(items)]
+
+
+class ModelDaemon:
+    def __init__(self):
+        self.query_encoder = get_query_encoder()
+        self.reranker = load_reranker()
+        window, max_items = (
+            settings.model_daemon_batch_window,
+            settings.model_daemon_max_batch,
+        )
+        # Merged pairs of several requests would be pruned against each other
+        merge_pairs = not isinstance(self.reranker, CascadeReranker)
+        self.batchers = {
+            "embed": MicroBatcher(self.query_encoder.encode_batch, window, max_items),
+            "rerank": MicroBatcher(
+                lambda pairs: self.reranker.compute_score(pairs, normalize=True),
+                window,
+                max_items,
+                merge=merge_pairs,
+            ),
+            "rerank_raw": MicroBatcher(
+                lambda pairs: self.reranker.compute_score(pairs, normalize=False),
+                window,
+                max_items,
+                merge=merge_pairs,
+            ),
+        }
+
+    async def dispatch(self, request: dict[str, Any]) -> Any:
+        op = request.get("op")
+        if op == "embed":
+            return await self.batchers["embed"].submit(request["texts"])
+        if op == "rerank":
+            key = "rerank" if request.get("normalize", True) else "rerank_raw"
+            return await self.batchers[key].submit(request["pairs"])
+        if op == "info":
+            return {
+                "pid": os.getpid(),
+                "query_encoder": self.query_encoder.name,
+                "reranker": self.reranker.name,
+                "batches": {
+                    name: {"batches": b.batches, "items": b.items}
+                    for name, b in self.batchers.items()
+                },
+            }
+        raise ValueError(f"Unknown op: {op}")
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        write_lock = asyncio.Lock()
+
+        async def answer(request: dict[str, Any]) -> None:
+            response: dict[str, Any] = {"id": request.get("id")}
+            try:
+                response["result"] = await self.dispatch(request)
+            except Exception as e:
+                logger.exception(f"Model daemon request failed: {e}")
+                response["error"] = str(e)
+            async with write_lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(answer(json.loads(line)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.debug(f"Model daemon client dropped: {e}")
+        finally:
+            writer.close()
+
+
+async def serve() -> None:
+    socket_path = settings.model_daemon_socket
+
+    # Only one daemon per socket: a second one started concurrently exits here
+    lock_file = open(socket_path.with_suffix(".lock"), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        logger.info("Model daemon already running, exiting.")
+        return
+
+    daemon = ModelDaemon()
+    socket_path.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(daemon.handle, path=str(socket_path))
+    os.chmod(socket_path, 0o600)
+    logger.info(f"Model daemon (pid {os.getpid()}) listening on {socket_path}")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        socket_path.unlink(missing_ok=True)
+        lock_file.close()
+
+
+if __name__ == "__main__":
+    # Exit through asyncio.run so the socket file is removed on SIGTERM too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,64 @@
+import asyncio
+import sys
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+
+from code_wcag_a11y.mcp_server import (
+    analyze_file_against_WCAG,
+    browser_pool,
+    project_result_cache,
+    project_workers,
+)
+from code_wcag_a11y.scripts.utils.cli_utils import setup_project_parser
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.project import (
+    SarifWriter,
+    analyze_project,
+    write_jsonl_record,
+)
+
+
+async def run(args) -> int:
+    root = Path(args.root)
+    if not root.is_dir():
+        logger.error(f"❌ Project directory not found: {root}")
+        return 1
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    analyzed = cached = errors = 0
+    records = analyze_project(
+        root,
+        partial(analyze_file_against_WCAG, mode=args.mode),
+        args.wcag_version,
+        project_workers(args.workers),
+        await project_result_cache(args.mode),
+    )
+
+    try:
+        if args.format == "sarif":
+            writer = SarifWriter(out, args.wcag_version)
+            emit = writer.write
+        else:
+            writer = nullcontext()
+            emit = lambda record: write_jsonl_record(record, out)
+
+        with writer:
+            async for record in records:
+                emit(record)
+                analyzed += record.get("cached") is False
+                cached += bool(record.get("cached"))
+                errors += "error" in record
+    finally:
+        await browser_pool.close()
+        if out is not sys.stdout:
+            out.close()
+
+    logger.info(
+        f"✅ Done: {analyzed} analyzed, {cached} from cache, {errors} errors."
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run(setup_project_parser())))
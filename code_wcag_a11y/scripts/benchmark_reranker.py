@@ -0,0 +1,111 @@
+import json
+import random
+import time
+
+import numpy as np
+
+from code_wcag_a11y.globals import BENCHMARK_DIR, PROCESSED_DIR
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.scripts.utils.cli_utils import setup_benchmark_parser
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.prompts import build_rerank_query
+from code_wcag_a11y.utils.rerankers import load_reranker
+
+
+SNIPPETS_FILE = BENCHMARK_DIR / "snippets.json"
+
+
+def load_snippets() -> list[dict[str, str]]:
+    with open(SNIPPETS_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_passages(wcag_version: WcagVersion) -> list[str]:
+    file_path = PROCESSED_DIR / f"wcag-{wcag_version}_preprocessed.json"
+    with open(file_path, "r", encoding="utf-8") as f:
+        chunks = json.load(f)
+    return [c["text"] for c in chunks if c["type"] == "success_criterion"]
+
+
+def build_pairs(
+    snippets: list[dict[str, str]],
+    passages: list[str],
+    passages_per_snippet: int,
+    wcag_version: WcagVersion,
+) -> dict[str, list[list[str]]]:
+    """Pair every snippet with a fixed, seeded sample of SC passages."""
+    pairs = {}
+    for snippet in snippets:
+        rng = random.Random(snippet["id"])
+        query = build_rerank_query(snippet["code"], "{}", wcag_version)
+        sample = rng.sample(passages, min(passages_per_snippet, len(passages)))
+        pairs[snippet["id"]] = [[query, passage] for passage in sample]
+    return pairs
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    rank_a = np.argsort(np.argsort(a))
+    rank_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def top_k_overlap(a: np.ndarray, b: np.ndarray, k: int = 5) -> float:
+    top_a = set(np.argsort(-a)[:k])
+    top_b = set(np.argsort(-b)[:k])
+    return len(top_a & top_b) / k
+
+
+def run_backend(backend: str, pairs: dict[str, list[list[str]]]):
+    """Score every snippet with one backend.
+
+    Returns:
+        Per-snippet scores and per-snippet latencies in milliseconds.
+    """
+    reranker = load_reranker(backend)
+    # Warm up so lazy initialisation is not counted against the first snippet
+    reranker.compute_score(next(iter(pairs.values()))[:2], normalize=True)
+
+    scores, latencies = {}, []
+    for snippet_id, snippet_pairs in pairs.items():
+        start = time.perf_counter()
+        scores[snippet_id] = np.asarray(
+            reranker.compute_score(snippet_pairs, normalize=True)
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    return reranker.name, scores, np.asarray(latencies)
+
+
+if __name__ == "__main__":
+    args = setup_benchmark_parser()
+
+    snippets = load_snippets()
+    pairs = build_pairs(
+        snippets, load_passages(args.wcag_version), args.passages, args.wcag_version
+    )
+    logger.info(
+        f"🏁 Benchmarking {len(snippets)} snippets x {args.passages} passages "
+        f"on {', '.join(args.backends)}"
+    )
+
+    results = [run_backend(backend, pairs) for backend in args.backends]
+    reference_name, reference_scores, _ = results[0]
+
+    for name, scores, latencies in results:
+        line = (
+            f"{name:<45} p50 {np.percentile(latencies, 50):8.1f} ms  "
+            f"p95 {np.percentile(latencies, 95):8.1f} ms  "
+            f"mean {latencies.mean():8.1f} ms"
+        )
+        if name != reference_name:
+            rho = np.mean([spearman(reference_scores[k], scores[k]) for k in pairs])
+            overlap = np.mean(
+                [top_k_overlap(reference_scores[k], scores[k]) for k in pairs]
+            )
+            max_diff = max(
+                float(np.abs(reference_scores[k] - scores[k]).max()) for k in pairs
+            )
+            line += (
+                f"  spearman {rho:.3f}  top5 overlap {overlap:.2f}  "
+                f"max |Δscore| {max_diff:.3f}"
+            )
+        logger.info(line)
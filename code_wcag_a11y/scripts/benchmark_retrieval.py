@@ -0,0 +1,264 @@
+import asyncio
+import json
+import math
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+from code_wcag_a11y.globals import BENCHMARK_DIR, PROCESSED_DIR
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.scripts.utils.cli_utils import setup_retrieval_benchmark_parser
+from code_wcag_a11y.settings import Settings, settings
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.prompts import build_rerank_query
+from code_wcag_a11y.utils.rerankers import load_reranker
+
+
+SNIPPETS_FILE = BENCHMARK_DIR / "snippets.json"
+CONFIGURATIONS_FILE = BENCHMARK_DIR / "configurations.json"
+
+
+def load_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_sc_numbers(wcag_version: WcagVersion) -> dict[str, str]:
+    """Map SC chunk ids to SC numbers, which is what the snippets are labeled with."""
+    chunks = load_json(PROCESSED_DIR / f"wcag-{wcag_version}_preprocessed.json")
+    return {c["chunk_id"]: c["num"] for c in chunks if c["type"] == "success_criterion"}
+
+
+def recall_at_k(ranking: list[str | None], expected: set[str], k: int) -> float:
+    return len(set(ranking[:k]) & expected) / len(expected)
+
+
+def ndcg_at_k(ranking: list[str | None], expected: set[str], k: int) -> float:
+    dcg = sum(
+        1 / math.log2(rank + 2) for rank, sc in enumerate(ranking[:k]) if sc in expected
+    )
+    ideal = sum(1 / math.log2(rank + 2) for rank in range(min(k, len(expected))))
+    return dcg / ideal
+
+
+def reciprocal_rank(ranking: list[str | None], expected: set[str]) -> float:
+    for rank, sc in enumerate(ranking):
+        if sc in expected:
+            return 1 / (rank + 1)
+    return 0.0
+
+
+@contextmanager
+def override_settings(overrides: dict[str, Any]) -> Iterator[None]:
+    """Apply setting overrides for the duration of one configuration."""
+    unknown = set(overrides) - set(Settings.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+
+    previous = {key: getattr(settings, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            setattr(settings, key, value)
+
+
+def run_configuration(
+    configuration: dict[str, Any],
+    snippets: list[dict[str, Any]],
+    snapshots: dict[str, str],
+    sc_numbers: dict[str, str],
+    wcag_version: WcagVersion,
+    ks: list[int],
+    repeat: int,
+) -> dict[str, Any]:
+    """Rank every snippet with one configuration, the way analyzeWCAG does.
+
+    Returns:
+        Mean quality metrics and retrieve/rerank/total latency percentiles in
+        milliseconds.
+    """
+    from code_wcag_a11y.mcp_server import (
+        format_ranked_chunks,
+        get_models,
+        retrieve_chunks,
+    )
+
+    query_encoder, _ = get_models()
+
+    with override_settings(configuration.get("settings", {})):
+        reranker = load_reranker() if configuration.get("rerank", True) else None
+
+        def rank(snippet: dict[str, Any]) -> tuple[list[str | None], float, float]:
+            # Every call pays for its query embedding, as a new snippet would
+            if hasattr(query_encoder, "clear_cache"):
+                query_encoder.clear_cache()
+
+            start = time.perf_counter()
+            top_nodes = retrieve_chunks(snippet["code"], wcag_version)
+            retrieved = time.perf_counter()
+            scores = [chunk.score or 0.0 for chunk in top_nodes]
+            if reranker is not None and top_nodes:
+                query_text = build_rerank_query(
+                    snippet["code"], snapshots[snippet["id"]], wcag_version
+                )
+                pairs = [[query_text, chunk.text] for chunk in top_nodes]
+                scores = reranker.compute_score(pairs, normalize=True)
+            reranked = time.perf_counter()
+
+            ranked = format_ranked_chunks(top_nodes, scores)
+            # Guidelines and definitions hold slots but are never relevant
+            ranking = [sc_numbers.get(chunk["id"]) for chunk in ranked]
+            return ranking, retrieved - start, reranked - retrieved
+
+        # Warm up so lazy initialisation is not counted against the first snippet
+        rank(snippets[0])
+
+        quality: dict[str, list[float]] = {}
+        latencies: dict[str, list[float]] = {"retrieve": [], "rerank": [], "total": []}
+        for snippet in snippets:
+            expected = set(snippet["expected"])
+            for attempt in range(repeat):
+                ranking, retrieve_s, rerank_s = rank(snippet)
+                latencies["retrieve"].append(retrieve_s * 1000)
+                latencies["rerank"].append(rerank_s * 1000)
+                latencies["total"].append((retrieve_s + rerank_s) * 1000)
+                if attempt:
+                    continue
+                for k in ks:
+                    quality.setdefault(f"recall@{k}", []).append(
+                        recall_at_k(ranking, expected, k)
+                    )
+                    quality.setdefault(f"ndcg@{k}", []).append(
+                        ndcg_at_k(ranking, expected, k)
+                    )
+                quality.setdefault("mrr", []).append(reciprocal_rank(ranking, expected))
+
+    return {
+        "name": configuration["name"],
+        "reranker": reranker.name if reranker is not None else None,
+        "settings": configuration.get("settings", {}),
+        "quality": {metric: float(np.mean(v)) for metric, v in quality.items()},
+        "latency_ms": {
+            stage: {
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)),
+                "mean": float(np.mean(values)),
+            }
+            for stage, values in latencies.items()
+        },
+    }
+
+
+def render_snapshots(snippets: list[dict[str, Any]]) -> dict[str, str]:
+    """Render every snippet once; the snapshot is the same for all configurations."""
+    from code_wcag_a11y.mcp_server import browser_pool, render_accessibility_snapshot
+
+    async def render_all() -> dict[str, str]:
+        try:
+            return {
+                snippet["id"]: (
+                    await render_accessibility_snapshot(snippet["code"])
+                ).to_json()
+                for snippet in snippets
+            }
+        finally:
+            await browser_pool.close()
+
+    return asyncio.run(render_all())
+
+
+def report(results: list[dict[str, Any]], ks: list[int]) -> None:
+    for result in results:
+        quality = result["quality"]
+        latency = result["latency_ms"]
+        metrics_line = "  ".join(
+            f"R@{k} {quality[f'recall@{k}']:.3f}  nDCG@{k} {quality[f'ndcg@{k}']:.3f}"
+            for k in ks
+        )
+        logger.info(
+            f"{result['name']:<28} {metrics_line}  MRR {quality['mrr']:.3f}  "
+            f"retrieve p50 {latency['retrieve']['p50']:7.1f} ms  "
+            f"rerank p50 {latency['rerank']['p50']:7.1f} ms  "
+            f"total p50 {latency['total']['p50']:7.1f} / "
+            f"p95 {latency['total']['p95']:7.1f} ms"
+        )
+
+
+def check_regressions(
+    results: list[dict[str, Any]], baseline: str, metric: str, max_drop: float
+) -> list[str]:
+    """Configurations whose metric is more than max_drop below the baseline's."""
+    by_name = {result["name"]: result for result in results}
+    if baseline not in by_name:
+        raise ValueError(f"Unknown baseline configuration: {baseline}")
+
+    reference = by_name[baseline]["quality"][metric]
+    return [
+        result["name"]
+        for result in results
+        if reference - result["quality"][metric] > max_drop
+    ]
+
+
+if __name__ == "__main__":
+    args = setup_retrieval_benchmark_parser()
+    # Benchmark runs must not capture themselves as slow requests
+    settings.slow_request_threshold = None
+
+    snippets = load_json(Path(args.snippets) if args.snippets else SNIPPETS_FILE)
+    snippets = [snippet for snippet in snippets if snippet.get("expected")]
+    configurations = load_json(
+        Path(args.configurations) if args.configurations else CONFIGURATIONS_FILE
+    )
+    if args.only:
+        configurations = [c for c in configurations if c["name"] in args.only]
+    ks = sorted(args.k)
+
+    logger.info(
+        f"🏁 Benchmarking {len(configurations)} configurations on "
+        f"{len(snippets)} labeled snippets (WCAG {args.wcag_version})"
+    )
+    start = time.perf_counter()
+    snapshots = render_snapshots(snippets)
+    logger.info(
+        f"🖼️ Rendered {len(snapshots)} snapshots in {time.perf_counter() - start:.1f}s"
+    )
+
+    sc_numbers = load_sc_numbers(args.wcag_version)
+    results = [
+        run_configuration(
+            configuration,
+            snippets,
+            snapshots,
+            sc_numbers,
+            args.wcag_version,
+            ks,
+            args.repeat,
+        )
+        for configuration in configurations
+    ]
+    report(results, ks)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"✅ Report written to {args.output}")
+
+    if args.max_drop is not None:
+        metric = f"ndcg@{ks[-1]}"
+        baseline = args.baseline or results[0]["name"]
+        failed = check_regressions(results, baseline, metric, args.max_drop)
+        if failed:
+            logger.error(
+                f"❌ {metric} dropped more than {args.max_drop} below {baseline}: "
+                f"{', '.join(failed)}"
+            )
+            sys.exit(1)
+        logger.info(f"✅ No configuration lost more than {args.max_drop} {metric}")
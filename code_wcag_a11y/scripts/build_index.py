@@ -1,20 +1,36 @@
 import json
 import shutil
+import uuid
+from datetime import datetime, timezone
+from functools import cache
 from pathlib import Path
 
 from huggingface_hub import Collection
 
-from code_wcag_a11y.globals import CHROMADB_WCAG_PATH, PROCESSED_DIR
-from code_wcag_a11y.scripts.utils.cli_utils import setup_delete_parser
+from code_wcag_a11y.globals import (
+    CHROMADB_WCAG_PATH,
+    INDEX_BUILD_ID_FILE,
+    PROCESSED_DIR,
+)
+from code_wcag_a11y.scripts.utils.chunking import select_index_chunks
+from code_wcag_a11y.scripts.utils.cli_utils import setup_build_index_parser
+from code_wcag_a11y.scripts.utils.embedding_pool import DocumentEmbedder
+from code_wcag_a11y.settings import settings
 from code_wcag_a11y.utils.logger import logger
 from code_wcag_a11y.scripts.chromadb import get_collection
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.utils.shared_index import export_shared_index
 
 
-def index_wcag_files(file_path: Path, collection: Collection) -> None:
+def index_wcag_files(
+    file_path: Path, collection: Collection, embedder: DocumentEmbedder | None = None
+) -> None:
     """Index WCAG JSON chunks into ChromaDB.
 
     Args:
         file_path: Path to the preprocessed WCAG JSON file.
+        embedder: Multi-process embedder; without it Chroma embeds the
+            documents itself on one core.
 
     Raises:
         FileNotFoundError: If the file_path does not exist.
@@ -32,7 +48,7 @@ def index_wcag_files(file_path: Path, collection: Collection) -> None:
     documents = []
     metadatas = []
 
-    for chunk in chunks:
+    for chunk in select_index_chunks(chunks, settings.sc_sub_chunks):
         # Validate required fields
         if "chunk_id" not in chunk:
             logger.warning(f"⚠️ Missing 'chunk_id' in chunk, skipping...")
@@ -56,14 +72,22 @@ def index_wcag_files(file_path: Path, collection: Collection) -> None:
             "type": chunk.get("type", "unknown"),
             "handle": chunk.get("handle", "unknown"),
         }
+        # SC sections link back to their success criterion for aggregation
+        if "parent_chunk_id" in chunk:
+            meta["parent_chunk_id"] = chunk["parent_chunk_id"]
+            meta["section"] = chunk["section"]
         metadatas.append(meta)
 
     if not ids:
         logger.warning(f"⚠️ No valid chunks found in {file_path}")
         return
 
+    embeddings = embedder.embed(documents) if embedder else None
+
     collection = get_collection()
-    collection.add(ids=ids, documents=documents, metadatas=metadatas)
+    collection.add(
+        ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings
+    )
 
     logger.info(f"✅ Success: Indexed {len(documents)} chunks from {file_path.name}.")
 
@@ -88,20 +112,72 @@ def delete_chroma_db() -> bool:
         return False
 
 
+def write_index_build_id() -> str:
+    """Stamp the index with a new build id so dependent caches are invalidated.
+
+    Returns:
+        The new build id.
+    """
+    build_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}"
+    CHROMADB_WCAG_PATH.mkdir(parents=True, exist_ok=True)
+    INDEX_BUILD_ID_FILE.write_text(build_id, encoding="utf-8")
+    logger.info(f"🏷️ Index build id: {build_id}")
+    return build_id
+
+
+def find_preprocessed_versions() -> list[str]:
+    """WCAG versions with a preprocessed file, including any future drafts."""
+    prefix, suffix = "wcag-", "_preprocessed.json"
+    return sorted(
+        path.name[len(prefix) : -len(suffix)]
+        for path in PROCESSED_DIR.glob(f"{prefix}*{suffix}")
+    )
+
+
+@cache
+def get_index(wcag_version: WcagVersion):
+    """Query-only llama-index view of the persistent Chroma collection.
+
+    The collection holds every WCAG version, so retrievers must filter on the
+    `version` metadata. Queries carry their own embedding (see
+    `retrieve_chunks`), so the index only gets a placeholder embedding model.
+
+    Returns:
+        A `VectorStoreIndex` over the collection.
+
+    Raises:
+        ValueError: If no chunks of wcag_version are indexed.
+    """
+    from llama_index.core import VectorStoreIndex
+    from llama_index.core.embeddings import MockEmbedding
+    from llama_index.vector_stores.chroma import ChromaVectorStore
+
+    collection = get_collection()
+    if not collection.get(where={"version": wcag_version}, limit=1)["ids"]:
+        raise ValueError(f"No indexed chunks for WCAG {wcag_version}")
+    return VectorStoreIndex.from_vector_store(
+        ChromaVectorStore(chroma_collection=collection),
+        # Passing None would print a notice to stdout, the stdio MCP transport
+        embed_model=MockEmbedding(embed_dim=1),
+    )
+
+
 if __name__ == "__main__":
-    args = setup_delete_parser()
+    args = setup_build_index_parser()
 
     if args.delete:
         delete_chroma_db()
 
-    # Configurable WCAG versions
-    WCAG_VERSIONS = ["2.1", "2.2"]
-
-    for version in WCAG_VERSIONS:
-        data_file = Path(PROCESSED_DIR) / f"wcag-{version}_preprocessed.json"
-        logger.info(f"--- Indexing WCAG {version} from {data_file} ---")
-        try:
-            collection = get_collection()
-            index_wcag_files(data_file, collection)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"❌ Failed to index WCAG {version}: {e}")
+    # The worker pool and its models are shared by every version
+    with DocumentEmbedder(args.workers, args.batch_size) as embedder:
+        for version in find_preprocessed_versions():
+            data_file = Path(PROCESSED_DIR) / f"wcag-{version}_preprocessed.json"
+            logger.info(f"--- Indexing WCAG {version} from {data_file} ---")
+            try:
+                collection = get_collection()
+                index_wcag_files(data_file, collection, embedder)
+                export_shared_index(collection, version)
+            except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+                logger.error(f"❌ Failed to index WCAG {version}: {e}")
+
+    write_index_build_id()
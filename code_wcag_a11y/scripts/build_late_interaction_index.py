@@ -0,0 +1,44 @@
+import json
+
+from code_wcag_a11y.globals import PROCESSED_DIR
+from code_wcag_a11y.scripts.utils.chunking import select_index_chunks
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.late_interaction import (
+    ColbertTokenEncoder,
+    LateInteractionIndex,
+)
+from code_wcag_a11y.utils.logger import logger
+
+
+WCAG_VERSIONS = ["2.1", "2.2"]
+
+
+def load_chunk_texts(version: str) -> tuple[list[str], list[str]]:
+    """Return (chunk ids, texts) for the chunks that are indexed in ChromaDB."""
+    file_path = PROCESSED_DIR / f"wcag-{version}_preprocessed.json"
+    with open(file_path, "r", encoding="utf-8") as f:
+        chunks = json.load(f)
+
+    chunk_ids, texts = [], []
+    for chunk in select_index_chunks(chunks, settings.sc_sub_chunks):
+        content = chunk.get("text") or chunk.get("description")
+        if "chunk_id" in chunk and content:
+            chunk_ids.append(chunk["chunk_id"])
+            texts.append(content)
+    return chunk_ids, texts
+
+
+if __name__ == "__main__":
+    encoder = ColbertTokenEncoder()
+
+    for version in WCAG_VERSIONS:
+        logger.info(f"--- Building late-interaction index for WCAG {version} ---")
+        try:
+            chunk_ids, texts = load_chunk_texts(version)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            logger.error(f"❌ Failed to load WCAG {version}: {e}")
+            continue
+
+        LateInteractionIndex.build(
+            chunk_ids, texts, encoder, LateInteractionIndex.path_for(version)
+        )
@@ -2,7 +2,11 @@ import chromadb
 from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 
 from code_wcag_a11y import client
-from code_wcag_a11y.globals import CHROMADB_WCAG_PATH, COLLECTION_NAME
+from code_wcag_a11y.globals import (
+    CHROMADB_WCAG_PATH,
+    COLLECTION_NAME,
+    EMBEDDING_MODEL,
+)
 
 
 def get_vector_client(path: str):
@@ -10,7 +14,7 @@ def get_vector_client(path: str):
 
 
 def get_embedding_model():
-    return SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
+    return SentenceTransformerEmbeddingFunction(model_name=EMBEDDING_MODEL)
 
 
 def get_collection():
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from code_wcag_a11y.globals import RERANKER_MODEL
+from code_wcag_a11y.scripts.utils.cli_utils import setup_export_parser
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.rerankers import ONNX_MODEL_FILE, ONNX_QUANTIZED_MODEL_FILE
+
+
+def export_reranker(output_dir: Path, opset: int = 17) -> Path:
+    """Export the reranker to ONNX with dynamic batch and sequence axes.
+
+    Args:
+        output_dir: Directory receiving the model and its tokenizer.
+        opset: ONNX opset version.
+
+    Returns:
+        Path to the exported fp32 model.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model_file = output_dir / ONNX_MODEL_FILE
+
+    tokenizer = AutoTokenizer.from_pretrained(RERANKER_MODEL)
+    model = AutoModelForSequenceClassification.from_pretrained(RERANKER_MODEL)
+    model.eval()
+
+    sample = tokenizer(["query"], ["passage"], return_tensors="pt")
+    logger.info(f"📦 Exporting {RERANKER_MODEL} to {model_file}")
+    with torch.no_grad():
+        # Weights above 2 GB are written as external data next to the model
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(model_file),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=opset,
+        )
+    tokenizer.save_pretrained(output_dir)
+    return model_file
+
+
+def quantize_reranker(output_dir: Path) -> Path:
+    """Apply dynamic int8 quantization to the exported model.
+
+    Returns:
+        Path to the quantized model.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_file = output_dir / ONNX_QUANTIZED_MODEL_FILE
+    logger.info(f"🗜️ Quantizing to int8: {quantized_file}")
+    quantize_dynamic(
+        model_input=output_dir / ONNX_MODEL_FILE,
+        model_output=quantized_file,
+        weight_type=QuantType.QInt8,
+    )
+    return quantized_file
+
+
+if __name__ == "__main__":
+    args = setup_export_parser()
+    output_dir = Path(args.output) if args.output else settings.onnx_reranker_path
+
+    export_reranker(output_dir, args.opset)
+    if not args.skip_quantize:
+        quantize_reranker(output_dir)
+
+    logger.info(f"✅ Reranker exported to {output_dir}")
@@ -0,0 +1,371 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator
+
+import httpx
+import numpy as np
+from mcp import ClientSession
+from pydantic import AnyUrl
+
+from code_wcag_a11y.client import open_session
+from code_wcag_a11y.globals import BENCHMARK_DIR
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.scripts.utils.cli_utils import setup_load_test_parser
+from code_wcag_a11y.utils.logger import logger
+
+
+OPERATIONS = ("analyzeWCAG", "getAccessibilityData", "resource")
+RSS_SAMPLE_INTERVAL = 1.0
+SERVER_READY_TIMEOUT = 300.0
+
+
+@dataclass
+class Sample:
+    operation: str
+    session: int
+    start: float  # seconds since the step started
+    latency: float
+    ok: bool
+    error: str | None = None
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        operation, _, weight = item.partition("=")
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{operation}' in --mix")
+        weights[operation] = float(weight or 1)
+    return weights
+
+
+def load_corpus(path: Path) -> list[dict[str, str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def process_tree_rss(root_pid: int) -> int:
+    """Summed resident set size of every process descending from root_pid."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r", encoding="ascii") as f:
+                # The command name may contain spaces; fields resume after ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    pending = list(children.get(root_pid, []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", "r", encoding="ascii") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+async def call(
+    session: ClientSession, operation: str, code: str, wcag_version: WcagVersion
+) -> None:
+    """Issue one request, raising if the server reports an error."""
+    if operation == "resource":
+        result = await session.read_resource(
+            AnyUrl(f"resource://WCAG/{wcag_version}/processed")
+        )
+        text = getattr(result.contents[0], "text", "") if result.contents else ""
+        if text.startswith('{"error"'):
+            raise RuntimeError(json.loads(text)["error"])
+        return
+
+    arguments = {"code": code}
+    if operation == "analyzeWCAG":
+        arguments["wcag_version"] = wcag_version
+    result = await session.call_tool(operation, arguments)
+    if result.isError:
+        message = result.content[0].text if result.content else "tool error"
+        raise RuntimeError(message)
+
+
+async def run_session(
+    index: int,
+    url: str | None,
+    barrier: asyncio.Barrier,
+    args,
+    corpus: list[dict[str, str]],
+    mix: dict[str, float],
+    samples: list[Sample],
+) -> None:
+    """Open a session, wait for the others, then send requests until the deadline."""
+    rng = random.Random(index)
+    operations, weights = list(mix), list(mix.values())
+    joined = False
+    step_start = 0.0
+
+    try:
+        async with open_session(url) as session:
+            await barrier.wait()
+            joined = True
+            step_start = time.perf_counter()
+            deadline = step_start + args.duration
+            next_at = step_start
+
+            while (now := time.perf_counter()) < deadline:
+                if args.rate:
+                    if now < next_at:
+                        await asyncio.sleep(next_at - now)
+                    next_at += 1.0 / args.rate
+
+                operation = rng.choices(operations, weights)[0]
+                snippet = rng.choice(corpus)
+                start = time.perf_counter()
+                try:
+                    await call(session, operation, snippet["code"], args.wcag_version)
+                    error = None
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                samples.append(
+                    Sample(
+                        operation=operation,
+                        session=index,
+                        start=start - step_start,
+                        latency=time.perf_counter() - start,
+                        ok=error is None,
+                        error=error,
+                    )
+                )
+    except Exception as e:
+        logger.error(f"❌ Session {index} failed: {e}")
+        samples.append(
+            Sample(
+                "session", index, time.perf_counter() - step_start, 0.0, False, str(e)
+            )
+        )
+        if not joined:
+            await barrier.wait()
+
+
+def local_rss_reader() -> Callable[[], Awaitable[int]]:
+    """RSS of the servers started by this process (stdio or spawned HTTP)."""
+
+    async def read() -> int:
+        return process_tree_rss(os.getpid())
+
+    return read
+
+
+def remote_rss_reader(session: ClientSession) -> Callable[[], Awaitable[int]]:
+    """RSS of whichever server worker answers getServerStats."""
+
+    async def read() -> int:
+        result = await session.call_tool("getServerStats", {})
+        stats = json.loads(result.content[0].text)
+        return int(stats["gauges"]["wcag_process_rss_bytes"])
+
+    return read
+
+
+async def sample_rss(
+    read_rss: Callable[[], Awaitable[int]],
+    barrier: asyncio.Barrier,
+    duration: float,
+    timeline: list[tuple[float, int]],
+) -> None:
+    await barrier.wait()
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < duration:
+        try:
+            timeline.append((elapsed, await read_rss()))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not sample server RSS: {e}")
+        await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+
+
+def percentiles_ms(latencies: list[float]) -> dict[str, float | None]:
+    if not latencies:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    values = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(values.max()),
+    }
+
+
+def summarize(
+    samples: list[Sample], rss: list[tuple[float, int]], duration: float
+) -> dict:
+    operations = {}
+    for operation in ("all", *OPERATIONS):
+        selected = [
+            s
+            for s in samples
+            if s.operation != "session" and operation in ("all", s.operation)
+        ]
+        if not selected:
+            continue
+        errors = sum(not s.ok for s in selected)
+        operations[operation] = {
+            "requests": len(selected),
+            "errors": errors,
+            "error_rate": errors / len(selected),
+            "throughput_rps": sum(s.ok for s in selected) / duration,
+            **percentiles_ms([s.latency for s in selected if s.ok]),
+        }
+
+    timeline = []
+    for second in range(int(np.ceil(duration))):
+        window = [s for s in samples if second <= s.start < second + 1]
+        rss_in_window = [r for t, r in rss if second <= t < second + 1]
+        timeline.append(
+            {
+                "second": second,
+                "requests": len(window),
+                "errors": sum(not s.ok for s in window),
+                "p95_ms": percentiles_ms([s.latency for s in window if s.ok])["p95_ms"],
+                "rss_bytes": max(rss_in_window) if rss_in_window else None,
+            }
+        )
+
+    return {
+        "operations": operations,
+        "failed_sessions": sum(s.operation == "session" for s in samples),
+        "peak_rss_bytes": max((r for _, r in rss), default=None),
+        "timeline": timeline,
+    }
+
+
+async def run_step(sessions: int, url: str | None, args, corpus, mix) -> dict:
+    samples: list[Sample] = []
+    rss: list[tuple[float, int]] = []
+    barrier = asyncio.Barrier(sessions + 1)
+
+    async def rss_task() -> None:
+        if args.url:
+            async with open_session(args.url) as session:
+                await sample_rss(
+                    remote_rss_reader(session), barrier, args.duration, rss
+                )
+        else:
+            await sample_rss(local_rss_reader(), barrier, args.duration, rss)
+
+    logger.info(f"🚦 Opening {sessions} session(s)...")
+    await asyncio.gather(
+        rss_task(),
+        *(
+            run_session(i, url, barrier, args, corpus, mix, samples)
+            for i in range(sessions)
+        ),
+    )
+
+    report = summarize(samples, rss, args.duration)
+    report["sessions"] = sessions
+    report["errors"] = [asdict(s) for s in samples if not s.ok][:20]
+    return report
+
+
+def log_step(report: dict) -> None:
+    peak = report["peak_rss_bytes"]
+    logger.info(
+        f"📊 {report['sessions']} session(s), peak server RSS "
+        f"{f'{peak / 2**20:.0f} MiB' if peak else 'n/a'}, "
+        f"{report['failed_sessions']} failed session(s)"
+    )
+    for operation, stats in report["operations"].items():
+        latency = (
+            f"p50 {stats['p50_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms  "
+            f"p99 {stats['p99_ms']:8.1f} ms"
+            if stats["p50_ms"] is not None
+            else "no successful requests"
+        )
+        logger.info(
+            f"   {operation:<21} {stats['throughput_rps']:7.2f} req/s  {latency}  "
+            f"errors {stats['error_rate']:6.1%}"
+        )
+
+
+@contextmanager
+def spawn_http_server(port: int, workers: int) -> Iterator[str]:
+    """Start the HTTP server in a subprocess and wait until /ready answers 200."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "code_wcag_a11y.scripts.serve_http",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+        ]
+    )
+    try:
+        deadline = time.monotonic() + SERVER_READY_TIMEOUT
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/ready").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError("Server did not become ready in time")
+            time.sleep(0.5)
+        logger.info(f"✅ Server ready on port {port} with {workers} worker(s)")
+        yield f"http://127.0.0.1:{port}/mcp"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run(args, url: str | None) -> list[dict]:
+    corpus = load_corpus(
+        Path(args.corpus) if args.corpus else BENCHMARK_DIR / "snippets.json"
+    )
+    mix = parse_mix(args.mix)
+    reports = []
+    for sessions in (int(s) for s in args.sessions.split(",")):
+        report = await run_step(sessions, url, args, corpus, mix)
+        log_step(report)
+        reports.append(report)
+    return reports
+
+
+if __name__ == "__main__":
+    args = setup_load_test_parser()
+    # One INFO line per HTTP request would drown the report
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.url or args.stdio:
+        reports = asyncio.run(run(args, args.url))
+    else:
+        with spawn_http_server(args.port, args.workers) as url:
+            reports = asyncio.run(run(args, url))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "steps": reports}, f, indent=2)
+        logger.info(f"✅ Report written to {args.output}")
@@ -2,6 +2,8 @@ import json
 from pathlib import Path
 from typing import Any
 
+from pydantic import ValidationError
+
 from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
 from code_wcag_a11y.scripts.utils.cli_utils import setup_delete_parser
 from code_wcag_a11y.scripts.utils.preprocess import (
@@ -12,6 +14,8 @@ from code_wcag_a11y.scripts.utils.preprocess import (
     make_sc_consolidated_text,
 )
 from code_wcag_a11y.scripts.types.wcag_types import WCAGData
+from code_wcag_a11y.scripts.utils.chunking import make_sc_section_chunks
+from code_wcag_a11y.scripts.utils.rule_table import build_rule_table
 from code_wcag_a11y.scripts.utils.scrape_wcag_website import (
     get_sc_url,
     get_user_benefits_from_rule_page,
@@ -19,7 +23,9 @@ from code_wcag_a11y.scripts.utils.scrape_wcag_website import (
     save_benefits_cache,
 )
 from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.wcag_corpus import load_wcag_model
 from code_wcag_a11y.globals import BENEFITS_CACHE_FILE, PROCESSED_DIR, RAW_DIR
+from code_wcag_a11y.settings import settings
 
 
 WCAG_VERSIONS = ["2.1", "2.2"]
@@ -29,6 +35,9 @@ UNDERSTANDING_DOCS_BASE_URL = "https://www.w3.org/WAI"
 def get_wcag_data(wcag_version: WcagVersion = "2.1") -> WCAGData:
     """Load and parse WCAG JSON data.
 
+    Validated straight from the file bytes; repeated calls reuse the result
+    until the file changes.
+
     Args:
         wcag_version: WCAG version to load (e.g., "2.1" or "2.2").
 
@@ -37,22 +46,20 @@ def get_wcag_data(wcag_version: WcagVersion = "2.1") -> WCAGData:
 
     Raises:
         FileNotFoundError: If the WCAG JSON file doesn't exist.
-        json.JSONDecodeError: If the file contains invalid JSON.
+        ValidationError: If the file contains invalid JSON or doesn't match
+            the WCAG models.
     """
 
     file_path = RAW_DIR / f"wcag-{wcag_version}.json"
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        return load_wcag_model(wcag_version)
     except FileNotFoundError:
         logger.error(f"❌ WCAG file not found: {file_path}")
         raise
-    except json.JSONDecodeError as e:
-        logger.error(f"❌ Invalid JSON in {file_path}: {e}")
+    except ValidationError as e:
+        logger.error(f"❌ Invalid WCAG data in {file_path}: {e}")
         raise
 
-    return WCAGData.model_validate(data)
-
 
 def preprocess_wcag_data(
     wcag_version: WcagVersion = "2.1", cache: dict[str, list[str]] = None
@@ -104,6 +111,16 @@ def preprocess_wcag_data(
                     }
 
                     chunks.append(sc_chunk)
+                    chunks.extend(
+                        make_sc_section_chunks(
+                            sc,
+                            principle,
+                            guideline,
+                            wcag_version,
+                            benefits,
+                            settings.sc_chunk_max_tokens,
+                        )
+                    )
 
     # Definitions
     for term in wcag_data.terms:
@@ -136,6 +153,23 @@ def save_preprocessed_data(
     return output_file
 
 
+def save_rule_table(table: dict[str, Any], version: WcagVersion = "2.2") -> Path:
+    """Save the signal to success criterion table used by the fast mode.
+
+    Args:
+        table: Table built by `build_rule_table`.
+        version: WCAG version string.
+
+    Returns:
+        Path to the saved file.
+    """
+    output_file = PROCESSED_DIR / f"wcag-{version}_rules.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(table, f, indent=2, ensure_ascii=False)
+    logger.debug(f"Saved rules for {len(table['signals'])} signals to {output_file}")
+    return output_file
+
+
 # Main execution
 if __name__ == "__main__":
     args = setup_delete_parser()
@@ -165,6 +199,7 @@ if __name__ == "__main__":
         logger.info(f"🚀 Processing WCAG {version}...")
         chunks = preprocess_wcag_data(version, benefits_cache)
         save_preprocessed_data(chunks, version)
+        save_rule_table(build_rule_table(chunks, version), version)
 
     # 4. Save the cache back to disk (Updated with new scrapes)
     if len(benefits_cache) > initial_cache_size:
@@ -0,0 +1,101 @@
+import asyncio
+import cProfile
+import pstats
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from code_wcag_a11y.scripts.utils.cli_utils import setup_replay_parser
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.metrics import record_stage_timings
+from code_wcag_a11y.utils.slow_requests import (
+    SlowRequestLog,
+    StackSampler,
+    load_capture,
+)
+
+
+def list_captures(log: SlowRequestLog) -> None:
+    for path in log.entries():
+        meta, _ = load_capture(path)
+        logger.info(
+            f"{path.name}  {meta['seconds']:7.2f}s  ax_nodes={meta['ax_nodes']}"
+        )
+
+
+def replay_call(
+    tools: dict[str, Callable[..., Awaitable[Any]]], meta: dict[str, Any], code: str
+) -> Awaitable[Any]:
+    """The captured tool call, with its recorded params.
+
+    Everything is passed by keyword: `analyzeWCAGDelta` takes `handle` before
+    `code`, so a positional `code` would collide with the captured handle.
+    """
+    return tools[meta["tool"]](code=code, **meta["params"])
+
+
+def replay(path: Path, output: Path | None, top: int) -> int:
+    meta, code = load_capture(path)
+    # Replays must not capture themselves
+    settings.slow_request_threshold = None
+
+    from code_wcag_a11y.mcp_server import (
+        analyze_delta_against_WCAG,
+        analyze_file_against_WCAG,
+        get_accessibility_data,
+    )
+
+    # A replayed delta has no previous result to diff against and runs in full
+    tools = {
+        "analyzeWCAG": analyze_file_against_WCAG,
+        "analyzeWCAGDelta": analyze_delta_against_WCAG,
+        "getAccessibilityData": get_accessibility_data,
+    }
+    logger.info(
+        f"🔁 Replaying {meta['tool']} on {meta['sha256'][:12]} "
+        f"(captured at {meta['seconds']:.2f}s)"
+    )
+
+    # cProfile only sees the event loop thread; the sampler also covers the
+    # worker threads running retrieval and reranking
+    profiler = cProfile.Profile()
+    sampler = StackSampler(settings.slow_request_sample_interval).start()
+    with record_stage_timings() as timings:
+        try:
+            profiler.runcall(asyncio.run, replay_call(tools, meta, code))
+        finally:
+            sampler.stop()
+
+    output = output or path / "replay.prof"
+    profiler.dump_stats(output)
+    (path / "replay.folded").write_text(sampler.to_folded(), encoding="utf-8")
+
+    captured = {t["stage"]: t["seconds"] for t in meta["stages"]}
+    for timing in timings:
+        before = captured.get(timing["stage"])
+        was = f" (captured {before:.3f}s)" if before is not None else ""
+        logger.info(f"{timing['stage']:<24} {timing['seconds']:8.3f}s{was}")
+
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+    logger.info(f"✅ Profile written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    args = setup_replay_parser()
+    log = SlowRequestLog(settings.slow_request_dir, settings.slow_request_keep)
+
+    if args.list:
+        list_captures(log)
+        sys.exit(0)
+
+    if args.capture:
+        capture = Path(args.capture)
+    elif entries := log.entries():
+        capture = entries[-1]
+    else:
+        logger.error(f"❌ No captured slow requests in {settings.slow_request_dir}")
+        sys.exit(1)
+
+    sys.exit(replay(capture, Path(args.output) if args.output else None, args.top))
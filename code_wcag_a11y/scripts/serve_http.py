@@ -0,0 +1,24 @@
+import os
+
+import uvicorn
+
+from code_wcag_a11y.scripts.utils.cli_utils import setup_http_parser
+from code_wcag_a11y.utils.logger import logger
+
+
+if __name__ == "__main__":
+    args = setup_http_parser()
+
+    # Workers are spawned processes and read their settings from the environment
+    os.environ.setdefault("WCAG_A11Y_RETRIEVAL_BACKEND", "shared")
+
+    logger.info(
+        f"Starting Code WCAG A11y MCP server on http://{args.host}:{args.port}/mcp "
+        f"with {args.workers} worker(s)..."
+    )
+    uvicorn.run(
+        "code_wcag_a11y.http_app:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
@@ -40,6 +40,12 @@ class SuccessCriterionChunk(BaseData, ParentData, total=True):
     full_context: str
 
 
+class ScSectionChunk(BaseData, ParentData, total=True):
+    parent_chunk_id: str
+    section: str
+    text: str
+
+
 class PrincipleChunk(BaseData, total=True):
     description: str
     guidelines_count: int
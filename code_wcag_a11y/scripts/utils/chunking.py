@@ -0,0 +1,131 @@
+import re
+from typing import Any, Iterable
+
+from ..types.chunk_types import ScSectionChunk, WcagVersion
+from ..types.wcag_types import Guideline, Principle, Successcriterion
+from .preprocess import (
+    clean_wcag_text,
+    format_technique_item,
+    get_base_data,
+    get_parent_data,
+)
+from code_wcag_a11y.utils.metrics import estimate_tokens
+
+
+SC_CHUNK_TYPE = "success_criterion"
+SC_SECTION_CHUNK_TYPE = "sc_section"
+
+SECTION_LABELS = {
+    "requirement": "Requirement",
+    "benefits": "User Benefits (Who this helps)",
+    "sufficient": "Sufficient Techniques (Ways to Pass)",
+    "failure": "Common Failures (QA Checkpoints)",
+}
+
+_SENTENCE_END = re.compile(r"(?<=[.;:?!])\s+")
+
+
+def pack_lines(groups: Iterable[list[str]], max_tokens: int) -> list[list[str]]:
+    """Pack groups of lines into parts of at most max_tokens estimated tokens.
+
+    Whole groups are kept together while they fit; a group too large for one
+    part is split at line boundaries. A single line over the limit becomes a
+    part of its own.
+    """
+    parts: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    def flush() -> None:
+        nonlocal current, current_tokens
+        if current:
+            parts.append(current)
+        current, current_tokens = [], 0
+
+    for group in groups:
+        group_tokens = sum(estimate_tokens(line) for line in group)
+        if current_tokens + group_tokens > max_tokens:
+            flush()
+        if group_tokens <= max_tokens:
+            current.extend(group)
+            current_tokens += group_tokens
+            continue
+
+        for line in group:
+            line_tokens = estimate_tokens(line)
+            if current_tokens + line_tokens > max_tokens:
+                flush()
+            current.append(line)
+            current_tokens += line_tokens
+    flush()
+    return parts
+
+
+def make_sc_section_chunks(
+    sc: Successcriterion,
+    principle: Principle,
+    guideline: Guideline,
+    wcag_version: WcagVersion,
+    benefits: list[str] | None = None,
+    max_tokens: int = 200,
+) -> list[ScSectionChunk]:
+    """Split a success criterion into short, self-contained child chunks.
+
+    One chunk per section (requirement, benefits, sufficient technique groups,
+    failures), each split further so it stays within max_tokens. Every chunk
+    starts with a header naming its SC and links back to the consolidated SC
+    chunk through `parent_chunk_id`.
+    """
+    header = f"WCAG Success Criterion {sc.num}: {sc.handle} (Level {sc.level})"
+    techniques = sc.techniques
+
+    sections: dict[str, list[list[str]]] = {
+        "requirement": [
+            [
+                f"Principle: {principle.handle} / Guideline: {guideline.handle}",
+                *_SENTENCE_END.split(clean_wcag_text(sc.content)),
+            ]
+        ],
+        "benefits": [[f"- {b}" for b in benefits or []]],
+        "sufficient": [
+            format_technique_item(item)
+            for item in (techniques.sufficient if techniques else None) or []
+        ],
+        "failure": [
+            format_technique_item((techniques.failure if techniques else None) or [])
+        ],
+    }
+
+    parent_chunk_id = get_base_data(sc, SC_CHUNK_TYPE, wcag_version)["chunk_id"]
+    chunks = []
+    for section, groups in sections.items():
+        label = SECTION_LABELS[section]
+        budget = max_tokens - estimate_tokens(f"{header}\n{label}:")
+        groups = [g for g in groups if g]
+        for n, lines in enumerate(pack_lines(groups, budget), start=1):
+            chunks.append(
+                {
+                    **get_base_data(sc, SC_SECTION_CHUNK_TYPE, wcag_version),
+                    **get_parent_data("guideline", guideline),
+                    "chunk_id": f"{parent_chunk_id}#{section}-{n}",
+                    "parent_chunk_id": parent_chunk_id,
+                    "section": section,
+                    "text": "\n".join([header, f"{label}:", *lines]),
+                }
+            )
+    return chunks
+
+
+def select_index_chunks(
+    chunks: list[dict[str, Any]], sub_chunks: bool
+) -> list[dict[str, Any]]:
+    """Chunks to embed: SC sections instead of consolidated SCs, or the reverse.
+
+    Consolidated SC chunks without sections are always kept.
+    """
+    sectioned = {
+        c["parent_chunk_id"] for c in chunks if c.get("type") == SC_SECTION_CHUNK_TYPE
+    }
+    if sub_chunks:
+        return [c for c in chunks if c.get("chunk_id") not in sectioned]
+    return [c for c in chunks if c.get("type") != SC_SECTION_CHUNK_TYPE]
@@ -1,5 +1,7 @@
 import argparse
 
+from code_wcag_a11y.settings import settings
+
 
 def setup_delete_parser():
     """Setup parser for file deletion."""
@@ -21,3 +23,355 @@ def setup_delete_parser():
     )
 
     return parser.parse_args()
+
+
+def setup_project_parser():
+    """Setup parser for project-wide analysis."""
+    parser = argparse.ArgumentParser(
+        prog="Analyze Project",
+        description="Find relevant WCAG Success Criteria for every component in a project",
+    )
+
+    parser.add_argument("root", help="Project directory to analyze")
+
+    parser.add_argument(
+        "-v",
+        "--wcag-version",
+        choices=["2.1", "2.2"],
+        default="2.2",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=settings.max_concurrent_analyses,
+        help="Number of files analyzed concurrently",
+    )
+
+    parser.add_argument(
+        "-m",
+        "--mode",
+        choices=["full", "fast"],
+        default="full",
+        help="fast ranks SCs from accessibility signals without loading any model",
+    )
+
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["jsonl", "sarif"],
+        default="jsonl",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Output file (defaults to stdout)",
+    )
+
+    return parser.parse_args()
+
+
+def setup_export_parser():
+    """Setup parser for exporting the reranker to ONNX."""
+    parser = argparse.ArgumentParser(
+        prog="Export Reranker",
+        description="Export the reranker to ONNX and quantize it to int8",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Directory for the exported model (defaults to the configured ONNX path)",
+    )
+
+    parser.add_argument(
+        "--opset",
+        type=int,
+        default=17,
+    )
+
+    parser.add_argument(
+        "--skip-quantize",
+        action="store_true",
+    )
+
+    return parser.parse_args()
+
+
+def setup_benchmark_parser():
+    """Setup parser for the reranker benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="Benchmark Reranker",
+        description="Compare latency and score agreement of reranker backends",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--backends",
+        nargs="+",
+        choices=["flag", "onnx"],
+        default=["flag", "onnx"],
+        help="Backends to compare; the first one is the reference",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--passages",
+        type=int,
+        default=20,
+        help="Passages scored per snippet",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--wcag-version",
+        choices=["2.1", "2.2"],
+        default="2.2",
+    )
+
+    return parser.parse_args()
+
+
+def setup_retrieval_benchmark_parser():
+    """Setup parser for the retrieval quality benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="Benchmark Retrieval",
+        description="Measure recall, nDCG, MRR and latency of retrieval configurations",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--configurations",
+        help="JSON list of {name, rerank, settings} (defaults to the benchmark ones)",
+    )
+
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        help="Names of the configurations to run",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--snippets",
+        help="JSON list of {id, code, expected} snippets (defaults to the benchmark snippets)",
+    )
+
+    parser.add_argument(
+        "-k",
+        type=int,
+        nargs="+",
+        default=[5, 10],
+        help="Cutoffs for recall@k and nDCG@k",
+    )
+
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per snippet; quality is measured on the first",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--wcag-version",
+        choices=["2.1", "2.2"],
+        default="2.2",
+    )
+
+    parser.add_argument(
+        "--baseline",
+        help="Configuration the others are compared with (defaults to the first)",
+    )
+
+    parser.add_argument(
+        "--max-drop",
+        type=float,
+        help="Fail when a configuration's nDCG at the largest k is this far below the baseline",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write the results as JSON",
+    )
+
+    return parser.parse_args()
+
+
+def setup_http_parser():
+    """Setup parser for the HTTP deployment of the MCP server."""
+    parser = argparse.ArgumentParser(
+        prog="WCAG MCP HTTP Server",
+        description="Serve the MCP server over streamable HTTP with several workers",
+    )
+
+    parser.add_argument("--host", default=settings.http_host)
+
+    parser.add_argument("--port", type=int, default=settings.http_port)
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=settings.http_workers,
+        help="Worker processes behind the listener",
+    )
+
+    return parser.parse_args()
+
+
+def setup_replay_parser():
+    """Setup parser for replaying captured slow requests."""
+    parser = argparse.ArgumentParser(
+        prog="Replay Slow Request",
+        description="Re-run a captured slow request offline under cProfile",
+    )
+
+    parser.add_argument(
+        "capture",
+        nargs="?",
+        help="Capture directory (defaults to the most recent capture)",
+    )
+
+    parser.add_argument(
+        "-l",
+        "--list",
+        action="store_true",
+        help="List captured slow requests and exit",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write the cProfile stats to this file (defaults to the capture)",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--top",
+        type=int,
+        default=25,
+        help="Number of functions to print, by cumulative time",
+    )
+
+    return parser.parse_args()
+
+
+def setup_load_test_parser():
+    """Setup parser for the MCP load generator."""
+    parser = argparse.ArgumentParser(
+        prog="WCAG MCP Load Test",
+        description="Drive concurrent MCP sessions against the server and report "
+        "throughput, latency percentiles, error rates and server RSS",
+    )
+
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
+        "--url",
+        help="Streamable HTTP endpoint of a running server, e.g. "
+        "http://localhost:8000/mcp (RSS is then read through getServerStats)",
+    )
+    target.add_argument(
+        "--stdio",
+        action="store_true",
+        help="Start one stdio server per session instead of a shared HTTP server",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--sessions",
+        default="4",
+        help="Concurrent sessions; a comma-separated list runs one step per "
+        "value (e.g. 1,2,4,8) to find the saturation point",
+    )
+
+    parser.add_argument(
+        "-r",
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Requests per second per session (0 sends back to back)",
+    )
+
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        default=60.0,
+        help="Seconds per step",
+    )
+
+    parser.add_argument(
+        "-m",
+        "--mix",
+        default="analyzeWCAG=8,getAccessibilityData=1,resource=1",
+        help="Relative weights of analyzeWCAG, getAccessibilityData and resource",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--corpus",
+        help="JSON list of {id, code} snippets (defaults to the benchmark snippets)",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--wcag-version",
+        choices=["2.1", "2.2"],
+        default="2.2",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=settings.http_workers,
+        help="Worker processes of the spawned HTTP server",
+    )
+
+    parser.add_argument("--port", type=int, default=8765)
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write the full report with per-second timelines as JSON",
+    )
+
+    return parser.parse_args()
+
+
+def setup_build_index_parser():
+    """Setup parser for building the vector index."""
+    parser = argparse.ArgumentParser(
+        prog="Build Index",
+        description="Embed the preprocessed WCAG chunks into the vector index",
+    )
+
+    parser.add_argument(
+        "-d",
+        "--delete",
+        action="store_true",
+        help="Delete the existing index first",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=settings.embed_workers,
+        help="Embedding worker processes (0 uses every core)",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--batch-size",
+        type=int,
+        default=settings.embed_batch_size,
+        help="Chunks per embedding batch",
+    )
+
+    return parser.parse_args()
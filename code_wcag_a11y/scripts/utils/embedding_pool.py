@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Sequence
+
+import numpy as np
+
+from code_wcag_a11y.globals import EMBEDDING_MODEL
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.metrics import estimate_tokens
+
+
+# Seconds between throughput log lines
+PROGRESS_INTERVAL = 2.0
+
+_model = None
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    global _model
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # Each worker gets its share of the cores instead of all of them
+    torch.set_num_threads(threads)
+    _model = SentenceTransformer(model_name, device="cpu")
+
+
+def _encode(texts: list[str]) -> np.ndarray:
+    # Same call as Chroma's SentenceTransformerEmbeddingFunction, so the vectors
+    # match what the collection would have computed itself
+    return _model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+
+
+class DocumentEmbedder:
+    """Embeds documents for index builds on a pool of worker processes.
+
+    Documents are sorted by estimated token length and cut into batches of
+    neighbours, so each batch pads to a similar length. Batches are spread
+    over the workers; each loads the model once and uses
+    `cpu_count // workers` intra-op threads.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        batch_size: int = 32,
+        model_name: str = EMBEDDING_MODEL,
+    ):
+        cores = os.cpu_count() or 1
+        self.workers = workers or cores
+        self.batch_size = batch_size
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            # torch is not fork-safe once initialized in the parent
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, max(1, cores // self.workers)),
+        )
+
+    def __enter__(self) -> "DocumentEmbedder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._pool.shutdown()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts, returning one row per text in input order."""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        lengths = [estimate_tokens(text) for text in texts]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        batches = [
+            order[start : start + self.batch_size]
+            for start in range(0, len(order), self.batch_size)
+        ]
+
+        # Longest batches first, so no worker is left with a long one at the end
+        futures = {
+            self._pool.submit(_encode, [texts[i] for i in batch]): batch
+            for batch in reversed(batches)
+        }
+        rows: dict[int, np.ndarray] = {}
+        start = last_log = time.perf_counter()
+        done_tokens = 0
+
+        for future in as_completed(futures):
+            batch = futures[future]
+            for i, vector in zip(batch, future.result()):
+                rows[i] = vector
+            done_tokens += sum(lengths[i] for i in batch)
+
+            now = time.perf_counter()
+            if now - last_log >= PROGRESS_INTERVAL or len(rows) == len(texts):
+                elapsed = now - start
+                logger.info(
+                    f"⚡ Embedded {len(rows)}/{len(texts)} chunks: "
+                    f"{len(rows) / elapsed:.1f} chunks/s, "
+                    f"~{done_tokens / elapsed:.0f} tokens/s "
+                    f"on {self.workers} worker(s)"
+                )
+                last_log = now
+
+        return np.stack([rows[i] for i in range(len(texts))]).astype(np.float32)
@@ -0,0 +1,157 @@
+import math
+import re
+from typing import Any
+
+from ..types.chunk_types import WcagVersion
+from .chunking import SC_CHUNK_TYPE
+
+
+RULE_TECHNIQUE_RE = re.compile(r"^(([A-Z]+)\d+):\s*(.+)$")
+# Technique families matched against each kind of signal: markup signals
+# against ARIA and HTML techniques, visual ones (computed styles and layout)
+# against CSS and general techniques; failures apply to both
+MARKUP_FAMILIES = frozenset({"ARIA", "H", "F"})
+VISUAL_FAMILIES = frozenset({"C", "G", "F"})
+TECHNIQUE_WEIGHTS = {"sufficient": 1.0, "failure": 1.0, "advisory": 0.5}
+
+_FORM_TERMS = r"form controls?|\binputs?\b|\blabels?\b|\bfields?\b|instructions|\berrors?\b"
+_REGION_TERMS = r"landmarks?|\bregions?\b|bypass|skip|structure|sections?"
+_WIDGET_TERMS = r"widgets?|user interface components?|custom controls?|\bstates?\b|keyboard"
+
+# Accessibility signals (see extract_applicability_signals) and the wording
+# technique titles use for the roles, attributes and states behind them
+SIGNAL_TERMS: dict[str, str] = {
+    "role:image": r"\bimg\b|\bimages?\b|\balt\b|non-text|text alternatives?|\bsvg\b",
+    "role:link": r"\blinks?\b|anchor|\ba elements?\b|link text",
+    "role:button": r"\bbuttons?\b|submit|\bcontrols?\b",
+    "role:textbox": _FORM_TERMS + r"|text fields?|autocomplete|input purpose",
+    "role:searchbox": _FORM_TERMS + r"|search",
+    "role:combobox": _FORM_TERMS + r"|\bselect\b|options?|listbox",
+    "role:listbox": _FORM_TERMS + r"|\bselect\b|options?|listbox",
+    "role:checkbox": _FORM_TERMS + r"|checkbox|radio|fieldset|legend|groups?",
+    "role:radio": _FORM_TERMS + r"|checkbox|radio|fieldset|legend|groups?",
+    "role:switch": _WIDGET_TERMS + r"|aria-checked|toggle",
+    "role:slider": _WIDGET_TERMS + r"|range|value",
+    "role:spinbutton": _FORM_TERMS + r"|value",
+    "role:heading": r"headings?|\bh[1-6]\b|section headings",
+    "role:table": r"\btables?\b|\bth\b|\btd\b|caption|\bscope\b|headers|data cells",
+    "role:cell": r"\btables?\b|\btd\b|headers|data cells",
+    "role:columnheader": r"\btables?\b|\bth\b|\bscope\b|headers",
+    "role:rowheader": r"\btables?\b|\bth\b|\bscope\b|headers",
+    "role:list": r"\blists?\b|\bul\b|\bol\b|\bdl\b",
+    "role:navigation": r"navigation|\bnav\b|menus?|" + _REGION_TERMS,
+    "role:main": _REGION_TERMS,
+    "role:banner": _REGION_TERMS,
+    "role:contentinfo": _REGION_TERMS,
+    "role:complementary": _REGION_TERMS,
+    "role:region": _REGION_TERMS,
+    "role:search": _REGION_TERMS + r"|search",
+    "role:form": _REGION_TERMS + r"|\bforms?\b",
+    "role:dialog": r"dialogs?|modal|focus order|keyboard trap|\bfocus\b",
+    "role:alertdialog": r"dialogs?|modal|alert|focus order|\bfocus\b",
+    "role:alert": r"status messages?|\balerts?\b|aria-live|live regions?|\blog\b",
+    "role:status": r"status messages?|\bstatus\b|aria-live|live regions?",
+    "role:progressbar": r"status messages?|progress",
+    "role:video": r"captions?|audio descriptions?|\bmedia\b|video|transcripts?|sign language",
+    "role:audio": r"captions?|\bmedia\b|\baudio\b|transcripts?",
+    "role:tab": _WIDGET_TERMS,
+    "role:menuitem": _WIDGET_TERMS + r"|menus?",
+    "role:tree": _WIDGET_TERMS,
+    "category:forms": _FORM_TERMS + r"|\bforms?\b|submit",
+    "category:keyboard": r"keyboard|\bfocus\b|focus order|tabindex|keystrokes?",
+    "category:labels": r"\blabels?\b|aria-labelledby|accessible names?",
+    "category:unnamed": r"aria-label\b|aria-labelledby|accessible names?|text alternatives?"
+    r"|link text|title attribute|\bnames?\b",
+    "category:required": r"required|mandatory|\berrors?\b|instructions",
+    "category:editable": r"\binputs?\b|\bfields?\b|autocomplete|input purpose",
+    "category:low_contrast": r"\bcontrast\b|foreground colou?rs?|background colou?rs?"
+    r"|background images?",
+    "category:small_target": r"\btargets?\b|min-height|min-width|44 by 44",
+    "category:no_focus_indicator": r"focus indicator|receives? focus|when focus"
+    r"|focus-visible|\boutlines?\b|highlighted",
+}
+VISUAL_SIGNALS = frozenset(
+    {"category:low_contrast", "category:small_target", "category:no_focus_indicator"}
+)
+_MARKUP_PATTERNS = {
+    signal: re.compile(terms, re.IGNORECASE)
+    for signal, terms in SIGNAL_TERMS.items()
+    if signal not in VISUAL_SIGNALS
+}
+_VISUAL_PATTERNS = {
+    signal: re.compile(terms, re.IGNORECASE)
+    for signal, terms in SIGNAL_TERMS.items()
+    if signal in VISUAL_SIGNALS
+}
+
+
+def build_rule_table(
+    chunks: list[dict[str, Any]], wcag_version: WcagVersion
+) -> dict[str, Any]:
+    """Map accessibility signals to the success criteria their techniques cover.
+
+    For every consolidated SC chunk, each technique in its metadata adds its
+    category weight to every signal its title mentions: markup signals match
+    ARIA, HTML and failure techniques, visual signals CSS, general and failure
+    techniques. Weights are divided by the square root of the SC's technique
+    count in those families, so SCs listing many techniques do not win on
+    volume, and every signal carries an idf (log of SCs over SCs it maps to)
+    so rare signals outweigh broad ones.
+
+    Returns:
+        `{"wcag_version", "criteria": {num: {chunk_id, title, level}},
+        "signals": {signal: {"idf", "criteria": {num: {weight, techniques}}}}}`
+    """
+    criteria: dict[str, dict[str, Any]] = {}
+    signals: dict[str, dict[str, dict[str, Any]]] = {}
+
+    for chunk in chunks:
+        if chunk.get("type") != SC_CHUNK_TYPE:
+            continue
+        num = chunk["num"]
+        criteria[num] = {
+            "chunk_id": chunk["chunk_id"],
+            "title": chunk.get("handle"),
+            "level": chunk.get("level"),
+        }
+
+        techniques = chunk.get("metadata", {}).get("techniques", {})
+        parsed = []
+        for category, weight in TECHNIQUE_WEIGHTS.items():
+            for line in techniques.get(category, []):
+                if match := RULE_TECHNIQUE_RE.match(line):
+                    parsed.append((weight, *match.groups()))
+
+        for families, patterns in (
+            (MARKUP_FAMILIES, _MARKUP_PATTERNS),
+            (VISUAL_FAMILIES, _VISUAL_PATTERNS),
+        ):
+            matched = [t for t in parsed if t[2] in families]
+            if not matched:
+                continue
+            scale = 1 / math.sqrt(len(matched))
+            for weight, technique_id, _, title in matched:
+                for signal, pattern in patterns.items():
+                    if not pattern.search(title):
+                        continue
+                    entry = signals.setdefault(signal, {}).setdefault(
+                        num, {"weight": 0.0, "techniques": []}
+                    )
+                    entry["weight"] += weight * scale
+                    if technique_id not in entry["techniques"]:
+                        entry["techniques"].append(technique_id)
+
+    return {
+        "wcag_version": wcag_version,
+        "criteria": criteria,
+        "signals": {
+            signal: {
+                "idf": round(math.log(1 + len(criteria) / len(mapped)), 4),
+                "criteria": {
+                    num: {**entry, "weight": round(entry["weight"], 4)}
+                    for num, entry in sorted(mapped.items())
+                },
+            }
+            for signal, mapped in sorted(signals.items())
+        },
+    }
@@ -0,0 +1,132 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from code_wcag_a11y.globals import MODELS_DIR, SLOW_REQUEST_DIR
+
+
+class Settings(BaseSettings):
+    """Runtime configuration, overridable through `WCAG_A11Y_*` environment variables."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="WCAG_A11Y_", env_file=".env", extra="ignore"
+    )
+
+    # Reranking
+    reranker_backend: Literal["flag", "onnx", "late_interaction"] = "flag"
+    onnx_reranker_path: Path = MODELS_DIR / "bge-reranker-v2-m3-onnx"
+    onnx_quantized: bool = True
+    onnx_intra_op_threads: int = 0  # 0 lets ONNX Runtime pick
+    rerank_batch_size: int = 8
+    rerank_max_length: int = 512
+    # Cheap first stage pruning candidates before the heavy reranker: a
+    # cross-encoder model name, or "late_interaction" for the offline ColBERT index.
+    # The exit margin is on the first stage's 0-1 scale; late-interaction scores
+    # sit close together, so lower it to about 0.05 for that first stage.
+    rerank_cascade: bool = False
+    cascade_first_stage_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    cascade_keep: int = 5
+    cascade_exit_margin: float = 0.5
+
+    # Retrieval: "chroma" queries the persistent collection, "shared" the
+    # memory-mapped export written by build_index (shared across workers)
+    retrieval_backend: Literal["chroma", "shared"] = "chroma"
+    similarity_top_k: int = 20
+    # Success criteria are indexed as short section chunks (requirement,
+    # benefits, technique groups, failures) and aggregated back to their SC.
+    # Section size is applied when preprocessing, in estimated tokens. Off
+    # until enabled for build_index: an index of whole SCs must be queried
+    # with similarity_top_k, not child_top_k.
+    sc_sub_chunks: bool = False
+    sc_chunk_max_tokens: int = 200
+    child_top_k: int = 60
+
+    # Index builds: embedding worker processes (0 uses every core) and batch size
+    embed_workers: int = 0
+    embed_batch_size: int = 32
+
+    # Query embedding
+    query_encoder_backend: Literal["torch", "onnx"] = "onnx"
+    # Quantized export shipped in the model repo; use "onnx/model.onnx" for fp32
+    query_encoder_onnx_file: str = "onnx/model_quint8_avx2.onnx"
+    query_embedding_cache_size: int = 4096
+
+    # Admission control and per-stage time budgets (seconds)
+    max_concurrent_analyses: int = 4
+    max_queued_analyses: int = 16
+    render_budget: float = 10.0
+    retrieve_budget: float = 2.0
+    rerank_budget: float = 5.0
+    snapshot_cache_size: int = 256
+    # Computed colors, font sizes, bounding boxes and focus styles captured in
+    # one DOMSnapshot call per render, for contrast, target size and focus
+    # visible signals
+    capture_visual: bool = True
+
+    # Incremental re-analysis (analyzeWCAGDelta): previous analyses kept for
+    # diffing, and chunks retrieved and reranked for the changed nodes
+    analysis_state_cache_size: int = 256
+    delta_top_k: int = 10
+
+    # Pre-rendered JSX/Vue/Svelte snippets kept, keyed by content hash
+    prerender_cache_size: int = 512
+
+    # Segmented analysis: inputs with at least segment_min_nodes AX nodes or
+    # segment_min_tokens estimated tokens of code are split into landmark,
+    # form, dialog and table regions, ranked in parallel and merged. Regions
+    # under region_min_nodes nodes are folded into their enclosing region.
+    segment_regions: bool = True
+    segment_min_nodes: int = 150
+    segment_min_tokens: int = 2000
+    region_min_nodes: int = 5
+    max_regions: int = 8
+
+    # Stage executors: retrieval and reranking run on their own thread pools so
+    # blocking model calls never stall the event loop driving the renders.
+    # Calls beyond workers + stage_queue_size wait for a free slot.
+    retrieve_workers: int = 2
+    rerank_workers: int = 1
+    stage_queue_size: int = 8
+
+    # Shared model daemon hosting the embedding and reranker models for every
+    # server process of the user. Unix socket paths are limited to ~100 chars.
+    model_daemon: bool = False
+    model_daemon_socket: Path = (
+        Path(tempfile.gettempdir()) / f"code-wcag-a11y-{os.getuid()}.sock"
+    )
+    model_daemon_start_timeout: float = 120.0
+    model_daemon_batch_window: float = 0.005
+    model_daemon_max_batch: int = 64
+    # Load the models when the stdio server or an HTTP worker starts rather
+    # than on the first full analysis; disable for clients that only use fast
+    # mode
+    preload_models: bool = True
+
+    # Idle reclamation: the models and the pooled browser are released after
+    # this many seconds unused (unset keeps them) and reloaded on next use.
+    # Above rss_budget_mb, caches are cleared cheapest first, then the models
+    # and browser. Checked every resource_check_interval seconds.
+    model_idle_timeout: float | None = 1800.0
+    browser_idle_timeout: float | None = 300.0
+    rss_budget_mb: int | None = None
+    resource_check_interval: float = 30.0
+
+    # Observability: append OpenTelemetry-shaped spans as JSON lines to this file
+    trace_file: Path | None = None
+    # Slow-request capture: tool calls taking at least this many seconds are
+    # saved with a sampled profile to slow_request_dir (unset disables it)
+    slow_request_threshold: float | None = None
+    slow_request_dir: Path = SLOW_REQUEST_DIR
+    slow_request_keep: int = 50
+    slow_request_sample_interval: float = 0.005
+
+    # HTTP deployment
+    http_host: str = "127.0.0.1"
+    http_port: int = 8000
+    http_workers: int = 1
+
+
+settings = Settings()
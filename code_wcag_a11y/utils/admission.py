@@ -0,0 +1,86 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.pipeline import StageExecutor
+
+
+T = TypeVar("T")
+
+# Values of the `degraded` list in analyzeWCAG responses
+CACHED_ACCESSIBILITY_DATA = "cached_accessibility_data"
+VECTOR_ORDER = "vector_order"
+PREVIOUS_RANKING = "previous_ranking"
+SKIPPED_REGIONS = "skipped_regions"
+
+
+class ServerBusyError(RuntimeError):
+    """Raised when the admission queue is full."""
+
+
+class StageTimeoutError(TimeoutError):
+    """Raised when a stage exceeds its budget and cannot be degraded."""
+
+
+class AdmissionController:
+    """Caps concurrent analyses and the number of requests waiting for a slot.
+
+    Requests beyond `max_concurrent + max_queued` are rejected immediately
+    instead of queueing without bound.
+    """
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self.waiting >= self.max_queued:
+            self.rejected += 1
+            raise ServerBusyError(
+                f"Server busy: {self.active} analyses running and {self.waiting} "
+                "queued. Retry later."
+            )
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+
+async def run_with_budget(coro: Awaitable[T], budget: float, stage: str) -> T:
+    """Await coro, raising StageTimeoutError if it takes longer than budget seconds."""
+    try:
+        return await asyncio.wait_for(coro, timeout=budget)
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ Stage '{stage}' exceeded its {budget:g}s budget")
+        raise StageTimeoutError(f"Stage '{stage}' exceeded its {budget:g}s budget")
+
+
+async def run_blocking_with_budget(
+    func: Callable[..., T],
+    *args,
+    budget: float,
+    stage: str,
+    executor: StageExecutor | None = None,
+) -> T:
+    """Run a blocking call in a worker thread under a time budget.
+
+    The call runs on the stage's executor if given, else the default thread
+    pool. The thread cannot be interrupted; on timeout its result is discarded.
+    """
+    call = executor.run(func, *args) if executor else asyncio.to_thread(func, *args)
+    return await run_with_budget(call, budget, stage)
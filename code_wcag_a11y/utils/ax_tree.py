@@ -0,0 +1,307 @@
+import json
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import IntFlag
+from json.encoder import encode_basestring
+from typing import Any, Iterator
+
+
+class AXFlag(IntFlag):
+    """Boolean accessibility states, bit-packed into a single int per node."""
+
+    FOCUSABLE = 1
+    EDITABLE = 2
+    READONLY = 4
+    REQUIRED = 8
+
+
+# (dict key / CDP property name, flag) in the order they appear in the legacy dict
+FLAG_PROPERTIES: tuple[tuple[str, AXFlag], ...] = (
+    ("focusable", AXFlag.FOCUSABLE),
+    ("editable", AXFlag.EDITABLE),
+    ("readonly", AXFlag.READONLY),
+    ("required", AXFlag.REQUIRED),
+)
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _json_str(value: str | None) -> str:
+    return "null" if value is None else encode_basestring(value)
+
+
+@dataclass(slots=True)
+class VisualInfo:
+    """Computed styles and layout of the element behind an AX node."""
+
+    # None when the computed color is not in rgb() / rgba() notation
+    color: str | None  # "#rrggbb"
+    background: str | None  # effective background behind the element, "#rrggbb"
+    contrast: float | None  # color against background, 1 to 21
+    font_size: float  # CSS px
+    bold: bool
+    width: float  # CSS px
+    height: float
+    issues: tuple[str, ...] = ()  # see code_wcag_a11y.utils.visual
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "color": self.color,
+            "background": self.background,
+            "contrast": self.contrast,
+            "font_size": self.font_size,
+            "bold": self.bold,
+            "size": [self.width, self.height],
+            "issues": list(self.issues),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "VisualInfo":
+        width, height = data["size"]
+        return cls(
+            color=data["color"],
+            background=data["background"],
+            contrast=data["contrast"],
+            font_size=data["font_size"],
+            bold=data["bold"],
+            width=width,
+            height=height,
+            issues=tuple(data.get("issues", ())),
+        )
+
+
+@dataclass(slots=True)
+class AXNode:
+    """One non-ignored node of the accessibility tree."""
+
+    node_id: str
+    role: str | None
+    name: str | None
+    flags: int = 0
+    labels: tuple[str, ...] = ()
+    # CDP editable token ("plaintext" or "richtext") behind AXFlag.EDITABLE
+    editable_kind: str | None = None
+    parent_id: str | None = None
+    child_ids: list[str] = field(default_factory=list)
+    # Only text and focusable nodes are annotated, when visual capture is on
+    visual: VisualInfo | None = None
+
+    def has(self, flag: AXFlag) -> bool:
+        return bool(self.flags & flag)
+
+    @property
+    def issues(self) -> tuple[str, ...]:
+        return self.visual.issues if self.visual is not None else ()
+
+    @property
+    def focusable(self) -> bool:
+        return self.has(AXFlag.FOCUSABLE)
+
+    @property
+    def editable(self) -> bool:
+        return self.has(AXFlag.EDITABLE)
+
+    @property
+    def readonly(self) -> bool:
+        return self.has(AXFlag.READONLY)
+
+    @property
+    def required(self) -> bool:
+        return self.has(AXFlag.REQUIRED)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Legacy dict shape returned by `getAccessibilityData`.
+
+        `editable` is the CDP token ("plaintext" or "richtext") when there is
+        one and a bool otherwise, as in the dicts built before `AXNode`.
+        """
+        node = {"role": self.role, "name": self.name}
+        for key, flag in FLAG_PROPERTIES:
+            node[key] = self.has(flag)
+        if self.editable_kind is not None:
+            node["editable"] = self.editable_kind
+        node["labels"] = list(self.labels)
+        node["ignored"] = False
+        if self.visual is not None:
+            node["visual"] = self.visual.to_dict()
+        return node
+
+    def to_json(self) -> str:
+        """Serialize straight from the slots, without building the dict first."""
+        parts = [f'"role":{_json_str(self.role)}', f'"name":{_json_str(self.name)}']
+        for key, flag in FLAG_PROPERTIES:
+            if flag is AXFlag.EDITABLE and self.editable_kind is not None:
+                parts.append(f'"{key}":{_json_str(self.editable_kind)}')
+            else:
+                parts.append(f'"{key}":{"true" if self.flags & flag else "false"}')
+        parts.append(f'"labels":[{",".join(map(encode_basestring, self.labels))}]')
+        parts.append('"ignored":false')
+        if self.visual is not None:
+            visual = json.dumps(self.visual.to_dict(), separators=(",", ":"))
+            parts.append(f'"visual":{visual}')
+        return "{" + ",".join(parts) + "}"
+
+
+class AXSnapshot:
+    """Normalized accessibility tree with a parent/child index.
+
+    Nodes are kept in document order. Ignored nodes are dropped and their
+    children are re-parented to the nearest non-ignored ancestor. `sources`
+    holds the rendered markup of region roots when the page was segmented.
+    """
+
+    __slots__ = ("nodes", "sources")
+
+    def __init__(self, nodes: dict[str, AXNode], sources: dict[str, str] | None = None):
+        self.nodes = nodes
+        self.sources = sources or {}
+
+    @classmethod
+    def from_cdp(cls, ax_tree: dict[str, Any]) -> "AXSnapshot":
+        """Build a snapshot from the `Accessibility.getFullAXTree` response."""
+        raw_parents: dict[str, str | None] = {}
+        nodes: dict[str, AXNode] = {}
+
+        for node in ax_tree["nodes"]:
+            node_id = node["nodeId"]
+            raw_parents[node_id] = node.get("parentId")
+            if node.get("ignored", False):
+                continue
+
+            # nodeList values (e.g. labelledby) have no scalar "value" key
+            props = {
+                p["name"]: p["value"].get("value", p["value"])
+                for p in node.get("properties", [])
+                if "value" in p
+            }
+            labelledby = props.get("labelledby", {})
+            labels: tuple[str, ...] = ()
+            if labelledby.get("type") == "nodeList":
+                labels = tuple(n["text"] for n in labelledby.get("relatedNodes", []))
+
+            flags = 0
+            for key, flag in FLAG_PROPERTIES:
+                if props.get(key):
+                    flags |= flag
+
+            editable = props.get("editable")
+            nodes[node_id] = AXNode(
+                node_id=node_id,
+                role=_intern(node.get("role", {}).get("value")),
+                name=node.get("name", {}).get("value"),
+                flags=flags,
+                labels=labels,
+                editable_kind=_intern(editable) if isinstance(editable, str) else None,
+            )
+
+        for node_id, node in nodes.items():
+            parent_id = raw_parents.get(node_id)
+            while parent_id is not None and parent_id not in nodes:
+                parent_id = raw_parents.get(parent_id)
+            if parent_id is not None:
+                node.parent_id = parent_id
+                nodes[parent_id].child_ids.append(node_id)
+
+        return cls(nodes)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, dict[str, Any]]) -> "AXSnapshot":
+        """Rebuild a snapshot from the legacy dict output (no tree structure)."""
+        nodes = {}
+        for node_id, node in data.items():
+            flags = 0
+            for key, flag in FLAG_PROPERTIES:
+                if node.get(key):
+                    flags |= flag
+            nodes[node_id] = AXNode(
+                node_id=node_id,
+                role=_intern(node.get("role")),
+                name=node.get("name"),
+                flags=flags,
+                labels=tuple(node.get("labels", ())),
+                editable_kind=(
+                    node["editable"] if isinstance(node.get("editable"), str) else None
+                ),
+                visual=(
+                    VisualInfo.from_dict(node["visual"]) if "visual" in node else None
+                ),
+            )
+        return cls(nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator[AXNode]:
+        return iter(self.nodes.values())
+
+    def get(self, node_id: str) -> AXNode | None:
+        return self.nodes.get(node_id)
+
+    def parent(self, node_id: str) -> AXNode | None:
+        parent_id = self.nodes[node_id].parent_id
+        return self.nodes[parent_id] if parent_id is not None else None
+
+    def children(self, node_id: str) -> list[AXNode]:
+        return [self.nodes[child_id] for child_id in self.nodes[node_id].child_ids]
+
+    def roots(self) -> list[AXNode]:
+        return [node for node in self.nodes.values() if node.parent_id is None]
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        return {node_id: node.to_dict() for node_id, node in self.nodes.items()}
+
+    def to_json(self) -> str:
+        return (
+            "{"
+            + ",".join(
+                f"{encode_basestring(node_id)}:{node.to_json()}"
+                for node_id, node in self.nodes.items()
+            )
+            + "}"
+        )
+
+
+def normalize_ax_tree(ax_tree: dict[str, Any]) -> AXSnapshot:
+    return AXSnapshot.from_cdp(ax_tree)
+
+
+def node_key(node: AXNode) -> tuple:
+    """What identifies a node across renders (node ids are not stable)."""
+    return (node.role, node.name, node.labels, node.flags, node.issues)
+
+
+@dataclass(slots=True)
+class SnapshotDiff:
+    added: list[AXNode]
+    removed: list[AXNode]
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def diff_snapshots(old: AXSnapshot, new: AXSnapshot) -> SnapshotDiff:
+    """Multiset difference of the nodes of two snapshots, compared by `node_key`.
+
+    A node whose role, name, labels or states changed shows up as removed in
+    its old form and added in its new one.
+    """
+    remaining = Counter(node_key(node) for node in old)
+    added = []
+    for node in new:
+        key = node_key(node)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            added.append(node)
+
+    removed = []
+    for node in old:
+        key = node_key(node)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+            removed.append(node)
+    return SnapshotDiff(added=added, removed=removed)
@@ -0,0 +1,91 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from playwright.async_api import async_playwright
+
+from code_wcag_a11y.utils.logger import logger
+
+
+class BrowserPool:
+    """One headless Chromium shared by every render, launched on first use.
+
+    Each render gets its own browser context, so pages stay isolated while the
+    launch cost is paid once. `close` (or `close_threadsafe`, from the
+    resource manager) shuts the browser down when no render is using it; the
+    next render launches it again.
+
+    Launching, counting a render as active and closing all happen under one
+    lock, so a render never gets a browser that is being closed and a close
+    never races a launch into a second Chromium.
+    """
+
+    def __init__(self):
+        self.launches = 0
+        self.active = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._playwright: Any = None
+        self._browser: Any = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._browser is not None
+
+    async def _acquire(self) -> Any:
+        """The running browser, launched if needed, counted as in use."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A browser driven by an earlier event loop (a previous
+            # asyncio.run) cannot be used from this one
+            self._loop, self._lock = loop, asyncio.Lock()
+            self._playwright = self._browser = None
+
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self.launches += 1
+                logger.debug(f"Launched Chromium (launch {self.launches})")
+            self.active += 1
+            return self._browser
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[Any]:
+        """A fresh browser context, closed on exit."""
+        browser = await self._acquire()
+        try:
+            context = await browser.new_context()
+            try:
+                yield context
+            finally:
+                await context.close()
+        finally:
+            self.active -= 1
+
+    async def close(self) -> bool:
+        """Shut the browser down unless a render is using it.
+
+        Returns:
+            Whether a running browser was closed.
+        """
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            return False
+        async with self._lock:
+            if self.active or self._browser is None:
+                return False
+            browser, playwright = self._browser, self._playwright
+            self._browser = self._playwright = None
+            # Still under the lock: no render can launch another browser
+            # until this one is gone
+            await browser.close()
+            await playwright.stop()
+            return True
+
+    def close_threadsafe(self, timeout: float = 10.0) -> bool:
+        """Run `close` on the browser's event loop from another thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        return asyncio.run_coroutine_threadsafe(self.close(), loop).result(timeout)
@@ -0,0 +1,49 @@
+import copy
+from typing import Any
+
+
+def parent_chunk_id(node: Any) -> str:
+    """Id of the chunk a retrieved node belongs to: its SC for sections, else itself."""
+    metadata = node.metadata
+    return (
+        metadata.get("parent_chunk_id")
+        or metadata.get("chunk_id")
+        or node.node.node_id
+    )
+
+
+def aggregate_to_parents(nodes: list, top_k: int) -> list:
+    """Collapse SC section hits into one hit per success criterion.
+
+    Each parent scores its best section's score and keeps that section's text
+    as the passage, so the reranker sees a short passage. The matched sections
+    are listed in the `sections` metadata, best first, on a copy of the node;
+    the retrieved nodes are left untouched. Nodes without a parent pass
+    through unchanged.
+
+    Args:
+        nodes: Retrieved nodes, best first.
+        top_k: Number of parents to return.
+
+    Returns:
+        Up to top_k nodes, best first.
+    """
+    parents: dict[str, Any] = {}
+    for hit in nodes:
+        key = parent_chunk_id(hit)
+        best = parents.get(key)
+        if best is None:
+            if "parent_chunk_id" in hit.node.metadata:
+                metadata = hit.node.metadata
+                hit = copy.copy(hit)
+                hit.node = copy.copy(hit.node)
+                hit.node.metadata = {
+                    **metadata,
+                    "chunk_id": key,
+                    "sections": [metadata.get("section")],
+                }
+            parents[key] = hit
+        elif "sections" in best.node.metadata:
+            best.node.metadata["sections"].append(hit.node.metadata.get("section"))
+    ranked = sorted(parents.values(), key=lambda n: n.score or 0.0, reverse=True)
+    return ranked[:top_k]
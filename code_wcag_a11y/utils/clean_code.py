@@ -1,5 +1,9 @@
 import re
 
+from code_wcag_a11y.utils.ax_tree import AXSnapshot
+from code_wcag_a11y.utils.prerender import prerender_component
+from code_wcag_a11y.utils.visual import NON_TARGET_ROLES
+
 CLASS_ATTR_RE = re.compile(r'\sclass(Name)?=["\'][^"\']*["\']')
 
 
@@ -11,32 +15,52 @@ def remove_class_attribute_from_node(html: str) -> str:
 def clean_code_snippet(code: str) -> str:
     """
     Prepare a code snippet for browser-based accessibility analysis.
+
+    JSX, Vue and Svelte snippets are pre-rendered to static HTML first.
     """
     if not code or not code.strip():
         raise ValueError("Empty code snippet provided")
 
-    return remove_class_attribute_from_node(code.strip())
+    return remove_class_attribute_from_node(prerender_component(code.strip()))
 
 
-def extract_applicability_signals(ax_nodes):
+def extract_applicability_signals(snapshot: AXSnapshot):
     roles = set()
     categories = set()
 
-    for node in ax_nodes.values():
-        role = node.get("role")
+    for node in snapshot:
+        role = node.role
+        # The document and frame roots wrap every snippet: focusable and often
+        # unnamed, they would add keyboard and unnamed signals to any markup
+        if role in NON_TARGET_ROLES:
+            continue
         if role:
             roles.add(role)
 
         if role in ["textbox", "checkbox", "radio"]:
             categories.add("forms")
 
-        if node.get("focusable"):
+        if node.focusable:
             categories.add("keyboard")
 
-        if node.get("labels"):
+        if node.labels:
             categories.add("labels")
 
+        if node.required:
+            categories.add("required")
+
+        if node.editable:
+            categories.add("editable")
+
+        if not node.name and (node.focusable or role in ["image", "img"]):
+            categories.add("unnamed")
+
+        # Visual issues found in computed styles and layout (low_contrast,
+        # small_target, no_focus_indicator)
+        categories.update(node.issues)
+
+    # Sorted, so rule-based rankings built from these are deterministic
     return {
-        "roles": list(roles),
-        "categories": list(categories),
+        "roles": sorted(roles),
+        "categories": sorted(categories),
     }
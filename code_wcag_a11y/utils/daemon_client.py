@@ -0,0 +1,175 @@
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from functools import cache
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.embeddings import get_query_encoder
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.rerankers import Reranker, load_reranker
+
+
+class DaemonConnection:
+    """Blocking client for the model daemon, one socket connection per call.
+
+    Unix socket connections are cheap, and separate connections let calls from
+    different threads reach the daemon concurrently and be batched together.
+    """
+
+    def __init__(self, socket_path: Path, timeout: float = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, op: str, **payload) -> Any:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(str(self.socket_path))
+            sock.sendall(json.dumps({"id": 0, "op": op, **payload}).encode() + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+
+        if not line:
+            raise ConnectionError("Model daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(f"Model daemon error: {response['error']}")
+        return response["result"]
+
+
+def spawn_daemon(socket_path: Path) -> None:
+    """Start the daemon in its own session, detached from our stdio."""
+    log_path = socket_path.with_suffix(".log")
+    with open(log_path, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "code_wcag_a11y.model_daemon"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    logger.info(f"Started model daemon, logging to {log_path}")
+
+
+def connect_daemon(
+    socket_path: Path, start_timeout: float
+) -> tuple[DaemonConnection, dict[str, Any]] | None:
+    """Connect to the daemon, starting it if it is not running.
+
+    Returns:
+        The connection and the daemon's info, or None if it did not come up
+        within start_timeout seconds.
+    """
+    connection = DaemonConnection(socket_path)
+    try:
+        return connection, connection.request("info")
+    except OSError:
+        spawn_daemon(socket_path)
+
+    deadline = time.monotonic() + start_timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.5)
+        try:
+            return connection, connection.request("info")
+        except OSError:
+            continue
+    return None
+
+
+# Errors meaning no daemon is listening any more; anything else (a timeout, a
+# dropped connection) may be a busy or restarting daemon and is retried
+DAEMON_GONE_ERRORS = (ConnectionRefusedError, FileNotFoundError)
+
+
+class _DaemonBacked:
+    """Forwards to the daemon, switching to an in-process model if it goes away.
+
+    A timed-out or dropped request is retried on a new connection `retries`
+    times and then raised; only a daemon that refuses connections makes this
+    process load its own model, once, for good.
+    """
+
+    retries = 1
+
+    def __init__(self, connection: DaemonConnection, load_fallback: Callable[[], Any]):
+        self._connection = connection
+        self._load_fallback = load_fallback
+        self._fallback = None
+        self._fallback_lock = threading.Lock()
+
+    def _call(self, op: str, fallback_call: Callable[[Any], Any], **payload) -> Any:
+        if self._fallback is None:
+            for attempt in range(self.retries + 1):
+                try:
+                    return self._connection.request(op, **payload)
+                except DAEMON_GONE_ERRORS as e:
+                    logger.warning(f"Model daemon gone ({e}), loading in-process")
+                    break
+                except OSError as e:
+                    if attempt == self.retries:
+                        raise
+                    logger.warning(f"Model daemon {op} failed ({e}), retrying")
+        return fallback_call(self._get_fallback())
+
+    def _get_fallback(self) -> Any:
+        with self._fallback_lock:
+            if self._fallback is None:
+                self._fallback = self._load_fallback()
+            return self._fallback
+
+
+class DaemonQueryEncoder(_DaemonBacked):
+    def __init__(self, connection: DaemonConnection, info: dict[str, Any]):
+        super().__init__(connection, get_query_encoder)
+        self.name = info["query_encoder"]
+
+    def encode(self, text: str) -> list[float]:
+        return self.encode_batch([text])[0]
+
+    def encode_batch(self, texts: Sequence[str]) -> list[list[float]]:
+        return self._call(
+            "embed", lambda encoder: encoder.encode_batch(texts), texts=list(texts)
+        )
+
+
+class DaemonReranker(_DaemonBacked):
+    def __init__(self, connection: DaemonConnection, info: dict[str, Any]):
+        super().__init__(connection, cache(load_reranker))
+        self.name = info["reranker"]
+
+    def compute_score(
+        self, pairs: Sequence[Sequence[str]], normalize: bool = True
+    ) -> list[float]:
+        if not pairs:
+            return []
+        return self._call(
+            "rerank",
+            lambda reranker: reranker.compute_score(pairs, normalize=normalize),
+            pairs=[list(pair) for pair in pairs],
+            normalize=normalize,
+        )
+
+
+def load_models() -> tuple[Any, Reranker]:
+    """Return the query encoder and reranker, from the daemon when enabled.
+
+    Falls back to loading both in-process when the daemon is disabled or
+    cannot be reached or started.
+    """
+    if settings.model_daemon:
+        connected = connect_daemon(
+            settings.model_daemon_socket, settings.model_daemon_start_timeout
+        )
+        if connected is not None:
+            connection, info = connected
+            logger.info(f"Using model daemon (pid {info['pid']})")
+            return DaemonQueryEncoder(connection, info), DaemonReranker(
+                connection, info
+            )
+        logger.warning("Model daemon did not start, loading models in-process")
+
+    return get_query_encoder(), load_reranker()
@@ -0,0 +1,66 @@
+import difflib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.utils.ax_tree import AXNode, AXSnapshot
+from code_wcag_a11y.utils.project import content_hash
+
+
+@dataclass(slots=True)
+class AnalysisState:
+    """What a delta re-analysis needs from the previous analysis of a component."""
+
+    code: str
+    wcag_version: WcagVersion
+    snapshot: AXSnapshot
+    result: dict[str, Any]
+
+
+def result_handle(code: str, wcag_version: WcagVersion) -> str:
+    """Handle of an analysis result; the same code and version share a handle."""
+    return content_hash(f"{wcag_version}\0{code}".encode("utf-8"))[:32]
+
+
+def changed_lines(old_code: str, new_code: str) -> list[str]:
+    """Lines of new_code that are not in old_code."""
+    diff = difflib.ndiff(old_code.splitlines(), new_code.splitlines())
+    return [line[2:] for line in diff if line.startswith("+ ")]
+
+
+def nodes_json(nodes: list[AXNode]) -> str:
+    """Serialize nodes in the snapshot JSON shape used by the rerank query."""
+    return AXSnapshot({node.node_id: node for node in nodes}).to_json()
+
+
+def describe_nodes(nodes: list[AXNode]) -> str:
+    """Plain-text rendering of nodes for embedding as a retrieval query."""
+    lines = []
+    for node in nodes:
+        states = ("focusable", "editable", "readonly", "required")
+        active = [state for state in states if getattr(node, state)]
+        parts = [node.role or "generic", json.dumps(node.name or "")]
+        if node.labels:
+            parts.append(f"labelled by {', '.join(node.labels)}")
+        parts.extend(active)
+        parts.extend(issue.replace("_", " ") for issue in node.issues)
+        lines.append(" ".join(parts))
+    return "\n".join(lines)
+
+
+def merge_ranked(
+    previous: list[dict[str, Any]], rescored: list[dict[str, Any]], limit: int
+) -> list[dict[str, Any]]:
+    """Merge newly scored chunks into a previous ranking, best first.
+
+    A chunk in both lists keeps the higher score. The result holds at most
+    `limit` chunks.
+    """
+    merged = {chunk["id"]: chunk for chunk in previous}
+    for chunk in rescored:
+        old = merged.get(chunk["id"])
+        if old is None or chunk["score"] > old["score"]:
+            merged[chunk["id"]] = chunk
+    ranked = sorted(merged.values(), key=lambda chunk: chunk["score"], reverse=True)
+    return ranked[:limit]
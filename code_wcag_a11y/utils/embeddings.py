@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from functools import cache
+from typing import Sequence
+
+from code_wcag_a11y.globals import EMBEDDING_MODEL
+from code_wcag_a11y.settings import settings
+
+
+def normalize_query(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry."""
+    return " ".join(text.split())
+
+
+class QueryEncoder:
+    """Query embedding model with an LRU cache of recent embeddings.
+
+    Uses the ONNX (optionally quantized) export of the embedding model by
+    default; the vectors stay compatible with the index built from the
+    PyTorch model.
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        backend: str = "onnx",
+        onnx_file: str | None = None,
+        cache_size: int = 4096,
+    ):
+        from sentence_transformers import SentenceTransformer
+
+        model_kwargs = None
+        self.name = f"{backend}:{model_name}"
+        if backend == "onnx" and onnx_file:
+            model_kwargs = {"file_name": onnx_file}
+            self.name += f":{onnx_file}"
+
+        self._model = SentenceTransformer(
+            model_name, device="cpu", backend=backend, model_kwargs=model_kwargs
+        )
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, text: str) -> list[float]:
+        return self.encode_batch([text])[0]
+
+    def encode_batch(self, texts: Sequence[str]) -> list[list[float]]:
+        """Embed queries, running all cache misses in a single forward pass."""
+        keys = [normalize_query(text) for text in texts]
+        embeddings: dict[str, list[float]] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    embeddings[key] = self._cache[key]
+            self.hits += sum(1 for key in keys if key in embeddings)
+
+        misses = [key for key in dict.fromkeys(keys) if key not in embeddings]
+        if misses:
+            vectors = self._model.encode(misses, batch_size=len(misses))
+            with self._lock:
+                self.misses += len(misses)
+                for key, vector in zip(misses, vectors):
+                    embeddings[key] = vector.tolist()
+                    self._cache[key] = embeddings[key]
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [embeddings[key] for key in keys]
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+@cache
+def get_query_encoder() -> QueryEncoder:
+    """Process-wide query encoder, loaded on first use."""
+    return QueryEncoder(
+        backend=settings.query_encoder_backend,
+        onnx_file=settings.query_encoder_onnx_file,
+        cache_size=settings.query_embedding_cache_size,
+    )
@@ -0,0 +1,152 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from code_wcag_a11y.globals import LATE_INTERACTION_DIR, LATE_INTERACTION_MODEL
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.utils.logger import logger
+
+
+EMBEDDINGS_FILE = "token_embeddings.npy"
+SCALES_FILE = "token_scales.npy"
+OFFSETS_FILE = "offsets.npy"
+CHUNKS_FILE = "chunks.json"
+
+# Chunks scored per matrix multiplication, bounds the float32 working set
+BLOCK_ROWS = 64
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ColbertTokenEncoder:
+    """Per-token embeddings from the ColBERT checkpoint used by `ColbertRerank`."""
+
+    def __init__(self, model_name: str = LATE_INTERACTION_MODEL, max_length: int = 512):
+        from transformers import AutoModel, AutoTokenizer
+
+        self._tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self._model = AutoModel.from_pretrained(model_name).eval()
+        self.max_length = max_length
+
+    def encode(self, texts: Sequence[str], batch_size: int = 16) -> list[np.ndarray]:
+        """Return one L2-normalized (tokens, dim) float32 matrix per text."""
+        import torch
+
+        matrices = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), batch_size):
+                encoded = self._tokenizer(
+                    list(texts[start : start + batch_size]),
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors="pt",
+                )
+                hidden = self._model(**encoded).last_hidden_state
+                hidden = torch.nn.functional.normalize(hidden, dim=-1)
+                lengths = encoded["attention_mask"].sum(dim=1).tolist()
+                for row, length in zip(hidden, lengths):
+                    matrices.append(row[:length].numpy().astype(np.float32))
+        return matrices
+
+
+def quantize_tokens(tokens: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric int8 quantization with one float16 scale per token."""
+    scales = np.abs(tokens).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(tokens / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float16)
+
+
+def maxsim_scores(
+    embeddings: np.ndarray,
+    scales: np.ndarray,
+    offsets: np.ndarray,
+    rows: np.ndarray,
+    query_tokens: np.ndarray,
+) -> np.ndarray:
+    """Vectorized ColBERT MaxSim: mean over query tokens of the best passage token."""
+    query_t = np.ascontiguousarray(query_tokens.T, dtype=np.float32)
+    scores = np.empty(len(rows), dtype=np.float32)
+
+    for start in range(0, len(rows), BLOCK_ROWS):
+        block = rows[start : start + BLOCK_ROWS]
+        starts, ends = offsets[block], offsets[block + 1]
+        token_idx = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+        tokens = embeddings[token_idx].astype(np.float32)
+        tokens *= scales[token_idx, None].astype(np.float32)
+
+        sims = tokens @ query_t
+        local_starts = np.concatenate(([0], np.cumsum(ends - starts)[:-1]))
+        scores[start : start + len(block)] = np.maximum.reduceat(
+            sims, local_starts, axis=0
+        ).mean(axis=1)
+
+    return scores
+
+
+class LateInteractionIndex:
+    """Precomputed, int8-compressed passage token embeddings for one WCAG version.
+
+    Arrays are memory-mapped, so opening the index is cheap and the pages are
+    shared between processes.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.embeddings = np.load(directory / EMBEDDINGS_FILE, mmap_mode="r")
+        self.scales = np.load(directory / SCALES_FILE, mmap_mode="r")
+        self.offsets = np.load(directory / OFFSETS_FILE, mmap_mode="r")
+        with open(directory / CHUNKS_FILE, "r", encoding="utf-8") as f:
+            chunks = json.load(f)
+        self.chunk_ids: list[str] = chunks["chunk_ids"]
+        self.text_keys: list[str] = chunks["text_keys"]
+        self.row_by_chunk_id = {cid: row for row, cid in enumerate(self.chunk_ids)}
+        self.row_by_text_key = {key: row for row, key in enumerate(self.text_keys)}
+
+    @staticmethod
+    def path_for(wcag_version: WcagVersion) -> Path:
+        return LATE_INTERACTION_DIR / f"wcag-{wcag_version}"
+
+    @classmethod
+    def build(
+        cls,
+        chunk_ids: list[str],
+        texts: list[str],
+        encoder: ColbertTokenEncoder,
+        directory: Path,
+    ) -> "LateInteractionIndex":
+        """Encode every passage once and write the compressed index to disk."""
+        matrices = encoder.encode(texts)
+        lengths = np.array([len(m) for m in matrices], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        embeddings, scales = quantize_tokens(np.concatenate(matrices))
+
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / EMBEDDINGS_FILE, embeddings)
+        np.save(directory / SCALES_FILE, scales)
+        np.save(directory / OFFSETS_FILE, offsets)
+        with open(directory / CHUNKS_FILE, "w", encoding="utf-8") as f:
+            json.dump(
+                {"chunk_ids": chunk_ids, "text_keys": [text_key(t) for t in texts]}, f
+            )
+
+        logger.info(
+            f"✅ Late-interaction index: {len(chunk_ids)} chunks, "
+            f"{len(embeddings)} tokens, {embeddings.nbytes / 1e6:.1f} MB"
+        )
+        return cls(directory)
+
+    def score(
+        self, query_tokens: np.ndarray, rows: Sequence[int] | None = None
+    ) -> np.ndarray:
+        """MaxSim scores for the given rows (all chunks by default)."""
+        rows = np.arange(len(self.chunk_ids)) if rows is None else np.asarray(rows)
+        return maxsim_scores(
+            self.embeddings, self.scales, self.offsets, rows, query_tokens
+        )
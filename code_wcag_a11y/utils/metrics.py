@@ -0,0 +1,290 @@
+import bisect
+import contextvars
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+TOKEN_BUCKETS = (256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, str] | None) -> Labels:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: dict[str, str] | None = None) -> str:
+    items = list(labels) + list((extra or {}).items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in items) + "}"
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size of this process (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token count estimate (words and punctuation), no tokenizer needed."""
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for upper, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return upper
+        return float("inf")
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms with Prometheus text output."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._collectors: list[Callable[[], dict[str, float]]] = []
+        self.help: dict[str, str] = {}
+
+    def inc(self, name: str, value: float = 1, labels: dict[str, str] | None = None):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: dict[str, str] | None = None,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def register_collector(self, collector: Callable[[], dict[str, float]]) -> None:
+        """Register a callback returning gauge values, read at export time."""
+        self._collectors.append(collector)
+
+    def _gauges(self) -> dict[str, float]:
+        gauges: dict[str, float] = {}
+        for collector in self._collectors:
+            gauges.update(collector())
+        return gauges
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: h.summary() for k, h in self._histograms.items()}
+
+        def name_of(key: tuple[str, Labels]) -> str:
+            name, labels = key
+            return name + _format_labels(labels)
+
+        return {
+            "counters": {name_of(k): v for k, v in counters.items()},
+            "histograms": {name_of(k): v for k, v in histograms.items()},
+            "gauges": self._gauges(),
+        }
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        typed: set[str] = set()
+
+        def header(name: str, kind: str) -> None:
+            if name in typed:
+                return
+            typed.add(name)
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (k, (h.buckets, list(h.counts), h.total, h.count))
+                for k, h in self._histograms.items()
+            )
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        for (name, labels), (buckets, counts, total, count) in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for upper, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(labels, {"le": f"{upper:g}"})
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            le = _format_labels(labels, {"le": "+Inf"})
+            lines.append(f"{name}_bucket{le} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for name, value in sorted(self._gauges().items()):
+            header(name, "gauge")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class SpanExporter:
+    """Appends finished spans to a JSON-lines file in OTLP/JSON span shape."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, span: dict[str, Any]) -> None:
+        line = json.dumps(span, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+_current_span: contextvars.ContextVar[tuple[str, str] | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+_stage_timings: contextvars.ContextVar[list[dict[str, Any]] | None] = (
+    contextvars.ContextVar("stage_timings", default=None)
+)
+
+metrics = MetricsRegistry()
+metrics.help.update(
+    {
+        "wcag_stage_duration_seconds": "Latency of each analysis pipeline stage",
+        "wcag_stage_errors_total": "Stage executions that raised",
+        "wcag_ax_nodes": "Accessibility nodes per rendered snippet",
+        "wcag_rerank_pairs": "Query/passage pairs per rerank call",
+        "wcag_rerank_input_tokens": "Estimated reranker input tokens per call",
+    }
+)
+span_exporter: SpanExporter | None = None
+
+
+def configure_tracing(path: Path | None) -> None:
+    """Enable span export to path, or disable it with None."""
+    global span_exporter
+    span_exporter = SpanExporter(path) if path else None
+
+
+@contextmanager
+def record_stage_timings() -> Iterator[list[dict[str, Any]]]:
+    """Collect the stages timed in this context (and its threads) into a list.
+
+    Each entry holds the stage name, its duration in seconds and its attributes,
+    in completion order.
+    """
+    timings: list[dict[str, Any]] = []
+    token = _stage_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _stage_timings.reset(token)
+
+
+@contextmanager
+def timed(stage: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+    """Time a pipeline stage into the latency histogram and, if enabled, a span.
+
+    Yields a dict the caller can add span attributes to.
+    """
+    parent = _current_span.get()
+    trace_id = parent[0] if parent else os.urandom(16).hex()
+    span_id = os.urandom(8).hex()
+    token = _current_span.set((trace_id, span_id))
+    start_ns = time.time_ns()
+    start = time.perf_counter()
+    status = "OK"
+    try:
+        yield attributes
+    except BaseException:
+        status = "ERROR"
+        metrics.inc("wcag_stage_errors_total", labels={"stage": stage})
+        raise
+    finally:
+        _current_span.reset(token)
+        duration = time.perf_counter() - start
+        metrics.observe(
+            "wcag_stage_duration_seconds", duration, labels={"stage": stage}
+        )
+        timings = _stage_timings.get()
+        if timings is not None:
+            timings.append({"stage": stage, "seconds": duration, **attributes})
+        if span_exporter is not None:
+            span_exporter.export(
+                {
+                    "traceId": trace_id,
+                    "spanId": span_id,
+                    "parentSpanId": parent[1] if parent else "",
+                    "name": stage,
+                    "startTimeUnixNano": start_ns,
+                    "endTimeUnixNano": time.time_ns(),
+                    "attributes": [
+                        {"key": k, "value": {"stringValue": str(v)}}
+                        for k, v in attributes.items()
+                    ],
+                    "status": {"code": status},
+                }
+            )
@@ -0,0 +1,65 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class StageExecutor:
+    """Dedicated thread pool for one blocking pipeline stage.
+
+    At most `workers + max_queued` calls are submitted at once; further callers
+    wait on the event loop until a slot frees up, so a slow stage applies
+    backpressure instead of growing an unbounded backlog. A slot is held until
+    the thread finishes, even if the awaiting request gave up on it.
+    """
+
+    def __init__(self, name: str, workers: int, max_queued: int):
+        self.name = name
+        self.workers = workers
+        self.in_flight = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(workers + max_queued)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"wcag-{name}"
+        )
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run func(*args) on this stage's threads, keeping the caller's context."""
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            future = self._executor.submit(contextvars.copy_context().run, func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(
+            lambda _: (
+                loop.call_soon_threadsafe(self._release)
+                if not loop.is_closed()
+                else None
+            )
+        )
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            f"wcag_{self.name}_workers": self.workers,
+            f"wcag_{self.name}_in_flight": self.in_flight,
+            f"wcag_{self.name}_waiting": self.waiting,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
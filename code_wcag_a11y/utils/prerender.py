@@ -0,0 +1,569 @@
+import re
+from typing import Literal
+
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.metrics import metrics
+from code_wcag_a11y.utils.project import content_hash
+from code_wcag_a11y.utils.result_cache import LRUCache
+
+
+Syntax = Literal["html", "jsx", "vue", "svelte"]
+
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+# JSX props whose HTML attribute is spelled differently; None drops the prop
+JSX_ATTRIBUTES: dict[str, str | None] = {
+    "className": "class",
+    "htmlFor": "for",
+    "tabIndex": "tabindex",
+    "readOnly": "readonly",
+    "autoComplete": "autocomplete",
+    "autoFocus": "autofocus",
+    "autoPlay": "autoplay",
+    "maxLength": "maxlength",
+    "minLength": "minlength",
+    "colSpan": "colspan",
+    "rowSpan": "rowspan",
+    "srcSet": "srcset",
+    "crossOrigin": "crossorigin",
+    "contentEditable": "contenteditable",
+    "spellCheck": "spellcheck",
+    "accessKey": "accesskey",
+    "inputMode": "inputmode",
+    "enterKeyHint": "enterkeyhint",
+    "encType": "enctype",
+    "noValidate": "novalidate",
+    "playsInline": "playsinline",
+    "defaultValue": "value",
+    "defaultChecked": "checked",
+    "dangerouslySetInnerHTML": None,
+    "key": None,
+    "ref": None,
+}
+
+# Framework components rendered as the element they most likely wrap, matched
+# on the lowercased last part of the tag name; other components become divs
+COMPONENT_ELEMENTS = {
+    "button": "button",
+    "iconbutton": "button",
+    "link": "a",
+    "navlink": "a",
+    "routerlink": "a",
+    "nuxtlink": "a",
+    "image": "img",
+    "img": "img",
+    "input": "input",
+    "textfield": "input",
+    "textinput": "input",
+    "textarea": "textarea",
+    "label": "label",
+    "select": "select",
+    "option": "option",
+    "form": "form",
+}
+# Wrappers that render only their children
+FRAGMENT_TAGS = frozenset(
+    {"", "fragment", "react.fragment", "template", "svelte:fragment"}
+)
+# Attributes whose value is a state; an unresolvable binding drops them rather
+# than turning the bound identifier into a truthy string (disabled="busy")
+BOOLEAN_ATTRIBUTES = frozenset(
+    {
+        "allowfullscreen",
+        "autofocus",
+        "autoplay",
+        "checked",
+        "controls",
+        "default",
+        "disabled",
+        "formnovalidate",
+        "hidden",
+        "inert",
+        "loop",
+        "multiple",
+        "muted",
+        "novalidate",
+        "open",
+        "playsinline",
+        "readonly",
+        "required",
+        "reversed",
+        "selected",
+    }
+)
+# ARIA attributes holding text, where a placeholder stands in for the bound
+# value; the other ARIA attributes are tokens or id references
+ARIA_TEXT_ATTRIBUTES = frozenset(
+    {
+        "aria-label",
+        "aria-description",
+        "aria-roledescription",
+        "aria-placeholder",
+        "aria-valuetext",
+        "aria-keyshortcuts",
+    }
+)
+# Unitless numeric CSS properties of JSX style objects; others get px
+UNITLESS_STYLES = frozenset(
+    {"opacity", "z-index", "font-weight", "line-height", "flex", "flex-grow", "order"}
+)
+
+_VUE_SFC_RE = re.compile(r"^\s*<template[\s>]")
+# Directives, or {{ }} interpolation (JSX style objects are preceded by "=")
+_VUE_RE = re.compile(r"\s(?:v-[\w-]+|[:@#][\w.:-]+)=|(?<!=)\{\{")
+_SVELTE_RE = re.compile(
+    r"\{[#:/@]\w|\s(?:on|bind|class|use|transition|in|out|animate):[\w-]+"
+)
+# Markers no HTML has; {expr} text alone is not one, HTML text may hold braces
+_JSX_RE = re.compile(r"\s(?:className|htmlFor)=|=\{|</?>|<[A-Z](?:[a-z]|\w*\.)")
+_BLOCK_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+_JSX_START_RE = re.compile(r"(?:\breturn|=>)\s*\(?\s*(?=<[A-Za-z>])")
+_TAG_START_RE = re.compile(r"<[A-Za-z>]")
+# Characters after which a `<` in an expression opens a JSX element
+_JSX_PRECEDERS = frozenset("({[,;:?&|=>!")
+_VUE_ELSE_RE = re.compile(r"\sv-else(?:-if)?(?=[\s=/>])")
+_NAME_RE = re.compile(r"[^\s=/>{]+")
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_$][\w$]*")
+_TERNARY_RE = re.compile(r"""[^?]+\?\s*("[^"]*"|'[^']*'|true|false|-?\d+)\s*:""")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_STYLE_ENTRY_RE = re.compile(
+    r"""([A-Za-z]\w*|["'][\w-]+["'])\s*:\s*("[^"]*"|'[^']*'|-?\d+(?:\.\d+)?)"""
+)
+# JSX onClick, Vue @click.prevent / v-on:click, Svelte on:click|preventDefault
+_EVENT_RE = re.compile(
+    r"on([A-Z]\w*)|@([\w-]+)(?:\.[\w.]+)?|v-on:([\w-]+)(?:\.[\w.]+)?"
+    r"|on:([\w-]+)(?:\|[\w|]+)?"
+)
+_JS_KEYWORDS = frozenset(
+    {"true", "false", "null", "undefined", "this", "props", "item", "map", "length"}
+)
+
+prerender_cache: LRUCache[str, str] = LRUCache(settings.prerender_cache_size)
+
+
+def detect_syntax(code: str) -> Syntax:
+    """Guess which template syntax a snippet is written in."""
+    markup = _BLOCK_RE.sub("", code)
+    if _VUE_SFC_RE.match(code):
+        return "vue"
+    if _SVELTE_RE.search(markup):
+        return "svelte"
+    if _VUE_RE.search(markup):
+        return "vue"
+    # Leading text alone is not JSX: "Read our <a>terms</a>." is HTML
+    if _JSX_RE.search(markup) or _JSX_START_RE.search(markup):
+        return "jsx"
+    return "html"
+
+
+def prerender_component(code: str) -> str:
+    """Turn a JSX, Vue or Svelte snippet into representative static HTML.
+
+    Bindings are resolved to their literal value when they have one and to a
+    placeholder named after the bound expression otherwise; conditionals and
+    loops render their first branch once; framework props are mapped to HTML
+    attributes (`htmlFor` to `for`, `onClick` and `@click` to `onclick`, ...).
+    Plain HTML is returned unchanged. Results are cached by content hash.
+    """
+    key = content_hash(code.encode("utf-8"))
+    html = prerender_cache.get(key)
+    if html is not None:
+        metrics.inc("wcag_prerender_cache_hits_total")
+        return html
+
+    metrics.inc("wcag_prerender_cache_misses_total")
+    syntax = detect_syntax(code)
+    html = code if syntax == "html" else _Prerenderer(syntax).render(code)
+    prerender_cache.set(key, html)
+    return html
+
+
+def find_closing(text: str, start: int) -> int:
+    """Index just past the brace matching the one at start.
+
+    The braces hold a JS expression: strings are skipped, and so are JSX
+    elements in expression position (`cond && <p>Don't</p>`), whose text
+    children may hold quotes that do not start strings.
+    """
+    depth = 0
+    i = start
+    while i < len(text):
+        char = text[i]
+        if char in "\"'`":
+            end = text.find(char, i + 1)
+            i = len(text) if end == -1 else end + 1
+            continue
+        if char == "<" and _starts_jsx_element(text, i, start):
+            i = element_end(text, i, jsx=True)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(text)
+
+
+def _starts_jsx_element(text: str, i: int, expression_start: int) -> bool:
+    """Whether the `<` at i opens an element rather than comparing (`i<n`)."""
+    if not _TAG_START_RE.match(text, i):
+        return False
+    before = text[expression_start + 1 : i].rstrip()
+    return not before or before[-1] in _JSX_PRECEDERS
+
+
+def scan_tag(text: str, start: int) -> tuple[int, str, bool, bool]:
+    """Scan the tag at start.
+
+    Returns:
+        The index past it, its name, whether it is a closing tag and
+        whether it is self-closing.
+    """
+    i = start + 1
+    closing = text.startswith("/", i)
+    if closing:
+        i += 1
+    match = _NAME_RE.match(text, i)
+    name = match.group() if match else ""
+    i = match.end() if match else i
+    while i < len(text) and text[i] != ">":
+        if text[i] == "{":
+            i = find_closing(text, i)
+        elif text[i] in "\"'":
+            end = text.find(text[i], i + 1)
+            i = len(text) if end == -1 else end + 1
+        else:
+            i += 1
+    self_closing = text[start:i].rstrip().endswith("/")
+    return min(i + 1, len(text)), name, closing, self_closing
+
+
+def element_end(text: str, start: int, jsx: bool) -> int:
+    """Index just past the element starting at start, or the end of text.
+
+    Text children are scanned as markup (quotes in them mean nothing); only
+    tags and `{...}` expressions are skipped as units.
+    """
+    depth = 0
+    i = start
+    while i < len(text):
+        if _TAG_START_RE.match(text, i) or text.startswith("</", i):
+            end, name, closing, self_closing = scan_tag(text, i)
+            if closing:
+                depth -= 1
+            # JSX closes every element, even <Link> and <Image></Image>
+            elif not self_closing and (jsx or name.lower() not in VOID_ELEMENTS):
+                depth += 1
+            i = end
+            if depth <= 0:
+                return end
+            continue
+        if text[i] == "{":
+            i = find_closing(text, i)
+            continue
+        i += 1
+    return len(text)
+
+
+def literal_value(expr: str) -> str | bool | None:
+    """Value of a literal expression: a string, True/False, or None if not literal."""
+    expr = expr.strip()
+    quote = expr[:1]
+    if len(expr) >= 2 and quote in "\"'`" and expr[-1] == quote:
+        if quote in expr[1:-1]:
+            return None
+        return re.sub(r"\$\{([^}]*)\}", lambda m: placeholder(m.group(1)), expr[1:-1])
+    if expr == "true":
+        return True
+    if expr in ("false", "null", "undefined"):
+        return False
+    if _NUMBER_RE.fullmatch(expr):
+        return expr
+    # cond ? "a" : "b" renders its first branch, like conditional elements
+    if ternary := _TERNARY_RE.match(expr):
+        return literal_value(ternary.group(1))
+    return None
+
+
+def placeholder(expr: str) -> str:
+    """Readable stand-in for a non-literal expression: `user.firstName` -> "first name"."""
+    names = [n for n in _IDENTIFIER_RE.findall(expr) if n not in _JS_KEYWORDS]
+    if not names:
+        return "value"
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", names[-1].strip("$_")).lower()
+
+
+def style_object(expr: str) -> str:
+    """CSS declarations of a literal JSX style object (`{{ color: "red" }}`)."""
+    declarations = []
+    for name, value in _STYLE_ENTRY_RE.findall(expr):
+        prop = re.sub(r"(?<=[a-z])(?=[A-Z])", "-", name.strip("\"'")).lower()
+        if value[0] in "\"'":
+            value = value[1:-1]
+        elif prop not in UNITLESS_STYLES and value != "0":
+            value = f"{value}px"
+        declarations.append(f"{prop}: {value}")
+    return "; ".join(declarations)
+
+
+def _escape(value: str) -> str:
+    return value.replace("&", "&amp;").replace('"', "&quot;")
+
+
+class _Prerenderer:
+    """Single-pass rewriter of one snippet's markup."""
+
+    def __init__(self, syntax: Syntax):
+        self.syntax = syntax
+
+    def render(self, code: str) -> str:
+        return self.markup(self.extract_markup(code))
+
+    def extract_markup(self, code: str) -> str:
+        """The template part of a component file."""
+        if self.syntax == "vue" and _VUE_SFC_RE.match(code):
+            start = code.index(">", code.index("<template")) + 1
+            end = code.rfind("</template")
+            return code[start : end if end > start else len(code)]
+        if self.syntax == "jsx" and not code.lstrip().startswith("<"):
+            match = _JSX_START_RE.search(code) or _TAG_START_RE.search(code)
+            if match is None:
+                return code
+            start = match.end() if match.re is _JSX_START_RE else match.start()
+            return code[start : self.element_end(code, start)]
+        return _BLOCK_RE.sub("", code) if self.syntax == "svelte" else code
+
+    def element_end(self, text: str, start: int) -> int:
+        return element_end(text, start, jsx=self.syntax == "jsx")
+
+    def markup(self, text: str) -> str:
+        out = []
+        i = 0
+        while i < len(text):
+            char = text[i]
+            if _TAG_START_RE.match(text, i) or text.startswith("</", i):
+                end = scan_tag(text, i)[0]
+                if self.syntax == "vue" and _VUE_ELSE_RE.search(text[i:end]):
+                    # Only the v-if branch renders
+                    i = self.element_end(text, i)
+                    continue
+                out.append(self.tag(text[i:end]))
+                i = end
+            elif char == "{" and self.syntax == "vue" and text.startswith("{{", i):
+                end = text.find("}}", i)
+                end = len(text) if end == -1 else end + 2
+                out.append(self.text_expression(text[i + 2 : end - 2]))
+                i = end
+            elif char == "{" and self.syntax != "vue":
+                end = find_closing(text, i)
+                if self.syntax == "svelte" and text[i + 1 : end].startswith(":else"):
+                    # Only the {#if} branch (or the {#each} body) renders
+                    end = self.block_end(text, end)
+                out.append(self.text_expression(text[i + 1 : end - 1]))
+                i = end
+            else:
+                out.append(char)
+                i += 1
+        return "".join(out)
+
+    def block_end(self, text: str, start: int) -> int:
+        """Index of the `{/...}` closing the Svelte block open at start."""
+        depth = 0
+        i = start
+        while (i := text.find("{", i)) != -1:
+            if text.startswith("{#", i):
+                depth += 1
+            elif text.startswith("{/", i):
+                if depth == 0:
+                    return i
+                depth -= 1
+            i = find_closing(text, i)
+        return len(text)
+
+    def text_expression(self, expr: str) -> str:
+        stripped = expr.strip()
+        # Comments and Svelte block tags ({#if}, {:else}, {/each}, {@html})
+        if not stripped or stripped.startswith(("/*", "//", "#", ":", "/", "@")):
+            return ""
+        # Conditionals and loops render their first element once
+        if match := _TAG_START_RE.search(stripped):
+            start = match.start()
+            return self.markup(stripped[start : self.element_end(stripped, start)])
+        value = literal_value(stripped)
+        if isinstance(value, bool):
+            return ""
+        return _escape(value if value is not None else placeholder(stripped))
+
+    def interpolate(self, value: str) -> str:
+        """Resolve Svelte expressions inside a quoted attribute value."""
+        out = []
+        i = 0
+        while (start := value.find("{", i)) != -1:
+            end = find_closing(value, start)
+            expr = value[start + 1 : end - 1]
+            resolved = literal_value(expr)
+            if isinstance(resolved, bool):
+                resolved = str(resolved).lower()
+            out.append(value[i:start])
+            out.append(resolved if resolved is not None else placeholder(expr))
+            i = end
+        out.append(value[i:])
+        return "".join(out)
+
+    def tag(self, source: str) -> str:
+        closing = source.startswith("</")
+        i = 2 if closing else 1
+        match = _NAME_RE.match(source, i)
+        name = match.group() if match else ""
+        element = self.element_name(name)
+        if element is None:
+            return ""
+        if closing:
+            return "" if element in VOID_ELEMENTS else f"</{element}>"
+
+        attributes = []
+        body = source[match.end() if match else i : -1].rstrip()
+        self_closing = body.endswith("/")
+        body = body[:-1] if self_closing else body
+        for attr_name, value in self.attributes(body):
+            attribute = self.attribute(element, name, attr_name, value)
+            if attribute:
+                attributes.append(attribute)
+
+        opening = f"<{element}{''.join(' ' + a for a in attributes)}>"
+        if self_closing and element not in VOID_ELEMENTS:
+            return f"{opening}</{element}>"
+        return opening
+
+    def element_name(self, name: str) -> str | None:
+        """HTML element for a tag name, or None for a fragment."""
+        lowered = name.lower()
+        if lowered in FRAGMENT_TAGS or lowered.startswith("svelte:"):
+            return None
+        if name[:1].isupper() or "." in name:
+            return COMPONENT_ELEMENTS.get(lowered.rsplit(".", 1)[-1], "div")
+        # Kebab-case components (router-link) stay custom elements unless known
+        return (
+            COMPONENT_ELEMENTS.get(lowered.replace("-", ""), name)
+            if "-" in name
+            else name
+        )
+
+    def attributes(self, body: str) -> list[tuple[str, str | None]]:
+        """(name, raw value) pairs; values keep their quotes or braces."""
+        pairs = []
+        i = 0
+        while i < len(body):
+            if body[i].isspace():
+                i += 1
+                continue
+            if body[i] == "{":
+                end = find_closing(body, i)
+                pairs.append(("{}", body[i:end]))
+                i = end
+                continue
+            match = _NAME_RE.match(body, i)
+            if match is None:
+                i += 1
+                continue
+            attr_name, i = match.group(), match.end()
+            if not body.startswith("=", i):
+                pairs.append((attr_name, None))
+                continue
+            i += 1
+            if i < len(body) and body[i] in "\"'":
+                end = body.find(body[i], i + 1)
+                end = len(body) if end == -1 else end + 1
+            elif i < len(body) and body[i] == "{":
+                end = find_closing(body, i)
+            else:
+                end = i
+                while end < len(body) and not body[end].isspace():
+                    end += 1
+            pairs.append((attr_name, body[i:end]))
+            i = end
+        return pairs
+
+    def attribute(
+        self, element: str, tag_name: str, name: str, raw: str | None
+    ) -> str | None:
+        """Rewrite one attribute to HTML, or None to drop it."""
+        # Svelte shorthand ({alt}) and spreads ({...props})
+        if name == "{}":
+            inner = raw[1:-1].strip()
+            if (
+                inner.startswith("...")
+                or not _IDENTIFIER_RE.fullmatch(inner)
+                or not self.keeps_unresolved(inner)
+            ):
+                return None
+            return f'{inner}="{_escape(placeholder(inner))}"'
+
+        # Event handlers keep the element's clickable semantics, nothing more
+        if event := _EVENT_RE.fullmatch(name):
+            return f'on{next(g for g in event.groups() if g).lower()}=""'
+
+        if self.syntax == "vue":
+            if name.startswith(("v-", "#")) and not name.startswith("v-bind:"):
+                return None
+            if name.startswith((":", "v-bind:")):
+                name = name.split(":", 1)[1].split(".")[0]
+                raw = "{" + raw[1:-1] + "}" if raw else None
+        if self.syntax == "svelte" and ":" in name:
+            return None
+
+        if name in JSX_ATTRIBUTES:
+            name = JSX_ATTRIBUTES[name]
+            if name is None:
+                return None
+        if name == "to" and element == "a" and tag_name != element:
+            name = "href"
+
+        if raw is None:
+            return name
+        if raw.startswith("{"):
+            expr = raw[1:-1].strip()
+            if name == "style" and expr.startswith("{"):
+                css = style_object(expr)
+                return f'style="{_escape(css)}"' if css else None
+            value = literal_value(expr)
+            if value is None:
+                if not self.keeps_unresolved(name):
+                    return None
+                value = placeholder(expr)
+        else:
+            value = raw[1:-1] if raw[:1] in "\"'" else raw
+            if self.syntax == "svelte":
+                value = self.interpolate(value)
+            return f'{name}="{_escape(value)}"'
+
+        if value is True:
+            return f'{name}="true"' if name.startswith(("aria-", "data-")) else name
+        if value is False:
+            return f'{name}="false"' if name.startswith("aria-") else None
+        return f'{name}="{_escape(value)}"'
+
+    @staticmethod
+    def keeps_unresolved(name: str) -> bool:
+        """Whether a placeholder can stand in for the attribute's bound value."""
+        if name in BOOLEAN_ATTRIBUTES:
+            return False
+        return not name.startswith("aria-") or name in ARIA_TEXT_ATTRIBUTES
@@ -0,0 +1,46 @@
+import json
+from collections import Counter
+from typing import Any
+
+from mcp.server.fastmcp import Context
+
+from code_wcag_a11y.utils.ax_tree import AXSnapshot
+from code_wcag_a11y.utils.logger import logger
+
+
+ANALYSIS_STAGES = ("accessibility_snapshot", "vector_ranked", "reranked")
+
+
+def summarize_snapshot(snapshot: AXSnapshot) -> dict[str, Any]:
+    """Short description of an accessibility snapshot for early feedback."""
+    return {
+        "nodes": len(snapshot),
+        "roles": dict(Counter(node.role for node in snapshot if node.role)),
+        "focusable": sum(1 for node in snapshot if node.focusable),
+        "unnamed_focusable": sum(
+            1 for node in snapshot if node.focusable and not node.name
+        ),
+        "visual_issues": dict(Counter(i for node in snapshot for i in node.issues)),
+    }
+
+
+async def report_stage(
+    ctx: Context | None, stage: str, partial: dict[str, Any]
+) -> None:
+    """Send a progress notification carrying the partial result of a stage.
+
+    The message is the JSON object `{"stage": ..., "partial": ...}`. Nothing is
+    sent when the tool was called without a context (e.g. from the CLI) or the
+    client did not ask for progress.
+    """
+    if ctx is None:
+        return
+
+    message = json.dumps({"stage": stage, "partial": partial}, ensure_ascii=False)
+    try:
+        await ctx.report_progress(
+            ANALYSIS_STAGES.index(stage) + 1, len(ANALYSIS_STAGES), message
+        )
+    except Exception as e:
+        # Progress is best effort; it must never fail the analysis itself
+        logger.warning(f"Could not report progress for stage {stage}: {e}")
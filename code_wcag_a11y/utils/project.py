@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, TextIO
+
+from code_wcag_a11y.globals import FAST_PROJECT_CACHE_DIR, PROJECT_CACHE_DIR
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.utils.logger import logger
+
+
+COMPONENT_EXTENSIONS = {".html", ".htm", ".jsx", ".tsx", ".vue", ".svelte"}
+IGNORED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    "node_modules",
+    "dist",
+    "build",
+    "coverage",
+    "__pycache__",
+}
+
+# Result fields only meaningful to the process that produced them
+PROCESS_LOCAL_FIELDS = ("handle",)
+
+Analyzer = Callable[[str, WcagVersion], Awaitable[dict]]
+
+
+def find_component_files(root: Path) -> Iterator[Path]:
+    """Yield component files below root, skipping vendored and build directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames if d not in IGNORED_DIRS and not d.startswith(".")
+        )
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if path.suffix.lower() in COMPONENT_EXTENSIONS:
+                yield path
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ProjectResultCache:
+    """Per-file analysis results on disk, keyed by content hash and WCAG version.
+
+    Each entry records the generation (index build, model versions and ranking
+    settings) it was produced under; entries of another generation are misses
+    and get overwritten.
+    """
+
+    def __init__(self, cache_dir: Path = PROJECT_CACHE_DIR, generation: str = ""):
+        self.cache_dir = cache_dir
+        self.generation = generation
+
+    def _path(self, digest: str, wcag_version: WcagVersion) -> Path:
+        return self.cache_dir / wcag_version / digest[:2] / f"{digest}.json"
+
+    def get(self, digest: str, wcag_version: WcagVersion) -> dict | None:
+        try:
+            with open(self._path(digest, wcag_version), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            logger.warning(f"⚠️ Corrupt cache entry for {digest}, re-analyzing")
+            return None
+        if not isinstance(entry, dict) or entry.get("generation") != self.generation:
+            return None
+        return entry.get("result")
+
+    def set(self, digest: str, wcag_version: WcagVersion, result: dict) -> None:
+        path = self._path(digest, wcag_version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        result = {k: v for k, v in result.items() if k not in PROCESS_LOCAL_FIELDS}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"generation": self.generation, "result": result}, f, ensure_ascii=False
+            )
+        os.replace(tmp_path, path)
+
+
+def project_cache(mode: str, generation: str = "") -> ProjectResultCache:
+    """Result cache for an analysis mode; fast results must not answer full runs."""
+    return ProjectResultCache(
+        FAST_PROJECT_CACHE_DIR if mode == "fast" else PROJECT_CACHE_DIR, generation
+    )
+
+
+async def analyze_project(
+    root: Path,
+    analyze: Analyzer,
+    wcag_version: WcagVersion = "2.2",
+    workers: int = 4,
+    cache: ProjectResultCache | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Analyze every component file below root on a pool of async workers.
+
+    Files whose content hash is already cached are answered from the cache;
+    the rest are analyzed with `analyze`. Only results with nothing `degraded`
+    are cached, so a timed-out stage is retried on the next run. Records are
+    yielded as soon as each file finishes, so callers can stream them out.
+
+    Args:
+        root: Project directory to walk.
+        analyze: Coroutine analyzing one code snippet (e.g. `analyzeWCAG`).
+        wcag_version: WCAG version to analyze against.
+        workers: Number of files analyzed concurrently.
+        cache: Result cache; defaults to the project cache directory.
+
+    Yields:
+        One record per file with its relative path, content hash, whether it
+        came from the cache, and either the analysis result or an error.
+    """
+    cache = cache or ProjectResultCache()
+    root = root.resolve()
+    pending: asyncio.Queue[Path | None] = asyncio.Queue(maxsize=workers * 4)
+    done: asyncio.Queue[dict | None] = asyncio.Queue()
+
+    async def produce() -> None:
+        for path in find_component_files(root):
+            await pending.put(path)
+        for _ in range(workers):
+            await pending.put(None)
+
+    async def work() -> None:
+        while (path := await pending.get()) is not None:
+            await done.put(await analyze_one(path))
+        await done.put(None)
+
+    async def analyze_one(path: Path) -> dict[str, Any]:
+        record: dict[str, Any] = {"path": path.relative_to(root).as_posix()}
+        try:
+            data = path.read_bytes()
+        except OSError as e:
+            return {**record, "error": str(e)}
+
+        digest = content_hash(data)
+        record["sha256"] = digest
+        cached = cache.get(digest, wcag_version)
+        if cached is not None:
+            return {**record, "cached": True, "result": cached}
+
+        try:
+            result = await analyze(data.decode("utf-8", errors="replace"), wcag_version)
+        except Exception as e:
+            logger.error(f"❌ Failed to analyze {record['path']}: {e}")
+            return {**record, "cached": False, "error": str(e)}
+
+        if not result.get("degraded"):
+            cache.set(digest, wcag_version, result)
+        return {**record, "cached": False, "result": result}
+
+    tasks = [asyncio.create_task(produce())]
+    tasks.extend(asyncio.create_task(work()) for _ in range(workers))
+    try:
+        finished_workers = 0
+        while finished_workers < workers:
+            record = await done.get()
+            if record is None:
+                finished_workers += 1
+                continue
+            yield record
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def write_jsonl_record(record: dict[str, Any], out: TextIO) -> None:
+    out.write(json.dumps(record, ensure_ascii=False))
+    out.write("\n")
+    out.flush()
+
+
+class SarifWriter:
+    """Stream analysis records as a SARIF 2.1.0 log, one result per ranked SC."""
+
+    def __init__(self, out: TextIO, wcag_version: WcagVersion, top_n: int = 5):
+        self.out = out
+        self.wcag_version = wcag_version
+        self.top_n = top_n
+        self._first = True
+
+    def __enter__(self) -> "SarifWriter":
+        tool = {
+            "driver": {
+                "name": "code-wcag-a11y",
+                "informationUri": "https://www.w3.org/WAI/standards-guidelines/wcag/",
+            }
+        }
+        self.out.write(
+            '{"$schema":"https://json.schemastore.org/sarif-2.1.0.json",'
+            '"version":"2.1.0",'
+            f'"runs":[{{"tool":{json.dumps(tool)},"results":['
+        )
+        return self
+
+    def write(self, record: dict[str, Any]) -> None:
+        for result in self._results(record):
+            if not self._first:
+                self.out.write(",")
+            self.out.write(json.dumps(result, ensure_ascii=False))
+            self._first = False
+        self.out.flush()
+
+    def _results(self, record: dict[str, Any]) -> Iterable[dict[str, Any]]:
+        location = {"physicalLocation": {"artifactLocation": {"uri": record["path"]}}}
+        if "error" in record:
+            yield {
+                "ruleId": "analysis-error",
+                "level": "warning",
+                "message": {"text": record["error"]},
+                "locations": [location],
+            }
+            return
+
+        for chunk in record["result"].get("ranked_chunks", [])[: self.top_n]:
+            # Every result needs a rule; chunks can lack an id or a title
+            title = chunk.get("title") or chunk.get("id") or "Unknown criterion"
+            yield {
+                "ruleId": chunk.get("id") or title,
+                "level": "note",
+                "message": {
+                    "text": f"WCAG {self.wcag_version} {title} is relevant to this "
+                    f"component (score {chunk['score']:.3f})."
+                },
+                "locations": [location],
+            }
+
+    def __exit__(self, *exc_info) -> None:
+        self.out.write("]}]}\n")
+        self.out.flush()
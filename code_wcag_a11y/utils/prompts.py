@@ -0,0 +1,67 @@
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+
+
+RERANK_QUERY_TEMPLATE = """
+You are an accessibility expert specializing in WCAG {wcag_version}.
+
+Your task is to IDENTIFY which WCAG Success Criteria are RELEVANT to the given code snippet,
+based on the types of elements present and their computed accessibility properties.
+
+IMPORTANT:
+- Do NOT determine whether the code PASSES or FAILS any Success Criteria.
+- Do NOT suggest fixes.
+- ONLY identify which WCAG Success Criteria apply and SHOULD be considered during development or testing.
+
+---
+
+INPUT 1: HTML CODE SNIPPET
+{code}
+
+---
+
+INPUT 2: COMPUTED ACCESSIBILITY SNAPSHOT
+
+Each item represents one accessible element with its computed properties
+(as exposed by the browser accessibility tree).
+
+Schema:
+- role: semantic role (e.g. textbox, button, link)
+- name: accessible name (string or empty)
+- focusable: whether the element can receive focus
+- editable: whether user input is allowed
+- readonly: whether the element is read-only
+- required: whether input is required
+- labels: associated label text(s), if any
+- visual (text and focusable elements): computed text color, background
+  color, contrast ratio, font size, bold, rendered size in CSS px, and issues
+  (low_contrast, small_target, no_focus_indicator)
+
+Data:
+{snapshot_json}
+
+---
+
+INSTRUCTIONS FOR ANALYSIS:
+
+1. List the WCAG Success Criteria that are relevant to this code.
+2. Find also techniques that may apply.
+
+---
+
+OUTPUT FORMAT:
+
+Return a list of WCAG Success Criteria and techniques relevant to the provided code snippet,
+ why this SC is relevant to this code.
+
+Do NOT include:
+- pass/fail judgments
+- remediation advice
+- speculative criteria not supported by the inputs
+"""
+
+
+def build_rerank_query(code: str, snapshot_json: str, wcag_version: WcagVersion) -> str:
+    """Build the reranker query for a snippet and its accessibility snapshot."""
+    return RERANK_QUERY_TEMPLATE.format(
+        code=code, snapshot_json=snapshot_json, wcag_version=wcag_version
+    )
@@ -0,0 +1,228 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from code_wcag_a11y.utils.ax_tree import AXNode, AXSnapshot
+from code_wcag_a11y.utils.delta import describe_nodes
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.metrics import estimate_tokens
+
+
+# Roles whose subtree is analyzed as a region of its own
+REGION_ROLES = frozenset(
+    {
+        "banner",
+        "navigation",
+        "main",
+        "contentinfo",
+        "complementary",
+        "region",
+        "search",
+        "form",
+        "dialog",
+        "alertdialog",
+        "table",
+        "grid",
+        "treegrid",
+    }
+)
+# Nodes outside every region (page headings, stray controls, ...)
+DOCUMENT_REGION = "document"
+
+
+@dataclass(slots=True)
+class Region:
+    """A landmark or component subtree of the accessibility tree."""
+
+    region_id: str
+    role: str
+    name: str | None
+    root_id: str | None  # None for the nodes outside every region
+    nodes: list[AXNode]
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "id": self.region_id,
+            "role": self.role,
+            "name": self.name,
+            "nodes": len(self.nodes),
+        }
+
+
+def is_large_input(
+    code: str, snapshot: AXSnapshot, min_nodes: int, min_tokens: int
+) -> bool:
+    """Whether the input is big enough to be analyzed region by region."""
+    return len(snapshot) >= min_nodes or estimate_tokens(code) >= min_tokens
+
+
+def segment_snapshot(
+    snapshot: AXSnapshot, min_nodes: int, max_regions: int
+) -> list[Region]:
+    """Split an accessibility tree into landmark and component regions.
+
+    Every node belongs to its nearest ancestor-or-self with a role in
+    REGION_ROLES, or to the document region if it has none. Regions with fewer
+    than min_nodes nodes are folded into their enclosing region, smallest first,
+    and so are the smallest ones while there are more than max_regions. The
+    document region is dropped when it ends up smaller than min_nodes.
+
+    Returns:
+        Regions in document order, the document region first.
+    """
+    owners: dict[str, str | None] = {}
+    for node in snapshot:
+        path = []
+        current: AXNode | None = node
+        while (
+            current is not None
+            and current.node_id not in owners
+            and current.role not in REGION_ROLES
+        ):
+            path.append(current.node_id)
+            current = snapshot.parent(current.node_id)
+
+        if current is None:
+            owner = None
+        elif current.node_id in owners:
+            owner = owners[current.node_id]
+        else:
+            owner = owners[current.node_id] = current.node_id
+        for node_id in path:
+            owners[node_id] = owner
+
+    members: dict[str | None, list[AXNode]] = {None: []}
+    for node in snapshot:
+        members.setdefault(owners[node.node_id], []).append(node)
+    enclosing = {
+        root_id: owners.get(snapshot.nodes[root_id].parent_id)
+        for root_id in members
+        if root_id is not None
+    }
+
+    def fold(root_id: str) -> None:
+        target = enclosing.pop(root_id)
+        members[target].extend(members.pop(root_id))
+        for child, parent in enclosing.items():
+            if parent == root_id:
+                enclosing[child] = target
+
+    def by_size(root_id: str) -> int:
+        return len(members[root_id])
+
+    while small := [r for r in enclosing if len(members[r]) < min_nodes]:
+        fold(min(small, key=by_size))
+    while enclosing and len(enclosing) + bool(members[None]) > max_regions:
+        fold(min(enclosing, key=by_size))
+
+    position = {node_id: n for n, node_id in enumerate(snapshot.nodes)}
+    regions = []
+    if len(members[None]) >= min_nodes:
+        document = sorted(members[None], key=lambda node: position[node.node_id])
+        regions.append(Region(DOCUMENT_REGION, DOCUMENT_REGION, None, None, document))
+
+    role_counts: Counter[str] = Counter()
+    for root_id in sorted(enclosing, key=position.__getitem__):
+        root = snapshot.nodes[root_id]
+        role_counts[root.role] += 1
+        nodes = sorted(members[root_id], key=lambda node: position[node.node_id])
+        regions.append(
+            Region(
+                f"{root.role}-{role_counts[root.role]}",
+                root.role,
+                root.name,
+                root_id,
+                nodes,
+            )
+        )
+    return regions
+
+
+def nested_regions(snapshot: AXSnapshot, regions: list[Region]) -> dict[str, str]:
+    """Root id of each region nested in another region, to its enclosing root id."""
+    roots = {region.root_id for region in regions if region.root_id is not None}
+    enclosing = {}
+    for root_id in roots:
+        parent = snapshot.parent(root_id)
+        while parent is not None and parent.node_id not in roots:
+            parent = snapshot.parent(parent.node_id)
+        if parent is not None:
+            enclosing[root_id] = parent.node_id
+    return enclosing
+
+
+async def fetch_region_sources(
+    cdp: Any, ax_tree: dict[str, Any], snapshot: AXSnapshot, regions: list[Region]
+) -> dict[str, str]:
+    """Rendered markup of each region's root element, keyed by AX node id.
+
+    The markup of a region nested in another (a form inside main) is cut out
+    of the enclosing region's markup, so it is only analyzed once.
+
+    Args:
+        cdp: CDP session of the page the tree was taken from.
+        ax_tree: The `Accessibility.getFullAXTree` response.
+        snapshot: The normalized tree.
+        regions: Regions of snapshot.
+    """
+    dom_ids = {
+        node["nodeId"]: node.get("backendDOMNodeId") for node in ax_tree["nodes"]
+    }
+    sources = {}
+    for region in regions:
+        backend_id = dom_ids.get(region.root_id)
+        if backend_id is None:
+            continue
+        try:
+            response = await cdp.send("DOM.getOuterHTML", {"backendNodeId": backend_id})
+        except Exception as e:
+            logger.debug(f"No markup for region {region.region_id}: {e}")
+            continue
+        sources[region.root_id] = response["outerHTML"]
+
+    # Cut the uncut markup, which is what the enclosing markup contains
+    captured = dict(sources)
+    for root_id, outer_id in nested_regions(snapshot, regions).items():
+        if root_id in captured and outer_id in sources:
+            sources[outer_id] = sources[outer_id].replace(captured[root_id], "", 1)
+    return sources
+
+
+def region_code(snapshot: AXSnapshot, region: Region) -> str:
+    """Code standing in for the region in its queries.
+
+    The region's rendered markup if it was captured, else a plain-text
+    rendering of its nodes (always the case for the document region).
+    """
+    source = snapshot.sources.get(region.root_id) if region.root_id else None
+    return source or describe_nodes(region.nodes)
+
+
+def merge_region_rankings(
+    rankings: list[tuple[Region, list[dict[str, Any]]]], limit: int
+) -> list[dict[str, Any]]:
+    """Merge the rankings of several regions into one, best first.
+
+    A chunk ranked for several regions keeps its best score and lists every
+    region it was ranked for in `regions`, best first. The result holds at most
+    `limit` chunks.
+    """
+    merged: dict[str, dict[str, Any]] = {}
+    hits: dict[str, list[tuple[float, str]]] = {}
+    for region, ranked in rankings:
+        for chunk in ranked:
+            best = merged.get(chunk["id"])
+            if best is None or chunk["score"] > best["score"]:
+                merged[chunk["id"]] = chunk
+            hits.setdefault(chunk["id"], []).append((chunk["score"], region.region_id))
+
+    ranked = sorted(merged.values(), key=lambda chunk: chunk["score"], reverse=True)
+    return [
+        {
+            **chunk,
+            "regions": [
+                region_id for _, region_id in sorted(hits[chunk["id"]], reverse=True)
+            ],
+        }
+        for chunk in ranked[:limit]
+    ]
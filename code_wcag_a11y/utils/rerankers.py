@@ -0,0 +1,343 @@
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Protocol, Sequence
+
+import numpy as np
+
+from code_wcag_a11y.globals import (
+    LATE_INTERACTION_DIR,
+    LATE_INTERACTION_MODEL,
+    RERANKER_MODEL,
+)
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.logger import logger
+
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+class Reranker(Protocol):
+    """Cross-encoder scoring (query, passage) pairs."""
+
+    name: str
+
+    def compute_score(
+        self, pairs: Sequence[Sequence[str]], normalize: bool = True
+    ) -> list[float]: ...
+
+
+class FlagRerankerBackend:
+    """PyTorch reranker through FlagEmbedding."""
+
+    def __init__(self, model_name: str = RERANKER_MODEL, use_fp16: bool = True):
+        from FlagEmbedding import FlagReranker
+
+        # FP16 only pays off on GPU; on CPU it falls back to full precision
+        self._model = FlagReranker(model_name, use_fp16=use_fp16)
+        self.name = f"flag:{model_name}"
+
+    def compute_score(
+        self, pairs: Sequence[Sequence[str]], normalize: bool = True
+    ) -> list[float]:
+        if not pairs:
+            return []
+        scores = self._model.compute_score(list(pairs), normalize=normalize)
+        # FlagReranker returns a bare float for a single pair
+        return scores if isinstance(scores, list) else [scores]
+
+
+class OnnxRerankerBackend:
+    """CPU reranker on ONNX Runtime, optionally int8-quantized.
+
+    Pairs are sorted by token length and scored in batches of similar length,
+    so short pairs are not padded up to the longest one in the request.
+    """
+
+    def __init__(
+        self,
+        model_dir: Path,
+        quantized: bool = True,
+        intra_op_threads: int = 0,
+        batch_size: int = 8,
+        max_length: int = 512,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_file = model_dir / (
+            ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        )
+        if not model_file.exists():
+            raise FileNotFoundError(
+                f"ONNX reranker not found at {model_file}. "
+                "Run `python -m code_wcag_a11y.scripts.export_reranker_onnx` first."
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self._session = ort.InferenceSession(
+            str(model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.name = f"onnx{'-int8' if quantized else ''}:{RERANKER_MODEL}"
+        logger.info(f"Loaded ONNX reranker from {model_file}")
+
+    def compute_score(
+        self, pairs: Sequence[Sequence[str]], normalize: bool = True
+    ) -> list[float]:
+        if not pairs:
+            return []
+
+        encoded = self._tokenizer(
+            [q for q, _ in pairs],
+            [p for _, p in pairs],
+            truncation=True,
+            max_length=self.max_length,
+        )
+        input_ids = encoded["input_ids"]
+        order = sorted(range(len(pairs)), key=lambda i: len(input_ids[i]))
+        scores = np.empty(len(pairs), dtype=np.float32)
+
+        for start in range(0, len(order), self.batch_size):
+            bucket = order[start : start + self.batch_size]
+            batch = self._tokenizer.pad(
+                {key: [encoded[key][i] for i in bucket] for key in encoded.keys()},
+                return_tensors="np",
+            )
+            feeds = {
+                name: batch[name].astype(np.int64)
+                for name in batch.keys()
+                if name in self._input_names
+            }
+            logits = self._session.run(None, feeds)[0]
+            scores[bucket] = logits.reshape(len(bucket), -1)[:, 0]
+
+        if normalize:
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        return scores.tolist()
+
+
+class CrossEncoderBackend:
+    """Small sentence-transformers cross-encoder, used as a cheap first stage."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import CrossEncoder
+
+        self._model = CrossEncoder(model_name, device="cpu")
+        self.name = f"cross-encoder:{model_name}"
+
+    def compute_score(
+        self, pairs: Sequence[Sequence[str]], normalize: bool = True
+    ) -> list[float]:
+        if not pairs:
+            return []
+        import torch
+
+        activation = torch.nn.Sigmoid() if normalize else torch.nn.Identity()
+        scores = self._model.predict(
+            [tuple(pair) for pair in pairs], activation_fn=activation
+        )
+        return np.asarray(scores, dtype=np.float32).reshape(-1).tolist()
+
+
+class LateInteractionReranker:
+    """ColBERT MaxSim scoring against the offline late-interaction indices.
+
+    Passage token embeddings are precomputed, so only the query is encoded per
+    request. Passages missing from the indices are encoded on the fly.
+    """
+
+    def __init__(self):
+        from code_wcag_a11y.utils.late_interaction import (
+            ColbertTokenEncoder,
+            LateInteractionIndex,
+        )
+
+        directories = sorted(LATE_INTERACTION_DIR.glob("wcag-*"))
+        if not directories:
+            raise FileNotFoundError(
+                f"No late-interaction index in {LATE_INTERACTION_DIR}. Run "
+                "`python -m code_wcag_a11y.scripts.build_late_interaction_index` first."
+            )
+        self._encoder = ColbertTokenEncoder()
+        self._indices = [LateInteractionIndex(d) for d in directories]
+        self.name = f"late-interaction:{LATE_INTERACTION_MODEL}"
+
+    def _locate(self, passage: str):
+        from code_wcag_a11y.utils.late_interaction import text_key
+
+        key = text_key(passage)
+        for index in self._indices:
+            row = index.row_by_text_key.get(key)
+            if row is not None:
+                return index, row
+        return None, None
+
+    def compute_score(
+        self, pairs: Sequence[Sequence[str]], normalize: bool = True
+    ) -> list[float]:
+        scores = np.empty(len(pairs), dtype=np.float32)
+        query_tokens: dict[str, np.ndarray] = {}
+
+        for query in dict.fromkeys(q for q, _ in pairs):
+            query_tokens[query] = self._encoder.encode([query])[0]
+
+        # Group indexed passages so each (query, index) pair is one vectorized call
+        groups: dict[tuple[str, int], tuple[list[int], list[int]]] = {}
+        for i, (query, passage) in enumerate(pairs):
+            index, row = self._locate(passage)
+            if index is None:
+                passage_tokens = self._encoder.encode([passage])[0]
+                sims = passage_tokens @ query_tokens[query].T
+                scores[i] = sims.max(axis=0).mean()
+                continue
+            positions, rows = groups.setdefault((query, id(index)), ([], []))
+            positions.append(i)
+            rows.append(row)
+
+        indices = {id(index): index for index in self._indices}
+        for (query, index_id), (positions, rows) in groups.items():
+            scores[positions] = indices[index_id].score(query_tokens[query], rows)
+
+        if normalize:
+            # Mean cosine similarity lies in [-1, 1]
+            scores = (scores + 1.0) / 2.0
+        return scores.tolist()
+
+
+@dataclass
+class CascadeStats:
+    calls: int = 0
+    early_exits: int = 0
+    candidates: int = 0
+    pruned: int = 0
+    first_stage_seconds: float = 0.0
+    second_stage_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+class CascadeReranker:
+    """Two-stage reranking: a cheap model prunes, the heavy model refines.
+
+    The first stage scores every pair and keeps the best `keep`. If its top
+    score beats the runner-up by at least `exit_margin`, the ranking is
+    considered decided and the heavy stage is skipped. Otherwise only the
+    survivors go through the heavy model.
+
+    Scores are returned for every pair so callers can sort as usual: survivors
+    carry their heavy-model score, and pruned pairs rank below the lowest
+    survivor in first-stage order (`min(survivors) - 1 - rank`). Scaling
+    first-stage scores by that minimum would not keep them below it once
+    heavy scores are negative or unnormalized.
+
+    `exit_margin` is compared on the first stage's normalized scale. For a
+    cross-encoder that is a sigmoid, where 0.5 separates a confident match
+    from the rest. For late interaction it is (mean cosine + 1) / 2, and
+    candidates rarely spread by more than a few hundredths, so 0.5 never
+    exits early there; use a margin around 0.05 to allow it.
+    """
+
+    def __init__(
+        self,
+        first_stage: Reranker,
+        second_stage: Reranker,
+        keep: int = 5,
+        exit_margin: float = 0.5,
+    ):
+        self.first_stage = first_stage
+        self.second_stage = second_stage
+        self.keep = keep
+        self.exit_margin = exit_margin
+        self.name = (
+            f"cascade({first_stage.name}>{second_stage.name},"
+            f"keep={keep},exit_margin={exit_margin})"
+        )
+        self.stats = CascadeStats()
+        self._lock = threading.Lock()
+
+    def compute_score(
+        self, pairs: Sequence[Sequence[str]], normalize: bool = True
+    ) -> list[float]:
+        if not pairs:
+            return []
+
+        start = time.perf_counter()
+        first_scores = np.asarray(
+            self.first_stage.compute_score(pairs, normalize=True), dtype=np.float32
+        )
+        first_seconds = time.perf_counter() - start
+
+        order = np.argsort(-first_scores, kind="stable")
+        survivors = order[: self.keep]
+        pruned = order[self.keep :]
+        early_exit = bool(
+            len(order) > 1
+            and first_scores[order[0]] - first_scores[order[1]] >= self.exit_margin
+        )
+
+        second_seconds = 0.0
+        if early_exit:
+            scores = first_scores
+        else:
+            start = time.perf_counter()
+            heavy_scores = self.second_stage.compute_score(
+                [pairs[i] for i in survivors], normalize=normalize
+            )
+            second_seconds = time.perf_counter() - start
+
+            scores = np.empty(len(pairs), dtype=np.float32)
+            scores[survivors] = heavy_scores
+            if len(pruned):
+                floor = float(np.min(scores[survivors]))
+                scores[pruned] = floor - 1.0 - np.arange(len(pruned))
+
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.early_exits += early_exit
+            self.stats.candidates += len(pairs)
+            self.stats.pruned += 0 if early_exit else len(pruned)
+            self.stats.first_stage_seconds += first_seconds
+            self.stats.second_stage_seconds += second_seconds
+
+        return scores.tolist()
+
+
+def load_reranker(backend: str | None = None) -> Reranker:
+    """Instantiate the given reranker backend, defaulting to the configured one."""
+    backend = backend or settings.reranker_backend
+    if backend == "onnx":
+        reranker = OnnxRerankerBackend(
+            settings.onnx_reranker_path,
+            quantized=settings.onnx_quantized,
+            intra_op_threads=settings.onnx_intra_op_threads,
+            batch_size=settings.rerank_batch_size,
+            max_length=settings.rerank_max_length,
+        )
+    elif backend == "late_interaction":
+        reranker = LateInteractionReranker()
+    else:
+        reranker = FlagRerankerBackend()
+
+    if settings.rerank_cascade:
+        if settings.cascade_first_stage_model == "late_interaction":
+            first_stage = LateInteractionReranker()
+        else:
+            first_stage = CrossEncoderBackend(settings.cascade_first_stage_model)
+        return CascadeReranker(
+            first_stage,
+            reranker,
+            keep=settings.cascade_keep,
+            exit_margin=settings.cascade_exit_margin,
+        )
+    return reranker
@@ -0,0 +1,178 @@
+import ctypes
+import gc
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Protocol
+
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.metrics import process_rss_bytes
+
+
+class Evictable(Protocol):
+    def __len__(self) -> int: ...
+
+    def clear(self) -> None: ...
+
+
+@dataclass
+class Resource:
+    """Something expensive to keep loaded that its owner reloads on next use."""
+
+    name: str
+    is_loaded: Callable[[], bool]
+    # Frees the resource; returns False when it is busy and was kept
+    release: Callable[[], bool]
+    idle_timeout: float | None
+    last_used: float = field(default_factory=time.monotonic)
+
+
+def trim_heap() -> None:
+    """Collect garbage and hand freed heap pages back to the OS.
+
+    glibc keeps freed memory mapped for reuse, so without malloc_trim RSS
+    barely moves after unloading a model. A no-op on other C libraries.
+    """
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class ResourceManager:
+    """Releases idle resources and keeps the process under an RSS budget.
+
+    A background thread checks every `interval` seconds. Resources unused for
+    their idle timeout are released. While RSS exceeds the budget, caches are
+    cleared in registration order (register the cheapest to rebuild first),
+    then loaded resources are released, least recently used first.
+    """
+
+    def __init__(self, rss_budget: int | None, interval: float):
+        self.rss_budget = rss_budget
+        self.interval = interval
+        self.idle_releases = 0
+        self.budget_evictions = 0
+        self._resources: dict[str, Resource] = {}
+        self._caches: dict[str, Evictable] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add_resource(
+        self,
+        name: str,
+        is_loaded: Callable[[], bool],
+        release: Callable[[], bool],
+        idle_timeout: float | None,
+    ) -> None:
+        self._resources[name] = Resource(name, is_loaded, release, idle_timeout)
+
+    def add_cache(self, name: str, cache: Evictable) -> None:
+        self._caches[name] = cache
+
+    def touch(self, name: str) -> None:
+        """Record a use of the resource, postponing its idle release."""
+        self._resources[name].last_used = time.monotonic()
+
+    def _release(self, resource: Resource, reason: str) -> bool:
+        try:
+            released = resource.release()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to release {resource.name}: {e}")
+            return False
+        if released:
+            logger.info(f"♻️ Released {resource.name} ({reason})")
+        return released
+
+    def check(self) -> list[str]:
+        """Run one idle and budget pass, returning what was released or cleared."""
+        with self._lock:
+            return self._release_idle() + self._enforce_budget()
+
+    def _release_idle(self) -> list[str]:
+        now = time.monotonic()
+        released = []
+        for resource in self._resources.values():
+            if (
+                resource.idle_timeout is None
+                or now - resource.last_used < resource.idle_timeout
+                or not resource.is_loaded()
+            ):
+                continue
+            if self._release(resource, f"idle {now - resource.last_used:.0f}s"):
+                self.idle_releases += 1
+                released.append(resource.name)
+        if released:
+            trim_heap()
+        return released
+
+    def _enforce_budget(self) -> list[str]:
+        if self.rss_budget is None or process_rss_bytes() <= self.rss_budget:
+            return []
+
+        evicted = []
+        for name, cache in self._caches.items():
+            if not len(cache):
+                continue
+            cache.clear()
+            evicted.append(name)
+            trim_heap()
+            if process_rss_bytes() <= self.rss_budget:
+                break
+        else:
+            loaded = sorted(
+                (r for r in self._resources.values() if r.is_loaded()),
+                key=lambda r: r.last_used,
+            )
+            for resource in loaded:
+                if not self._release(resource, "over RSS budget"):
+                    continue
+                evicted.append(resource.name)
+                trim_heap()
+                if process_rss_bytes() <= self.rss_budget:
+                    break
+
+        self.budget_evictions += len(evicted)
+        rss = process_rss_bytes()
+        if rss > self.rss_budget:
+            logger.warning(
+                f"⚠️ RSS {rss / 2**20:.0f} MiB still over the "
+                f"{self.rss_budget / 2**20:.0f} MiB budget after evicting "
+                f"{', '.join(evicted) or 'nothing'}"
+            )
+        return evicted
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.exception(f"Resource check failed: {e}")
+
+    def start(self) -> None:
+        """Start the background checks, unless there is nothing to enforce."""
+        enforced = self.rss_budget is not None or any(
+            r.idle_timeout is not None for r in self._resources.values()
+        )
+        if not enforced or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="resource-manager", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> dict[str, float]:
+        gauges = {
+            "wcag_idle_releases": self.idle_releases,
+            "wcag_budget_evictions": self.budget_evictions,
+        }
+        if self.rss_budget is not None:
+            gauges["wcag_rss_budget_bytes"] = self.rss_budget
+        for name, resource in self._resources.items():
+            gauges[f"wcag_{name}_loaded"] = float(resource.is_loaded())
+        return gauges
@@ -0,0 +1,155 @@
+import hashlib
+import json
+from collections import Counter, OrderedDict
+from typing import Any, Generic, TypeVar
+
+from code_wcag_a11y.globals import INDEX_BUILD_ID_FILE
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.ax_tree import AXSnapshot
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# Settings that change a ranking without changing the index build or model
+# names (the cascade's keep and exit margin are part of its name)
+RANKING_SETTINGS = (
+    "retrieval_backend",
+    "similarity_top_k",
+    "sc_sub_chunks",
+    "child_top_k",
+    "rerank_max_length",
+    "capture_visual",
+    "segment_regions",
+    "segment_min_nodes",
+    "segment_min_tokens",
+    "region_min_nodes",
+    "max_regions",
+)
+
+
+# Stat of the build id file when it was last read, and the id read
+_build_id: tuple[tuple[str, int, int], str] | None = None
+
+
+def get_index_build_id() -> str:
+    """Return the id of the current index build, or "unknown" if never stamped.
+
+    The ranked result cache asks on every lookup, so the file is only re-read
+    when its modification time or size changes.
+    """
+    global _build_id
+    try:
+        stat = INDEX_BUILD_ID_FILE.stat()
+        key = (str(INDEX_BUILD_ID_FILE), stat.st_mtime_ns, stat.st_size)
+        if _build_id is None or _build_id[0] != key:
+            _build_id = key, INDEX_BUILD_ID_FILE.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return "unknown"
+    return _build_id[1]
+
+
+def ranking_settings() -> str:
+    """The current values of RANKING_SETTINGS, as a compact string."""
+    return ",".join(f"{name}={getattr(settings, name)}" for name in RANKING_SETTINGS)
+
+
+def structural_signature(snapshot: AXSnapshot, wcag_version: WcagVersion) -> str:
+    """Canonical hash of what the pipeline cares about in an accessibility tree.
+
+    Accessible names, label texts and anything that never reaches the tree
+    (class names, inline text) are ignored: two components with the same
+    multiset of (role, has name, has labels, state flags, visual issues) share
+    a signature.
+    """
+    features = Counter(
+        (
+            node.role or "",
+            bool(node.name),
+            bool(node.labels),
+            node.flags,
+            node.issues,
+        )
+        for node in snapshot
+    )
+    canonical = sorted([*feature, count] for feature, count in features.items())
+    payload = json.dumps([wcag_version, canonical], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RankedResultCache:
+    """LRU cache of final ranked results keyed by structural signature.
+
+    Every entry belongs to a generation (index build id, model versions and
+    ranking settings); when the generation changes the whole cache is dropped.
+    """
+
+    def __init__(self, model_versions: tuple[str, ...], maxsize: int = 1024):
+        self.model_versions = model_versions
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._generation: str | None = None
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    @property
+    def generation(self) -> str:
+        """What cached results depend on; results of another generation are stale."""
+        return "|".join(
+            (get_index_build_id(), *self.model_versions, ranking_settings())
+        )
+
+    def _check_generation(self) -> None:
+        generation = self.generation
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, signature: str) -> dict[str, Any] | None:
+        self._check_generation()
+        result = self._entries.get(signature)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(signature)
+        self.hits += 1
+        return result
+
+    def set(self, signature: str, result: dict[str, Any]) -> None:
+        self._check_generation()
+        self._entries[signature] = result
+        self._entries.move_to_end(signature)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LRUCache(Generic[K, V]):
+    """Minimal bounded mapping evicting the least recently used entry."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,54 @@
+from typing import Any
+
+from code_wcag_a11y.utils.ax_tree import AXSnapshot
+from code_wcag_a11y.utils.clean_code import extract_applicability_signals
+
+
+def snapshot_signals(snapshot: AXSnapshot) -> list[str]:
+    """Rule table keys of a snapshot: `role:<role>` and `category:<category>`."""
+    signals = extract_applicability_signals(snapshot)
+    return [f"role:{role.lower()}" for role in signals["roles"]] + [
+        f"category:{category}" for category in signals["categories"]
+    ]
+
+
+def rank_by_rules(
+    table: dict[str, Any], signals: list[str], top_k: int
+) -> list[dict[str, Any]]:
+    """Rank success criteria by the technique-derived weights of the signals present.
+
+    An SC scores the sum of weight x idf over the signals that map to it,
+    normalized so the best SC scores 1. Ties break on SC number, so the same
+    signals always give the same ranking.
+
+    Returns:
+        Up to top_k ranked chunks in the `ranked_chunks` shape, each with the
+        `signals` that matched it.
+    """
+    scores: dict[str, float] = {}
+    matched: dict[str, list[str]] = {}
+    for signal in signals:
+        entry = table["signals"].get(signal)
+        if entry is None:
+            continue
+        for num, mapped in entry["criteria"].items():
+            scores[num] = scores.get(num, 0.0) + mapped["weight"] * entry["idf"]
+            matched.setdefault(num, []).append(signal)
+    if not scores:
+        return []
+
+    best = max(scores.values())
+    ranked = sorted(
+        scores.items(),
+        key=lambda item: (-item[1], [int(part) for part in item[0].split(".")]),
+    )
+    criteria = table["criteria"]
+    return [
+        {
+            "id": criteria[num]["chunk_id"],
+            "title": criteria[num]["title"],
+            "score": round(score / best, 4),
+            "signals": matched[num],
+        }
+        for num, score in ranked[:top_k]
+    ]
@@ -0,0 +1,109 @@
+import json
+import mmap
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from code_wcag_a11y.globals import SHARED_INDEX_DIR
+from code_wcag_a11y.scripts.types.chunk_types import WcagVersion
+from code_wcag_a11y.utils.logger import logger
+
+
+EMBEDDINGS_FILE = "embeddings.npy"
+DOCUMENTS_FILE = "documents.bin"
+DOCUMENT_OFFSETS_FILE = "document_offsets.npy"
+METADATA_FILE = "metadata.json"
+
+
+def shared_index_path(wcag_version: WcagVersion) -> Path:
+    return SHARED_INDEX_DIR / f"wcag-{wcag_version}"
+
+
+def export_shared_index(collection, wcag_version: WcagVersion) -> Path:
+    """Dump one version of the Chroma collection into flat, mmap-able files.
+
+    Embeddings are stored L2-normalized, so a dot product is the cosine
+    similarity. Documents are concatenated into one UTF-8 blob addressed by
+    an offsets array.
+
+    Returns:
+        Directory holding the exported files.
+    """
+    data = collection.get(
+        where={"version": wcag_version},
+        include=["embeddings", "documents", "metadatas"],
+    )
+    embeddings = np.asarray(data["embeddings"], dtype=np.float32)
+    if not len(embeddings):
+        raise ValueError(f"No indexed chunks for WCAG {wcag_version}")
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    encoded = [doc.encode("utf-8") for doc in data["documents"]]
+    offsets = np.concatenate(([0], np.cumsum([len(e) for e in encoded])))
+
+    directory = shared_index_path(wcag_version)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / EMBEDDINGS_FILE, embeddings)
+    np.save(directory / DOCUMENT_OFFSETS_FILE, offsets.astype(np.int64))
+    (directory / DOCUMENTS_FILE).write_bytes(b"".join(encoded))
+    with open(directory / METADATA_FILE, "w", encoding="utf-8") as f:
+        json.dump({"ids": data["ids"], "metadatas": data["metadatas"]}, f)
+
+    logger.info(f"✅ Exported {len(embeddings)} chunks to shared index {directory}")
+    return directory
+
+
+class SharedIndex:
+    """Read-only vector index over memory-mapped files.
+
+    Worker processes opening the same files share the physical pages, so the
+    embedding matrix and the corpus are held in memory once per host.
+    """
+
+    def __init__(self, directory: Path):
+        self.embeddings = np.load(directory / EMBEDDINGS_FILE, mmap_mode="r")
+        self.offsets = np.load(directory / DOCUMENT_OFFSETS_FILE, mmap_mode="r")
+        with open(directory / DOCUMENTS_FILE, "rb") as f:
+            self._documents = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(directory / METADATA_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.ids: list[str] = meta["ids"]
+        self.metadatas: list[dict[str, Any]] = meta["metadatas"]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def document(self, row: int) -> str:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return self._documents[start:end].decode("utf-8")
+
+    def search(self, query_embedding, top_k: int = 20):
+        """Return the top_k chunks as llama-index nodes, best first."""
+        from llama_index.core.schema import NodeWithScore, TextNode
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query /= np.linalg.norm(query)
+        sims = self.embeddings @ query
+
+        top_k = min(top_k, len(sims))
+        rows = np.argpartition(-sims, top_k - 1)[:top_k]
+        rows = rows[np.argsort(-sims[rows])]
+
+        return [
+            NodeWithScore(
+                node=TextNode(
+                    id_=self.ids[row],
+                    text=self.document(row),
+                    metadata={"chunk_id": self.ids[row], **self.metadatas[row]},
+                ),
+                score=float(sims[row]),
+            )
+            for row in rows
+        ]
+
+
+@cache
+def get_shared_index(wcag_version: WcagVersion) -> SharedIndex:
+    return SharedIndex(shared_index_path(wcag_version))
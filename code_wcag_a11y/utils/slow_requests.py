@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils.logger import logger
+from code_wcag_a11y.utils.metrics import record_stage_timings
+from code_wcag_a11y.utils.project import content_hash
+
+
+META_FILE = "meta.json"
+INPUT_FILE = "input.txt"
+PROFILE_FILE = "profile.folded"
+
+
+class StackSampler:
+    """Sampling profiler: snapshots every thread's Python stack at an interval.
+
+    Stacks are aggregated in the collapsed "folded" format understood by
+    flamegraph.pl and speedscope. Sampling runs in a background thread, so the
+    profiled code is not instrumented and keeps its normal speed.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="wcag-stack-sampler", daemon=True
+        )
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                        f":{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def to_folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.items())
+
+
+class SlowRequestLog:
+    """Directory of captured slow requests, keeping only the newest `keep`."""
+
+    def __init__(self, directory: Path, keep: int = 50):
+        self.directory = directory
+        self.keep = keep
+
+    def entries(self) -> list[Path]:
+        """Captured requests, oldest first."""
+        if not self.directory.exists():
+            return []
+        return sorted(p for p in self.directory.iterdir() if (p / META_FILE).exists())
+
+    def capture(self, meta: dict[str, Any], code: str, profile: str) -> Path:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        path = self.directory / f"{stamp}-{meta['tool']}-{meta['sha256'][:12]}"
+        path.mkdir(parents=True)
+        (path / INPUT_FILE).write_text(code, encoding="utf-8")
+        (path / PROFILE_FILE).write_text(profile, encoding="utf-8")
+        # Written last: entries() only lists captures whose meta file exists
+        with open(path / META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        self._rotate()
+        return path
+
+    def _rotate(self) -> None:
+        entries = self.entries()
+        for stale in entries[: max(0, len(entries) - self.keep)]:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def load_capture(path: Path) -> tuple[dict[str, Any], str]:
+    """Read back the metadata and input of a captured request."""
+    with open(path / META_FILE, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return meta, (path / INPUT_FILE).read_text(encoding="utf-8")
+
+
+@contextmanager
+def capture_slow_request(tool: str, code: str, **params: Any) -> Iterator[None]:
+    """Profile a tool call and keep a capture if it exceeds the slow threshold.
+
+    A no-op unless `WCAG_A11Y_SLOW_REQUEST_THRESHOLD` is set. The sampler sees
+    every thread of the process, so with concurrent requests the profile can
+    include their work too; the stage timings are those of this request only.
+    """
+    threshold = settings.slow_request_threshold
+    if threshold is None:
+        yield
+        return
+
+    sampler = StackSampler(settings.slow_request_sample_interval).start()
+    start = time.perf_counter()
+    error = None
+    with record_stage_timings() as timings:
+        try:
+            yield
+        except BaseException as e:
+            error = repr(e)
+            raise
+        finally:
+            sampler.stop()
+            duration = time.perf_counter() - start
+            if duration >= threshold:
+                meta = {
+                    "tool": tool,
+                    "params": params,
+                    "sha256": content_hash(code.encode("utf-8")),
+                    "seconds": duration,
+                    "threshold": threshold,
+                    "ax_nodes": next(
+                        (t["ax_nodes"] for t in timings if "ax_nodes" in t), None
+                    ),
+                    "stages": timings,
+                    "error": error,
+                    "captured_at": datetime.now(timezone.utc).isoformat(),
+                }
+                try:
+                    path = SlowRequestLog(
+                        settings.slow_request_dir, settings.slow_request_keep
+                    ).capture(meta, code, sampler.to_folded())
+                    logger.warning(
+                        f"🐢 {tool} took {duration:.2f}s, captured to {path}"
+                    )
+                except OSError as e:
+                    logger.error(f"❌ Could not capture slow request: {e}")
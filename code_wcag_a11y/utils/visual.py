@@ -0,0 +1,281 @@
+import re
+from typing import Any
+
+import numpy as np
+
+from code_wcag_a11y.utils.ax_tree import AXSnapshot, VisualInfo
+
+
+# Computed styles requested from DOMSnapshot, in this column order
+VISUAL_STYLES = ("color", "background-color", "font-size", "font-weight")
+
+# Values of VisualInfo.issues
+LOW_CONTRAST = "low_contrast"
+SMALL_TARGET = "small_target"
+NO_FOCUS_INDICATOR = "no_focus_indicator"
+
+# WCAG thresholds: 1.4.3 contrast (large text is 18pt, or 14pt bold) and
+# 2.5.8 target size, in CSS px
+MIN_CONTRAST = 4.5
+MIN_CONTRAST_LARGE_TEXT = 3.0
+LARGE_TEXT_PX = 24.0
+LARGE_BOLD_TEXT_PX = 18.66
+MIN_TARGET_PX = 24.0
+
+TEXT_ROLES = frozenset({"StaticText"})
+# Focusable, but not a pointer target of the page
+NON_TARGET_ROLES = frozenset({"RootWebArea", "WebArea", "Iframe"})
+
+# Focus styles never show in a static snapshot, so author CSS removing the
+# focus outline (a `:focus` rule or inline style with `outline: none` or a zero
+# width, and no replacement border, shadow or background) is looked up once in
+# the page and marked with this attribute for the snapshot to pick up.
+NO_FOCUS_ATTRIBUTE = "data-wcag-no-focus-indicator"
+MARK_SUPPRESSED_FOCUS_JS = f"""
+(() => {{
+  const hides = (style) =>
+    (style.outlineStyle === "none" || /^0(px)?$/.test(style.outlineWidth)) &&
+    !style.boxShadow && !style.borderColor && !style.backgroundColor;
+  const mark = (element) => element.setAttribute("{NO_FOCUS_ATTRIBUTE}", "");
+  for (const sheet of document.styleSheets) {{
+    let rules;
+    try {{ rules = sheet.cssRules; }} catch (e) {{ continue; }}
+    for (const rule of rules) {{
+      if (!rule.selectorText || !rule.selectorText.includes(":focus")) continue;
+      if (!hides(rule.style)) continue;
+      for (const selector of rule.selectorText.split(",")) {{
+        const base = selector.replace(/:focus(-visible|-within)?/g, "").trim();
+        try {{ document.querySelectorAll(base || "*").forEach(mark); }} catch (e) {{}}
+      }}
+    }}
+  }}
+  document.querySelectorAll("[style]").forEach((element) => {{
+    if (hides(element.style)) mark(element);
+  }});
+}})()
+"""
+
+_COLOR_RE = re.compile(r"rgba?\(([\d.]+),\s*([\d.]+),\s*([\d.]+)(?:,\s*([\d.]+))?\)")
+_TRANSPARENT = (0.0, 0.0, 0.0, 0.0)
+# Colors in other notations (color(), oklch(), lab(), ...): contrast unknown
+_UNKNOWN_COLOR = (np.nan, np.nan, np.nan, np.nan)
+_WHITE = np.array([255.0, 255.0, 255.0])
+
+
+def parse_color(value: str) -> tuple[float, float, float, float] | None:
+    """RGBA of a computed `rgb()` / `rgba()` color; None for other notations."""
+    match = _COLOR_RE.match(value)
+    if match is None:
+        return None
+    r, g, b, a = match.groups()
+    return float(r), float(g), float(b), float(a) if a is not None else 1.0
+
+
+def relative_luminance(rgb: np.ndarray) -> np.ndarray:
+    """WCAG relative luminance of sRGB colors, shape (..., 3) in 0-255."""
+    channels = rgb / 255.0
+    linear = np.where(
+        channels <= 0.03928, channels / 12.92, ((channels + 0.055) / 1.055) ** 2.4
+    )
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_ratios(foreground: np.ndarray, background: np.ndarray) -> np.ndarray:
+    """WCAG contrast ratio of each foreground/background pair, 1 to 21."""
+    lighter = np.maximum(relative_luminance(foreground), relative_luminance(background))
+    darker = np.minimum(relative_luminance(foreground), relative_luminance(background))
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def nearest_ancestor(parent: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Index of each node's nearest ancestor-or-self in mask, -1 if none.
+
+    Pointer jumping: every pass doubles how far up the tree a node has looked,
+    so the whole tree resolves in O(log depth) vectorized passes.
+    """
+    found = mask.copy()
+    target = np.where(mask, np.arange(len(parent)), parent)
+    while True:
+        pending = ~found & (target >= 0)
+        if not pending.any():
+            return np.where(found, target, -1)
+        hops = target[pending]
+        found[pending] = found[hops]
+        target[pending] = target[hops]
+
+
+def _hex(rgb: np.ndarray) -> str:
+    return "#{:02x}{:02x}{:02x}".format(*np.rint(rgb).astype(int))
+
+
+def _document_visuals(
+    document: dict[str, Any], strings: list[str]
+) -> dict[int, dict[str, Any]]:
+    """Visual data of every laid-out node of one DOMSnapshot document.
+
+    Returns:
+        Backend DOM node id to color, background, contrast, font size, bold,
+        width, height and whether the focus outline was marked as removed.
+        Color, background and contrast are None when a color involved is not
+        in `rgb()` / `rgba()` notation.
+    """
+    nodes, layout = document["nodes"], document["layout"]
+    parent = np.asarray(nodes["parentIndex"], dtype=np.int64)
+    if not len(parent) or not layout["nodeIndex"]:
+        return {}
+    layout_nodes = np.asarray(layout["nodeIndex"], dtype=np.int64)
+    style_rows = np.asarray(
+        [
+            row if len(row) == len(VISUAL_STYLES) else [-1] * len(VISUAL_STYLES)
+            for row in layout["styles"]
+        ],
+        dtype=np.int64,
+    )
+    bounds = np.asarray(layout["bounds"], dtype=np.float64).reshape(-1, 4)
+
+    # Parse each distinct style string once, then gather per layout object
+    def column(index: int, parse, default) -> np.ndarray:
+        ids = style_rows[:, index]
+        parsed = {i: parse(strings[i]) for i in np.unique(ids) if i >= 0}
+        return np.asarray([parsed.get(i, default) for i in ids], dtype=np.float64)
+
+    def rgba(value: str) -> tuple[float, float, float, float]:
+        return parse_color(value) or _UNKNOWN_COLOR
+
+    color = column(0, rgba, _TRANSPARENT)
+    background = column(1, rgba, _TRANSPARENT)
+    font_size = column(2, lambda v: float(v.removesuffix("px") or 0), 0.0)
+    font_weight = column(
+        3, lambda v: 700.0 if v == "bold" else float(v) if v.isdigit() else 400.0, 400.0
+    )
+
+    # Per DOM node: its own layout object's styles, or its parent's for text
+    # runs reported without styles; backdrop from the nearest painted ancestor
+    count = len(parent)
+    row_of = np.full(count, -1)
+    row_of[layout_nodes] = np.arange(len(layout_nodes))
+    styled = np.zeros(count, dtype=bool)
+    styled[layout_nodes] = style_rows[:, 0] >= 0
+    style_row = row_of[np.maximum(nearest_ancestor(parent, styled), 0)]
+
+    painted = np.zeros(count, dtype=bool)
+    # An unknown background still hides whatever is behind it
+    painted[layout_nodes] = ~(background[:, 3] <= 0)
+    painter = nearest_ancestor(parent, painted)
+    backdrop_row = row_of[np.maximum(painter, 0)]
+    has_backdrop = painter >= 0
+    backdrop_rgba = background[backdrop_row]
+    # Translucent backgrounds are composited over the white canvas
+    alpha = np.where(has_backdrop, backdrop_rgba[:, 3], 0.0)[:, None]
+    backdrop = alpha * backdrop_rgba[:, :3] + (1 - alpha) * _WHITE
+
+    text_rgba = color[style_row]
+    text_alpha = text_rgba[:, 3:4]
+    text = text_alpha * text_rgba[:, :3] + (1 - text_alpha) * backdrop
+    # NaN wherever either color is unknown
+    contrast = contrast_ratios(text, backdrop)
+
+    marked = np.zeros(count, dtype=bool)
+    if NO_FOCUS_ATTRIBUTE in strings:
+        attribute = strings.index(NO_FOCUS_ATTRIBUTE)
+        for index, attributes in enumerate(nodes.get("attributes", [])):
+            marked[index] = attribute in attributes[::2]
+
+    backend_ids = nodes["backendNodeId"]
+    visuals = {}
+    for row, index in enumerate(layout_nodes):
+        source = style_row[index]
+        known = not np.isnan(contrast[index])
+        visuals[backend_ids[index]] = {
+            "color": _hex(text[index]) if known else None,
+            "background": (
+                _hex(backdrop[index]) if not np.isnan(backdrop[index]).any() else None
+            ),
+            "contrast": round(float(contrast[index]), 2) if known else None,
+            "font_size": float(font_size[source]),
+            "bold": bool(font_weight[source] >= 700),
+            "width": round(float(bounds[row, 2]), 1),
+            "height": round(float(bounds[row, 3]), 1),
+            "no_focus_outline": bool(marked[index]),
+        }
+    return visuals
+
+
+def annotate_snapshot(
+    snapshot: AXSnapshot, ax_tree: dict[str, Any], dom_snapshot: dict[str, Any]
+) -> int:
+    """Attach VisualInfo to the text and focusable nodes of a snapshot.
+
+    Args:
+        snapshot: Snapshot normalized from ax_tree.
+        ax_tree: The `Accessibility.getFullAXTree` response.
+        dom_snapshot: The `DOMSnapshot.captureSnapshot` response, taken with
+            VISUAL_STYLES as computed styles.
+
+    Returns:
+        Number of nodes annotated.
+    """
+    visuals: dict[int, dict[str, Any]] = {}
+    for document in dom_snapshot["documents"]:
+        visuals.update(_document_visuals(document, dom_snapshot["strings"]))
+
+    dom_ids = {
+        node["nodeId"]: node.get("backendDOMNodeId") for node in ax_tree["nodes"]
+    }
+    annotated = 0
+    for node in snapshot:
+        is_text = node.role in TEXT_ROLES or node.editable
+        is_target = node.focusable and node.role not in NON_TARGET_ROLES
+        if not (is_text or is_target):
+            continue
+        visual = visuals.get(dom_ids.get(node.node_id))
+        if visual is None:
+            continue
+
+        issues = []
+        large = visual["font_size"] >= LARGE_TEXT_PX or (
+            visual["bold"] and visual["font_size"] >= LARGE_BOLD_TEXT_PX
+        )
+        threshold = MIN_CONTRAST_LARGE_TEXT if large else MIN_CONTRAST
+        contrast = visual["contrast"]
+        if is_text and contrast is not None and contrast < threshold:
+            issues.append(LOW_CONTRAST)
+        if is_target:
+            smallest = min(visual["width"], visual["height"])
+            if 0 < smallest < MIN_TARGET_PX:
+                issues.append(SMALL_TARGET)
+            if visual["no_focus_outline"]:
+                issues.append(NO_FOCUS_INDICATOR)
+
+        node.visual = VisualInfo(
+            color=visual["color"],
+            background=visual["background"],
+            contrast=visual["contrast"],
+            font_size=visual["font_size"],
+            bold=visual["bold"],
+            width=visual["width"],
+            height=visual["height"],
+            issues=tuple(issues),
+        )
+        annotated += 1
+    return annotated
+
+
+async def capture_visual_data(
+    cdp: Any, ax_tree: dict[str, Any], snapshot: AXSnapshot
+) -> int:
+    """Capture computed styles and layout for the whole page and annotate snapshot.
+
+    One `DOMSnapshot.captureSnapshot` call returns the styles and bounding
+    boxes of every laid-out node, instead of one style query per element; a
+    single script evaluated beforehand marks elements whose focus outline is
+    removed.
+
+    Returns:
+        Number of nodes annotated.
+    """
+    await cdp.send("Runtime.evaluate", {"expression": MARK_SUPPRESSED_FOCUS_JS})
+    dom_snapshot = await cdp.send(
+        "DOMSnapshot.captureSnapshot", {"computedStyles": list(VISUAL_STYLES)}
+    )
+    return annotate_snapshot(snapshot, ax_tree, dom_snapshot)
@@ -0,0 +1,77 @@
+import json
+
+from code_wcag_a11y.utils.ax_tree import AXSnapshot, diff_snapshots
+
+
+def cdp_node(node_id, role, name=None, parent=None, ignored=False, **props):
+    node = {
+        "nodeId": node_id,
+        "role": {"value": role},
+        "name": {"value": name},
+        "ignored": ignored,
+        "properties": [
+            {"name": key, "value": {"value": value}} for key, value in props.items()
+        ],
+    }
+    if parent is not None:
+        node["parentId"] = parent
+    return node
+
+
+def form(label="Email", required=True):
+    return AXSnapshot.from_cdp(
+        {
+            "nodes": [
+                cdp_node("1", "RootWebArea", "Page"),
+                cdp_node("2", "generic", parent="1", ignored=True),
+                cdp_node(
+                    "3",
+                    "textbox",
+                    label,
+                    parent="2",
+                    focusable=True,
+                    editable="plaintext",
+                    required=required,
+                ),
+                cdp_node("4", "button", "Send", parent="2", focusable=True),
+            ]
+        }
+    )
+
+
+def test_ignored_nodes_are_dropped_and_children_reparented():
+    snapshot = form()
+    assert [node.node_id for node in snapshot] == ["1", "3", "4"]
+    assert snapshot.get("3").parent_id == "1"
+    assert snapshot.get("1").child_ids == ["3", "4"]
+
+
+def test_editable_keeps_cdp_token():
+    snapshot = form()
+    textbox = snapshot.to_dict()["3"]
+
+    assert textbox["editable"] == "plaintext"
+    assert snapshot.to_dict()["4"]["editable"] is False
+    assert json.loads(snapshot.to_json()) == snapshot.to_dict()
+    assert AXSnapshot.from_dict(snapshot.to_dict()).to_dict() == snapshot.to_dict()
+
+
+def test_diff_reports_changed_node_as_removed_and_added():
+    diff = diff_snapshots(form(), form(required=False))
+
+    assert [node.node_id for node in diff.added] == ["3"]
+    assert [node.node_id for node in diff.removed] == ["3"]
+    assert not diff.added[0].required and diff.removed[0].required
+
+
+def test_diff_of_equal_trees_is_empty():
+    assert not diff_snapshots(form(), form()).changed
+
+
+def test_diff_counts_duplicate_nodes():
+    old = form()
+    new = AXSnapshot.from_dict({**old.to_dict(), "5": old.to_dict()["4"]})
+
+    diff = diff_snapshots(old, new)
+    assert [node.node_id for node in diff.added] == ["5"]
+    assert diff.removed == []
@@ -0,0 +1,57 @@
+import math
+
+import pytest
+
+from code_wcag_a11y.scripts.benchmark_retrieval import (
+    check_regressions,
+    ndcg_at_k,
+    override_settings,
+    recall_at_k,
+    reciprocal_rank,
+)
+from code_wcag_a11y.settings import settings
+
+RANKING = ["1.4.3", None, "1.1.1", "2.4.7"]
+
+
+def test_recall_at_k():
+    assert recall_at_k(RANKING, {"1.1.1", "4.1.2"}, 2) == 0.0
+    assert recall_at_k(RANKING, {"1.1.1", "4.1.2"}, 3) == 0.5
+
+
+def test_ndcg_at_k():
+    assert ndcg_at_k(RANKING, {"1.4.3"}, 3) == 1.0
+    # One hit at rank 3 of two expected: (1 / log2 4) / (1 + 1 / log2 3)
+    assert ndcg_at_k(RANKING, {"1.1.1", "4.1.2"}, 3) == pytest.approx(
+        0.5 / (1 + 1 / math.log2(3))
+    )
+    assert ndcg_at_k(RANKING, {"4.1.2"}, 4) == 0.0
+
+
+def test_reciprocal_rank():
+    assert reciprocal_rank(RANKING, {"1.1.1"}) == pytest.approx(1 / 3)
+    assert reciprocal_rank(RANKING, {"4.1.2"}) == 0.0
+
+
+def test_check_regressions_against_baseline():
+    results = [
+        {"name": "base", "quality": {"mrr": 0.80}},
+        {"name": "fast", "quality": {"mrr": 0.74}},
+        {"name": "close", "quality": {"mrr": 0.79}},
+    ]
+
+    assert check_regressions(results, "base", "mrr", 0.05) == ["fast"]
+    with pytest.raises(ValueError, match="Unknown baseline"):
+        check_regressions(results, "missing", "mrr", 0.05)
+
+
+def test_override_settings_restores_previous_values():
+    previous = settings.similarity_top_k
+
+    with override_settings({"similarity_top_k": previous + 5}):
+        assert settings.similarity_top_k == previous + 5
+    assert settings.similarity_top_k == previous
+
+    with pytest.raises(ValueError, match="Unknown settings: nope"):
+        with override_settings({"nope": 1}):
+            pass
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from code_wcag_a11y.utils import browser as browser_module
+from code_wcag_a11y.utils.browser import BrowserPool
+
+
+class FakeContext:
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self, launches):
+        self.launches = launches
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        return FakeContext()
+
+    async def close(self):
+        await asyncio.sleep(0.01)
+        self.connected = False
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.browsers = []
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def launch(self, headless=True):
+        await asyncio.sleep(0.01)
+        self.browsers.append(FakeBrowser(len(self.browsers)))
+        return self.browsers[-1]
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def playwright(monkeypatch):
+    fake = FakePlaywright()
+    monkeypatch.setattr(browser_module, "async_playwright", lambda: fake)
+    return fake
+
+
+def test_close_keeps_browser_in_use(playwright):
+    pool = BrowserPool()
+
+    async def scenario():
+        async with pool.context():
+            assert not await pool.close()
+        assert await pool.close()
+
+    asyncio.run(scenario())
+    assert pool.launches == 1 and not pool.is_running
+
+
+def test_render_during_close_waits_for_it(playwright):
+    pool = BrowserPool()
+
+    async def render():
+        async with pool.context():
+            pass
+
+    async def scenario():
+        await render()
+        await asyncio.gather(pool.close(), render())
+
+    asyncio.run(scenario())
+    # The second render launched only after the first browser was closed
+    assert pool.launches == 2
+    assert [b.connected for b in playwright.browsers] == [False, True]
@@ -0,0 +1,57 @@
+import uuid
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+pytest.importorskip("huggingface_hub")
+pytest.importorskip("llama_index.vector_stores.chroma")
+
+from llama_index.core import QueryBundle
+from llama_index.core.vector_stores import ExactMatchFilter, MetadataFilters
+
+from code_wcag_a11y.scripts import build_index
+from code_wcag_a11y.utils.chunk_aggregation import aggregate_to_parents, parent_chunk_id
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = chromadb.EphemeralClient().create_collection(
+        f"wcag-{uuid.uuid4().hex}", embedding_function=None
+    )
+    collection.add(
+        ids=["sc_1.1.1", "sc_1.1.1#benefits-0", "sc_2.4.7", "sc_1.1.1-21"],
+        documents=["Non-text content", "Benefits", "Focus visible", "Old 1.1.1"],
+        embeddings=[[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [1.0, 0.0]],
+        metadatas=[
+            {"version": "2.2", "type": "success_criterion"},
+            {
+                "version": "2.2",
+                "type": "sc_section",
+                "parent_chunk_id": "sc_1.1.1",
+                "section": "benefits",
+            },
+            {"version": "2.2", "type": "success_criterion"},
+            {"version": "2.1", "type": "success_criterion"},
+        ],
+    )
+    monkeypatch.setattr(build_index, "get_collection", lambda: collection)
+    build_index.get_index.cache_clear()
+    yield collection
+    build_index.get_index.cache_clear()
+
+
+def test_chroma_index_retrieves_one_version_by_query_embedding(collection):
+    retriever = build_index.get_index("2.2").as_retriever(
+        similarity_top_k=3,
+        filters=MetadataFilters(filters=[ExactMatchFilter(key="version", value="2.2")]),
+    )
+
+    nodes = retriever.retrieve(QueryBundle(query_str="<img>", embedding=[1.0, 0.0]))
+    parents = aggregate_to_parents(nodes, top_k=2)
+
+    assert [parent_chunk_id(n) for n in parents] == ["sc_1.1.1", "sc_2.4.7"]
+
+
+def test_unindexed_version_is_reported(collection):
+    with pytest.raises(ValueError, match="No indexed chunks for WCAG 2.0"):
+        build_index.get_index("2.0")
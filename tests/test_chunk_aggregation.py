@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+from code_wcag_a11y.utils.chunk_aggregation import aggregate_to_parents, parent_chunk_id
+
+
+class Hit(SimpleNamespace):
+    """Stand-in for llama-index's NodeWithScore."""
+
+    @property
+    def metadata(self):
+        return self.node.metadata
+
+
+def hit(node_id, score, **metadata):
+    return Hit(node=SimpleNamespace(node_id=node_id, metadata=metadata), score=score)
+
+
+def test_sections_collapse_to_best_section_per_parent():
+    hits = [
+        hit("1.1.1#benefits", 0.9, parent_chunk_id="1.1.1", section="benefits"),
+        hit("4.1.2", 0.8, chunk_id="4.1.2"),
+        hit("1.1.1#failures", 0.7, parent_chunk_id="1.1.1", section="failures"),
+        hit("2.4.7#requirement", 0.6, parent_chunk_id="2.4.7", section="requirement"),
+    ]
+
+    parents = aggregate_to_parents(hits, top_k=2)
+
+    assert [p.node.node_id for p in parents] == ["1.1.1#benefits", "4.1.2"]
+    assert parents[0].node.metadata["chunk_id"] == "1.1.1"
+    assert parents[0].node.metadata["sections"] == ["benefits", "failures"]
+
+
+def test_retrieved_nodes_are_not_modified():
+    hits = [
+        hit("1.1.1#benefits", 0.9, parent_chunk_id="1.1.1", section="benefits"),
+        hit("1.1.1#failures", 0.7, parent_chunk_id="1.1.1", section="failures"),
+    ]
+
+    aggregate_to_parents(hits, top_k=5)
+    aggregate_to_parents(hits, top_k=5)
+
+    assert hits[0].node.metadata == {"parent_chunk_id": "1.1.1", "section": "benefits"}
+
+
+def test_hits_without_chunk_id_metadata_are_keyed_by_node_id():
+    # Chroma stores the chunk id as the document id only
+    hits = [
+        hit("sc_1.1.1", 0.9, version="2.2"),
+        hit("sc_1.1.1#benefits-0", 0.8, parent_chunk_id="sc_1.1.1", section="benefits"),
+        hit("sc_2.4.7", 0.7, version="2.2"),
+    ]
+
+    parents = aggregate_to_parents(hits, top_k=5)
+
+    assert [parent_chunk_id(p) for p in parents] == ["sc_1.1.1", "sc_2.4.7"]
@@ -0,0 +1,55 @@
+import pytest
+
+from code_wcag_a11y.utils.daemon_client import DaemonReranker
+
+
+class FakeConnection:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, op, **payload):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class FakeReranker:
+    def compute_score(self, pairs, normalize=True):
+        return [-1.0] * len(pairs)
+
+
+def reranker(connection):
+    daemon_reranker = DaemonReranker(connection, {"reranker": "flag:test"})
+    loads = []
+    daemon_reranker._load_fallback = lambda: loads.append(1) or FakeReranker()
+    return daemon_reranker, loads
+
+
+def test_timeout_is_retried_without_falling_back():
+    connection = FakeConnection(TimeoutError("timed out"), [0.5])
+    daemon_reranker, loads = reranker(connection)
+
+    assert daemon_reranker.compute_score([["q", "p"]]) == [0.5]
+    assert connection.calls == 2 and not loads
+
+
+def test_repeated_timeout_is_raised_and_daemon_kept():
+    connection = FakeConnection(TimeoutError(), TimeoutError(), [0.5])
+    daemon_reranker, loads = reranker(connection)
+
+    with pytest.raises(TimeoutError):
+        daemon_reranker.compute_score([["q", "p"]])
+    assert daemon_reranker.compute_score([["q", "p"]]) == [0.5]
+    assert not loads
+
+
+def test_refused_connection_falls_back_once():
+    connection = FakeConnection(ConnectionRefusedError(), [0.5])
+    daemon_reranker, loads = reranker(connection)
+
+    assert daemon_reranker.compute_score([["q", "p"]]) == [-1.0]
+    assert daemon_reranker.compute_score([["q", "p"]]) == [-1.0]
+    assert connection.calls == 1 and loads == [1]
@@ -0,0 +1,57 @@
+import pytest
+
+from code_wcag_a11y.utils.metrics import Histogram, MetricsRegistry, estimate_tokens
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.inc("errors_total", labels={"stage": 'say "hi"\\\nbye'})
+
+    assert registry.render_prometheus() == (
+        "# TYPE errors_total counter\n"
+        'errors_total{stage="say \\"hi\\"\\\\\\nbye"} 1\n'
+    )
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    registry.help["latency_seconds"] = "Latency"
+    for value in (0.2, 0.7, 3.0):
+        registry.observe("latency_seconds", value, {"stage": "render"}, (0.5, 1.0))
+
+    assert registry.render_prometheus().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{stage="render",le="0.5"} 1',
+        'latency_seconds_bucket{stage="render",le="1"} 2',
+        'latency_seconds_bucket{stage="render",le="+Inf"} 3',
+        'latency_seconds_sum{stage="render"} 3.9',
+        'latency_seconds_count{stage="render"} 3',
+    ]
+
+
+def test_gauges_are_collected_at_export():
+    registry = MetricsRegistry()
+    values = {"pool_size": 1}
+    registry.register_collector(lambda: dict(values))
+    values["pool_size"] = 3
+
+    assert "pool_size 3" in registry.render_prometheus()
+    assert registry.snapshot()["gauges"] == {"pool_size": 3}
+
+
+def test_quantiles_are_bucket_upper_bounds():
+    histogram = Histogram((1.0, 2.0, 5.0))
+    assert histogram.quantile(0.5) is None
+
+    for value in (0.5, 1.5, 1.5, 4.0, 9.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 2.0
+    assert histogram.quantile(0.8) == 5.0
+    assert histogram.quantile(0.99) == float("inf")
+    assert histogram.summary()["mean"] == pytest.approx(3.3)
+
+
+def test_estimate_tokens_counts_words_and_punctuation():
+    assert estimate_tokens("Hello, world! x=1") == 7
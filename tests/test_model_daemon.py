@@ -0,0 +1,45 @@
+import asyncio
+
+from code_wcag_a11y.model_daemon import MicroBatcher
+from code_wcag_a11y.utils.rerankers import CascadeReranker
+
+
+class FixedReranker:
+    def __init__(self, name, scores):
+        self.name = name
+        self.scores = scores
+        self.calls = []
+
+    def compute_score(self, pairs, normalize=True):
+        self.calls.append([passage for _, passage in pairs])
+        return [self.scores[passage] for _, passage in pairs]
+
+
+async def submit_together(batcher, *requests):
+    return await asyncio.gather(*(batcher.submit(items) for items in requests))
+
+
+def test_unmerged_batch_reranks_each_request_on_its_own():
+    first = FixedReranker("first", {"a": 0.9, "b": 0.8, "c": 0.7, "d": 0.6})
+    heavy = FixedReranker("heavy", {"a": 3.0, "b": 2.0, "c": 1.0, "d": 0.5})
+    cascade = CascadeReranker(first, heavy, keep=2, exit_margin=0.5)
+    batcher = MicroBatcher(cascade.compute_score, window=0.01, max_items=8, merge=False)
+
+    results = asyncio.run(
+        submit_together(batcher, [["q1", "a"], ["q1", "b"]], [["q2", "c"], ["q2", "d"]])
+    )
+
+    # Merged, c and d would have been pruned behind a and b
+    assert results == [[3.0, 2.0], [1.0, 0.5]]
+    assert heavy.calls == [["a", "b"], ["c", "d"]]
+    assert (batcher.batches, batcher.items) == (1, 4)
+
+
+def test_merged_batch_makes_one_model_call():
+    model = FixedReranker("model", {"a": 1.0, "b": 2.0})
+    batcher = MicroBatcher(model.compute_score, window=0.01, max_items=8)
+
+    results = asyncio.run(submit_together(batcher, [["q", "a"]], [["q", "b"]]))
+
+    assert results == [[1.0], [2.0]]
+    assert model.calls == [["a", "b"]]
@@ -0,0 +1,85 @@
+from code_wcag_a11y.utils.prerender import detect_syntax, prerender_component
+
+
+def test_apostrophe_in_jsx_text_inside_expression():
+    code = (
+        "<div>{open && <p>Don't go</p>}<button>Save</button>"
+        '<label htmlFor="a">A</label></div>'
+    )
+    assert prerender_component(code) == (
+        '<div><p>Don\'t go</p><button>Save</button><label for="a">A</label></div>'
+    )
+
+
+def test_html_with_braces_is_not_jsx():
+    code = '<div style="color: red">{ not jsx? }</div>'
+    assert detect_syntax(code) == "html"
+    assert prerender_component(code) == code
+
+
+def test_unresolvable_state_attributes_are_dropped():
+    code = (
+        "<button disabled={busy} aria-expanded={open} aria-label={label} "
+        "hidden={false} required={true}>Go</button>"
+    )
+    assert (
+        prerender_component(code) == '<button aria-label="label" required>Go</button>'
+    )
+
+
+def test_svelte_shorthand_state_attribute_is_dropped():
+    code = "<input {disabled} {value} on:click={go}>"
+    assert prerender_component(code) == '<input value="value" onclick="">'
+
+
+def test_brace_escapes():
+    code = '<p className="code">{"{"}braces{"}"}</p>'
+    assert prerender_component(code) == '<p class="code">{braces}</p>'
+
+
+def test_map_renders_one_item():
+    code = (
+        'const List = ({ items }) => (<ul className="list">'
+        "{items.map((item) => <li key={item.id}>{item.name}'s</li>)}</ul>);"
+    )
+    assert prerender_component(code) == '<ul class="list"><li>name\'s</li></ul>'
+
+
+def test_vue_renders_v_if_branch_only():
+    code = (
+        '<div><p v-if="ok">Yes</p><p v-else-if="maybe">Maybe</p>'
+        "<p v-else>No</p><span>{{ count }}</span></div>"
+    )
+    assert prerender_component(code) == "<div><p>Yes</p><span>count</span></div>"
+
+
+def test_svelte_renders_if_branch_only():
+    code = (
+        "{#if ok}<p>Yes</p>{:else if maybe}<p>Maybe {#if x}<b>x</b>{/if}</p>"
+        "{:else}<p>No</p>{/if}<span>{count}</span>"
+    )
+    assert prerender_component(code) == "<p>Yes</p><span>count</span>"
+
+
+def test_svelte_each_renders_body_not_empty_state():
+    code = (
+        "<ul>{#each items as item}<li>{item.name}</li>{:else}<li>None</li>{/each}</ul>"
+    )
+    assert prerender_component(code) == "<ul><li>name</li></ul>"
+
+
+def test_html_with_leading_text_is_kept_whole():
+    code = (
+        'Read our <a href="/terms">terms</a> and '
+        '<a href="/privacy">privacy policy</a>.'
+    )
+    assert detect_syntax(code) == "html"
+    assert prerender_component(code) == code
+
+
+def test_component_source_is_cut_to_its_markup():
+    code = (
+        'const Notice = () => (<p className="notice">Hi</p>);\nexport default Notice;'
+    )
+    assert detect_syntax(code) == "jsx"
+    assert prerender_component(code) == '<p class="notice">Hi</p>'
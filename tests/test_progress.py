@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from code_wcag_a11y.utils.ax_tree import AXSnapshot
+from code_wcag_a11y.utils.progress import report_stage, summarize_snapshot
+
+
+class FakeContext:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.reports = []
+
+    async def report_progress(self, progress, total, message):
+        if self.fail:
+            raise RuntimeError("no progress token")
+        self.reports.append((progress, total, json.loads(message)))
+
+
+def test_summarize_snapshot():
+    snapshot = AXSnapshot.from_dict(
+        {
+            "1": {"role": "button", "name": "", "focusable": True},
+            "2": {"role": "button", "name": "Go", "focusable": True},
+            "3": {"role": "StaticText", "name": "Hi"},
+        }
+    )
+
+    assert summarize_snapshot(snapshot) == {
+        "nodes": 3,
+        "roles": {"button": 2, "StaticText": 1},
+        "focusable": 2,
+        "unnamed_focusable": 1,
+        "visual_issues": {},
+    }
+
+
+def test_report_stage_sends_stage_position_and_partial():
+    ctx = FakeContext()
+
+    asyncio.run(report_stage(ctx, "vector_ranked", {"ranked_chunks": []}))
+
+    assert ctx.reports == [
+        (2, 3, {"stage": "vector_ranked", "partial": {"ranked_chunks": []}})
+    ]
+
+
+def test_report_stage_is_best_effort():
+    asyncio.run(report_stage(None, "reranked", {}))
+    asyncio.run(report_stage(FakeContext(fail=True), "reranked", {}))
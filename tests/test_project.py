@@ -0,0 +1,72 @@
+import asyncio
+import io
+import json
+
+from code_wcag_a11y.utils.project import (
+    ProjectResultCache,
+    SarifWriter,
+    analyze_project,
+)
+
+
+def run_project(root, cache, result):
+    async def analyze(code, wcag_version):
+        return result
+
+    async def collect():
+        return [r async for r in analyze_project(root, analyze, "2.2", 2, cache)]
+
+    return asyncio.run(collect())
+
+
+def test_caches_results_without_process_local_handle(tmp_path):
+    (tmp_path / "a.html").write_text("<button>Go</button>")
+    cache = ProjectResultCache(tmp_path / "cache", generation="build|models")
+    result = {"ranked_chunks": [], "degraded": [], "handle": "abc"}
+
+    [first] = run_project(tmp_path, cache, result)
+    [second] = run_project(tmp_path, cache, result)
+
+    assert first["cached"] is False and first["result"]["handle"] == "abc"
+    assert second["cached"] is True
+    assert second["result"] == {"ranked_chunks": [], "degraded": []}
+
+
+def test_does_not_cache_degraded_results(tmp_path):
+    (tmp_path / "a.html").write_text("<button>Go</button>")
+    cache = ProjectResultCache(tmp_path / "cache")
+    result = {"ranked_chunks": [], "degraded": ["vector_order"]}
+
+    run_project(tmp_path, cache, result)
+    [record] = run_project(tmp_path, cache, result)
+
+    assert record["cached"] is False
+
+
+def test_other_generation_misses(tmp_path):
+    cache = ProjectResultCache(tmp_path, generation="build-1|models")
+    cache.set("ab" * 32, "2.2", {"ranked_chunks": []})
+
+    assert cache.get("ab" * 32, "2.2") == {"ranked_chunks": []}
+    assert (
+        ProjectResultCache(tmp_path, generation="build-2|models").get("ab" * 32, "2.2")
+        is None
+    )
+
+
+def test_sarif_rule_falls_back_when_chunk_has_no_id():
+    out = io.StringIO()
+    chunks = [
+        {"id": "sc_1.1.1", "title": "Non-text Content", "score": 0.9},
+        {"id": None, "title": "Focus Visible", "score": 0.8},
+        {"id": None, "title": None, "score": 0.7},
+    ]
+    with SarifWriter(out, "2.2") as writer:
+        writer.write({"path": "a.html", "result": {"ranked_chunks": chunks}})
+
+    results = json.loads(out.getvalue())["runs"][0]["results"]
+    assert [r["ruleId"] for r in results] == [
+        "sc_1.1.1",
+        "Focus Visible",
+        "Unknown criterion",
+    ]
@@ -0,0 +1,76 @@
+import asyncio
+
+from code_wcag_a11y.utils.ax_tree import AXNode, AXSnapshot
+from code_wcag_a11y.utils.regions import fetch_region_sources, segment_snapshot
+
+FORM = '<form><label>Q <input name="q"></label><button>Go</button></form>'
+TABLE = "<table><tr><td>1</td></tr></table>"
+MAIN = f"<main><h1>Title</h1>{FORM}<p>Text</p>{TABLE}</main>"
+
+
+class FakeCDP:
+    def __init__(self, markup):
+        self.markup = markup
+
+    async def send(self, method, params):
+        return {"outerHTML": self.markup[params["backendNodeId"]]}
+
+
+def page():
+    # main > (heading, form > (textbox, button), paragraph, table > cell)
+    tree = {
+        "root": (None, "RootWebArea"),
+        "main": ("root", "main"),
+        "h1": ("main", "heading"),
+        "form": ("main", "form"),
+        "q": ("form", "textbox"),
+        "go": ("form", "button"),
+        "p": ("main", "paragraph"),
+        "table": ("main", "table"),
+        "cell": ("table", "cell"),
+    }
+    nodes = {
+        node_id: AXNode(node_id, role, None, parent_id=parent)
+        for node_id, (parent, role) in tree.items()
+    }
+    for node in nodes.values():
+        if node.parent_id:
+            nodes[node.parent_id].child_ids.append(node.node_id)
+    ax_tree = {
+        "nodes": [{"nodeId": node_id, "backendDOMNodeId": node_id} for node_id in tree]
+    }
+    return AXSnapshot(nodes), ax_tree
+
+
+def test_nested_region_markup_is_cut_from_enclosing_region():
+    snapshot, ax_tree = page()
+    regions = segment_snapshot(snapshot, min_nodes=1, max_regions=8)
+    cdp = FakeCDP({"main": MAIN, "form": FORM, "table": TABLE})
+
+    sources = asyncio.run(fetch_region_sources(cdp, ax_tree, snapshot, regions))
+
+    assert [r.region_id for r in regions] == [
+        "document",
+        "main-1",
+        "form-1",
+        "table-1",
+    ]
+    assert sources == {
+        "main": "<main><h1>Title</h1><p>Text</p></main>",
+        "form": FORM,
+        "table": TABLE,
+    }
+
+
+def test_folded_region_markup_stays_in_enclosing_region():
+    snapshot, ax_tree = page()
+    regions = segment_snapshot(snapshot, min_nodes=3, max_regions=8)
+    cdp = FakeCDP({"main": MAIN, "form": FORM, "table": TABLE})
+
+    sources = asyncio.run(fetch_region_sources(cdp, ax_tree, snapshot, regions))
+
+    assert [r.region_id for r in regions] == ["main-1", "form-1"]
+    assert sources == {
+        "main": f"<main><h1>Title</h1><p>Text</p>{TABLE}</main>",
+        "form": FORM,
+    }
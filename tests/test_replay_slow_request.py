@@ -0,0 +1,64 @@
+import asyncio
+
+from code_wcag_a11y.scripts.replay_slow_request import replay_call
+from code_wcag_a11y.utils.slow_requests import SlowRequestLog, load_capture
+
+
+async def analyze(code, wcag_version="2.2", mode="full", ctx=None):
+    return {"tool": "analyzeWCAG", "code": code, "wcag_version": wcag_version}
+
+
+async def analyze_delta(handle, code, wcag_version="2.2", ctx=None):
+    return {"tool": "analyzeWCAGDelta", "handle": handle, "code": code}
+
+
+async def get_accessibility_data(code):
+    return {"tool": "getAccessibilityData", "code": code}
+
+
+TOOLS = {
+    "analyzeWCAG": analyze,
+    "analyzeWCAGDelta": analyze_delta,
+    "getAccessibilityData": get_accessibility_data,
+}
+
+
+def capture(tmp_path, tool, code, **params):
+    log = SlowRequestLog(tmp_path)
+    meta = {"tool": tool, "sha256": "0" * 64, "seconds": 1.0, "params": params}
+    return load_capture(log.capture(meta, code, profile=""))
+
+
+def test_replays_captured_delta_request(tmp_path):
+    meta, code = capture(
+        tmp_path,
+        "analyzeWCAGDelta",
+        "<button>Go</button>",
+        handle="abc",
+        wcag_version="2.1",
+    )
+
+    result = asyncio.run(replay_call(TOOLS, meta, code))
+
+    assert result == {
+        "tool": "analyzeWCAGDelta",
+        "handle": "abc",
+        "code": "<button>Go</button>",
+    }
+
+
+def test_replays_captured_analysis_with_its_params(tmp_path):
+    meta, code = capture(
+        tmp_path, "analyzeWCAG", "<img src=x>", wcag_version="2.1", mode="fast"
+    )
+
+    result = asyncio.run(replay_call(TOOLS, meta, code))
+
+    assert result["code"] == "<img src=x>"
+    assert result["wcag_version"] == "2.1"
+
+
+def test_replays_request_without_params(tmp_path):
+    meta, code = capture(tmp_path, "getAccessibilityData", "<p>Hi</p>")
+
+    assert asyncio.run(replay_call(TOOLS, meta, code))["code"] == "<p>Hi</p>"
@@ -0,0 +1,51 @@
+import pytest
+
+from code_wcag_a11y.utils.rerankers import CascadeReranker
+
+
+class FixedReranker:
+    def __init__(self, name, scores):
+        self.name = name
+        self.scores = scores
+        self.calls = []
+
+    def compute_score(self, pairs, normalize=True):
+        self.calls.append([passage for _, passage in pairs])
+        return [self.scores[passage] for _, passage in pairs]
+
+
+def pairs(*passages):
+    return [["query", passage] for passage in passages]
+
+
+def test_pruned_pairs_rank_below_survivors_in_first_stage_order():
+    first = FixedReranker("first", {"a": 0.9, "b": 0.8, "c": 0.7, "d": 0.6})
+    # Negative heavy scores: scaling first-stage scores by the floor would
+    # rank pruned pairs above the survivors
+    heavy = FixedReranker("heavy", {"a": -2.0, "b": -3.0})
+    cascade = CascadeReranker(first, heavy, keep=2, exit_margin=0.5)
+
+    scores = cascade.compute_score(pairs("a", "b", "c", "d"))
+
+    assert heavy.calls == [["a", "b"]]
+    assert scores == [-2.0, -3.0, -4.0, -5.0]
+    assert cascade.stats.pruned == 2
+
+
+def test_decided_first_stage_skips_heavy_model():
+    first = FixedReranker("first", {"a": 0.95, "b": 0.2, "c": 0.1})
+    heavy = FixedReranker("heavy", {})
+    cascade = CascadeReranker(first, heavy, keep=2, exit_margin=0.5)
+
+    scores = cascade.compute_score(pairs("a", "b", "c"))
+
+    assert heavy.calls == []
+    assert scores == pytest.approx([0.95, 0.2, 0.1])
+    assert cascade.stats.early_exits == 1
+
+
+def test_name_includes_pruning_parameters():
+    cascade = CascadeReranker(
+        FixedReranker("first", {}), FixedReranker("heavy", {}), keep=3, exit_margin=0.1
+    )
+    assert cascade.name == "cascade(first>heavy,keep=3,exit_margin=0.1)"
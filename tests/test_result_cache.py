@@ -0,0 +1,83 @@
+import os
+from pathlib import Path
+
+from code_wcag_a11y.settings import settings
+from code_wcag_a11y.utils import result_cache
+from code_wcag_a11y.utils.ax_tree import AXFlag, AXNode, AXSnapshot, VisualInfo
+from code_wcag_a11y.utils.result_cache import RankedResultCache, structural_signature
+
+
+def snapshot(name, contrast_issue=False):
+    visual = VisualInfo(
+        color="#777777",
+        background="#ffffff",
+        contrast=4.48,
+        font_size=16.0,
+        bold=False,
+        width=80.0,
+        height=32.0,
+        issues=("low_contrast",) if contrast_issue else (),
+    )
+    return AXSnapshot(
+        {
+            "1": AXNode("1", "RootWebArea", None, child_ids=["2"]),
+            "2": AXNode(
+                "2", "button", name, AXFlag.FOCUSABLE, parent_id="1", visual=visual
+            ),
+        }
+    )
+
+
+def test_signature_ignores_names_but_not_issues():
+    save = structural_signature(snapshot("Save"), "2.2")
+
+    assert structural_signature(snapshot("Delete"), "2.2") == save
+    assert structural_signature(snapshot("Save", contrast_issue=True), "2.2") != save
+    assert structural_signature(snapshot("Save"), "2.1") != save
+
+
+def test_model_change_drops_entries():
+    cache = RankedResultCache(model_versions=("onnx:encoder", "flag:reranker"))
+    cache.set("signature", {"ranked_chunks": []})
+    assert cache.get("signature") == {"ranked_chunks": []}
+
+    cache.model_versions = ("onnx:encoder", "onnx-int8:reranker")
+    assert cache.get("signature") is None
+    assert len(cache) == 0
+
+
+def test_ranking_setting_change_drops_entries(monkeypatch):
+    cache = RankedResultCache(model_versions=("onnx:encoder", "flag:reranker"))
+    cache.set("signature", {"ranked_chunks": []})
+    generation = cache.generation
+
+    monkeypatch.setattr(settings, "similarity_top_k", settings.similarity_top_k + 1)
+    assert cache.generation != generation
+    assert cache.get("signature") is None
+
+
+def test_index_rebuild_drops_entries_without_rereading_unchanged_id(
+    tmp_path, monkeypatch
+):
+    build_id_file = tmp_path / "build_id"
+    build_id_file.write_text("build-1", encoding="utf-8")
+    monkeypatch.setattr(result_cache, "INDEX_BUILD_ID_FILE", build_id_file)
+    reads = []
+    read_text = Path.read_text
+    monkeypatch.setattr(
+        Path,
+        "read_text",
+        lambda self, *a, **k: reads.append(self) or read_text(self, *a, **k),
+    )
+
+    cache = RankedResultCache(model_versions=())
+    cache.set("signature", {"ranked_chunks": []})
+    assert cache.get("signature") == {"ranked_chunks": []}
+    assert reads == [build_id_file]
+
+    build_id_file.write_text("build-2", encoding="utf-8")
+    stat = build_id_file.stat()
+    os.utime(build_id_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get("signature") is None
+    assert cache.generation.startswith("build-2|")
+    assert len(reads) == 2
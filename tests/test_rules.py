@@ -0,0 +1,147 @@
+import pytest
+
+from code_wcag_a11y.scripts.utils.chunking import SC_CHUNK_TYPE
+from code_wcag_a11y.scripts.utils.rule_table import build_rule_table
+from code_wcag_a11y.utils.ax_tree import AXSnapshot
+from code_wcag_a11y.utils.clean_code import extract_applicability_signals
+from code_wcag_a11y.utils.rules import rank_by_rules, snapshot_signals
+
+
+def snapshot(*nodes):
+    return AXSnapshot.from_dict({str(i): node for i, node in enumerate(nodes)})
+
+
+def sc_chunk(num, techniques):
+    return {
+        "type": SC_CHUNK_TYPE,
+        "num": num,
+        "chunk_id": f"sc-{num}",
+        "handle": f"SC {num}",
+        "level": "A",
+        "metadata": {"techniques": techniques},
+    }
+
+
+CHUNKS = [
+    sc_chunk("1.1.1", {"sufficient": ["H37: Using alt attributes on img elements"]}),
+    sc_chunk(
+        "1.4.3",
+        {
+            "sufficient": ["G18: Ensuring a contrast ratio of at least 4.5:1"],
+            "failure": ["F24: Specifying foreground colors without background colors"],
+        },
+    ),
+    sc_chunk(
+        "4.1.2",
+        {
+            "sufficient": [
+                "ARIA14: Using aria-label to provide an invisible label",
+                "H91: Using HTML form controls and links",
+            ],
+            "advisory": ["H65: Using the title attribute to identify form controls"],
+        },
+    ),
+    sc_chunk("2.4.4", {"sufficient": ["H30: Providing link text for a link"]}),
+    {"type": "sc_section", "num": "4.1.2", "chunk_id": "sec"},
+]
+
+
+def test_document_root_adds_no_signals():
+    signals = extract_applicability_signals(
+        snapshot({"role": "RootWebArea", "name": "", "focusable": True})
+    )
+    assert signals == {"roles": [], "categories": []}
+
+
+def test_signals_from_nodes():
+    signals = extract_applicability_signals(
+        snapshot(
+            {"role": "RootWebArea", "name": "Page", "focusable": True},
+            {"role": "textbox", "name": "", "focusable": True, "required": True},
+            {"role": "image", "name": ""},
+            {"role": "link", "name": "Home", "focusable": True},
+        )
+    )
+    assert signals == {
+        "roles": ["image", "link", "textbox"],
+        "categories": ["forms", "keyboard", "required", "unnamed"],
+    }
+
+
+def test_visual_issues_become_categories():
+    signals = snapshot_signals(
+        snapshot(
+            {
+                "role": "StaticText",
+                "name": "Hi",
+                "visual": {
+                    "color": "#777777",
+                    "background": "#ffffff",
+                    "contrast": 4.48,
+                    "font_size": 16.0,
+                    "bold": False,
+                    "size": [20.0, 18.0],
+                    "issues": ["low_contrast"],
+                },
+            }
+        )
+    )
+    assert signals == ["role:statictext", "category:low_contrast"]
+
+
+def test_rule_table_matches_technique_families():
+    table = build_rule_table(CHUNKS, "22")
+
+    assert set(table["criteria"]) == {"1.1.1", "1.4.3", "2.4.4", "4.1.2"}
+    # G18 is a general technique: it maps the visual contrast signal only
+    assert table["signals"]["category:low_contrast"]["criteria"]["1.4.3"] == {
+        "weight": pytest.approx(1.4142, abs=1e-4),
+        "techniques": ["G18", "F24"],
+    }
+    assert "1.4.3" not in table["signals"].get("role:image", {}).get("criteria", {})
+    assert table["signals"]["role:image"]["criteria"]["1.1.1"] == {
+        "weight": 1.0,
+        "techniques": ["H37"],
+    }
+    # Advisory techniques count half, over the root of the SC's 3 techniques
+    assert table["signals"]["category:unnamed"]["criteria"]["4.1.2"] == {
+        "weight": pytest.approx(1.5 / 3**0.5, abs=1e-4),
+        "techniques": ["ARIA14", "H65"],
+    }
+
+
+def test_rule_table_idf_favors_rare_signals():
+    table = build_rule_table(CHUNKS, "22")
+
+    assert set(table["signals"]["role:link"]["criteria"]) == {"2.4.4", "4.1.2"}
+    assert table["signals"]["role:link"]["idf"] == pytest.approx(1.0986, abs=1e-4)
+    assert table["signals"]["role:image"]["idf"] == pytest.approx(1.6094, abs=1e-4)
+
+
+def test_rank_by_rules_normalizes_and_breaks_ties_on_number():
+    table = {
+        "criteria": {
+            num: {"chunk_id": f"sc-{num}", "title": f"SC {num}"}
+            for num in ("1.4.11", "1.4.3", "2.4.7")
+        },
+        "signals": {
+            "category:low_contrast": {
+                "idf": 2.0,
+                "criteria": {"1.4.11": {"weight": 0.5}, "1.4.3": {"weight": 0.5}},
+            },
+            "category:keyboard": {"idf": 1.0, "criteria": {"2.4.7": {"weight": 4.0}}},
+        },
+    }
+
+    ranked = rank_by_rules(
+        table, ["category:low_contrast", "category:keyboard", "role:unknown"], 3
+    )
+
+    assert [(r["id"], r["score"]) for r in ranked] == [
+        ("sc-2.4.7", 1.0),
+        ("sc-1.4.3", 0.25),
+        ("sc-1.4.11", 0.25),
+    ]
+    assert ranked[1]["signals"] == ["category:low_contrast"]
+    assert rank_by_rules(table, ["role:unknown"], 3) == []
+    assert len(rank_by_rules(table, ["category:low_contrast"], 1)) == 1
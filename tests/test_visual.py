@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+
+from code_wcag_a11y.utils.ax_tree import AXSnapshot
+from code_wcag_a11y.utils.visual import (
+    LOW_CONTRAST,
+    NO_FOCUS_ATTRIBUTE,
+    NO_FOCUS_INDICATOR,
+    SMALL_TARGET,
+    annotate_snapshot,
+    contrast_ratios,
+    nearest_ancestor,
+)
+
+
+def page(
+    text_color,
+    font_size="16px",
+    font_weight="400",
+    target=24,
+    no_focus=False,
+    background="rgb(255, 255, 255)",
+):
+    """A DOMSnapshot of body > (div > text, button > text) on a body background.
+
+    Styles columns: color, background-color, font-size, font-weight.
+    """
+    strings = [
+        "rgb(0, 0, 0)",
+        "rgba(0, 0, 0, 0)",
+        background,
+        text_color,
+        font_size,
+        font_weight,
+        "16px",
+        "400",
+        NO_FOCUS_ATTRIBUTE,
+        "",
+    ]
+    body = [0, 2, 6, 7]
+    text = [3, 1, 4, 5]
+    button = [0, 1, 6, 7]
+    document = {
+        "nodes": {
+            # html, body, div, #text, button, #text
+            "parentIndex": [-1, 0, 1, 2, 1, 4],
+            "backendNodeId": [10, 11, 12, 13, 14, 15],
+            "attributes": [[], [], [], [], [8, 9] if no_focus else [], []],
+        },
+        "layout": {
+            "nodeIndex": [0, 1, 2, 3, 4, 5],
+            "styles": [[0, 1, 6, 7], body, text, [], button, []],
+            "bounds": [
+                [0, 0, 800, 600],
+                [8, 8, 784, 500],
+                [8, 8, 784, 40],
+                [8, 8, 100, 30],
+                [8, 60, target, target],
+                [10, 62, 10, 10],
+            ],
+        },
+    }
+    ax_tree = {
+        "nodes": [
+            {
+                "nodeId": "1",
+                "role": {"value": "RootWebArea"},
+                "backendDOMNodeId": 10,
+                "properties": [{"name": "focusable", "value": {"value": True}}],
+            },
+            {
+                "nodeId": "2",
+                "parentId": "1",
+                "role": {"value": "StaticText"},
+                "name": {"value": "Notice"},
+                "backendDOMNodeId": 13,
+            },
+            {
+                "nodeId": "3",
+                "parentId": "1",
+                "role": {"value": "button"},
+                "name": {"value": "Go"},
+                "backendDOMNodeId": 14,
+                "properties": [{"name": "focusable", "value": {"value": True}}],
+            },
+        ]
+    }
+    snapshot = AXSnapshot.from_cdp(ax_tree)
+    annotate_snapshot(snapshot, ax_tree, {"documents": [document], "strings": strings})
+    return snapshot
+
+
+GREY = "rgb(119, 119, 119)"  # 4.48:1 on white
+DARK_GREY = "rgb(118, 118, 118)"  # 4.54:1 on white
+LIGHT_GREY = "rgb(150, 150, 150)"  # 2.96:1 on white
+
+
+def test_contrast_ratio_bounds():
+    ratios = contrast_ratios(
+        np.array([[0, 0, 0], [255, 255, 255], [119, 119, 119]]),
+        np.array([[255, 255, 255], [255, 255, 255], [255, 255, 255]]),
+    )
+    assert ratios == pytest.approx([21.0, 1.0, 4.48], abs=0.01)
+
+
+def test_nearest_ancestor_in_mask():
+    parent = np.array([-1, 0, 1, 2, 1])
+    mask = np.array([False, False, True, False, False])
+    assert nearest_ancestor(parent, mask).tolist() == [-1, -1, 2, 2, -1]
+
+
+@pytest.mark.parametrize(
+    ("color", "font_size", "font_weight", "low"),
+    [
+        (GREY, "16px", "400", True),
+        (DARK_GREY, "16px", "400", False),
+        # Large text (24px, or 18.66px bold) only needs 3:1
+        (GREY, "24px", "400", False),
+        (GREY, "18.66px", "700", False),
+        (GREY, "18px", "700", True),
+        (GREY, "20px", "400", True),
+        (LIGHT_GREY, "24px", "400", True),
+    ],
+)
+def test_contrast_thresholds(color, font_size, font_weight, low):
+    text = page(color, font_size, font_weight).get("2")
+    assert (LOW_CONTRAST in text.issues) is low
+
+
+def test_text_contrast_is_against_nearest_painted_ancestor():
+    text = page(GREY).get("2")
+    assert text.visual.background == "#ffffff"
+    assert text.visual.contrast == pytest.approx(4.48, abs=0.01)
+
+
+@pytest.mark.parametrize(("size", "small"), [(20, True), (24, False), (44, False)])
+def test_target_size(size, small):
+    button = page(DARK_GREY, target=size).get("3")
+    assert (SMALL_TARGET in button.issues) is small
+
+
+def test_root_is_not_a_target():
+    assert page(DARK_GREY, target=10).get("1").visual is None
+
+
+def test_marked_focus_outline_removal():
+    assert NO_FOCUS_INDICATOR in page(DARK_GREY, no_focus=True).get("3").issues
+    assert NO_FOCUS_INDICATOR not in page(DARK_GREY).get("3").issues
+
+
+@pytest.mark.parametrize(
+    "color", ["color(display-p3 0.5 0.5 0.5)", "oklch(0.6 0 0)", "lab(50 0 0)"]
+)
+def test_unknown_text_color_skips_contrast(color):
+    text = page(color).get("2")
+    assert LOW_CONTRAST not in text.issues
+    assert text.visual.contrast is None
+    assert text.visual.color is None
+    assert text.visual.background == "#ffffff"
+
+
+def test_unknown_background_skips_contrast():
+    # Not treated as transparent: white behind grey text would be 4.48:1
+    text = page(GREY, background="oklch(0.3 0.1 250)").get("2")
+    assert LOW_CONTRAST not in text.issues
+    assert text.visual.contrast is None
+    assert text.visual.background is None
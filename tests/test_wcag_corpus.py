@@ -0,0 +1,41 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from code_wcag_a11y.utils import wcag_corpus
+
+
+def test_json_is_parsed_through_content_hash_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(wcag_corpus, "CORPUS_SNAPSHOT_DIR", tmp_path / "snapshots")
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"role:button": ["4.1.2"]}))
+
+    assert wcag_corpus.load_json_file(path) == {"role:button": ["4.1.2"]}
+    [snapshot] = (tmp_path / "snapshots").iterdir()
+
+    # A fresh process reads the snapshot instead of the JSON
+    wcag_corpus._loaded.clear()
+    snapshot.write_bytes(wcag_corpus.marshal.dumps({"from": "snapshot"}))
+    assert wcag_corpus.load_json_file(path) == {"from": "snapshot"}
+
+
+def test_edited_file_replaces_its_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(wcag_corpus, "CORPUS_SNAPSHOT_DIR", tmp_path / "snapshots")
+    path = tmp_path / "rules.json"
+    path.write_text('{"version": 1}')
+    wcag_corpus.parse_json_bytes(path, path.read_bytes())
+    [old] = (tmp_path / "snapshots").iterdir()
+
+    path.write_text('{"version": 2}')
+    assert wcag_corpus.parse_json_bytes(path, path.read_bytes()) == {"version": 2}
+    [new] = (tmp_path / "snapshots").iterdir()
+    assert new != old
+
+
+def test_wcag_model_is_validated_from_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(wcag_corpus, "RAW_DIR", tmp_path)
+    (tmp_path / "wcag-2.2.json").write_text("{not json")
+
+    with pytest.raises(ValidationError):
+        wcag_corpus.load_wcag_model("2.2")